@@ -8,8 +8,8 @@ logging, Jinja filters, and registers blueprints.
 import os
 import logging
 import urllib.parse
-import pytz
 from datetime import datetime, date, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from logging.handlers import RotatingFileHandler
 
 from flask import Flask, request, render_template, session, g, url_for
@@ -63,24 +63,22 @@ def format_datetime(value, fmt='%Y-%m-%d %I:%M %p'):
     # Get user's timezone from session, default to Los Angeles
     tz_name = session.get('timezone', 'America/Los_Angeles')
     try:
-        target_tz = pytz.timezone(tz_name)
-    except pytz.UnknownTimeZoneError:
+        target_tz = ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
         # Use current_app.logger if available, otherwise print warning
         try:
             from flask import current_app
             current_app.logger.warning(f"Invalid timezone '{tz_name}' in session, defaulting to LA.")
         except RuntimeError:
             print(f"WARNING: Invalid timezone '{tz_name}' in session, defaulting to LA.")
-        target_tz = pytz.timezone('America/Los_Angeles')
-
-    utc = pytz.utc
+        target_tz = ZoneInfo('America/Los_Angeles')
 
     # Convert date objects to datetime objects at midnight
     if isinstance(value, date) and not isinstance(value, datetime):
         value = datetime.combine(value, datetime.min.time())
 
     # Localize naive datetimes as UTC before converting
-    dt = value if getattr(value, 'tzinfo', None) else utc.localize(value)
+    dt = value if getattr(value, 'tzinfo', None) else value.replace(tzinfo=timezone.utc)
 
     local_dt = dt.astimezone(target_tz)
     return local_dt.strftime(fmt)
@@ -123,6 +121,20 @@ def create_app():
         TURNSTILE_SECRET_KEY=os.getenv("TURNSTILE_SECRET_KEY"),
     )
 
+    # Connection pool: reuse the most recently returned connection (LIFO) so
+    # idle ones can time out, and ping before use so a connection dropped by
+    # the server is replaced instead of failing the request. SQLite uses a
+    # single-connection pool that does not accept these options.
+    if not app.config["SQLALCHEMY_DATABASE_URI"].startswith("sqlite"):
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+            "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+            "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+            "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+            "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+            "pool_pre_ping": True,
+            "pool_use_lifo": True,
+        }
+
     # Enable Jinja2 template hot reloading without server restart
     app.jinja_env.auto_reload = True
 
@@ -328,9 +328,37 @@ def get_admin_student_query(include_unassigned=True):
 
 
 def get_student_for_admin(student_id, include_unassigned=True):
-    """Return a student the current admin can access, or None."""
-    query = get_admin_student_query(include_unassigned=include_unassigned)
-    return query.filter_by(id=student_id).first()
+    """Return a student the current admin can access, or None.
+
+    Applies the same rules as get_admin_student_query(), but checks them for
+    the one student with EXISTS probes on the (student_id, admin_id) unique
+    key instead of filtering students against the admin's whole roster, then
+    loads the row by primary key.
+
+    Args:
+        include_unassigned (bool): [DEPRECATED] No longer used. Kept for backward compatibility.
+    """
+    from app.extensions import db
+    from app.models import Student, StudentTeacher, DemoStudent  # Imported lazily to avoid circular import
+
+    if student_id is None:
+        return None
+
+    if not session.get("is_system_admin"):
+        admin = get_current_admin()
+        if not admin:
+            return None
+        is_linked = db.session.query(
+            StudentTeacher.query.filter_by(student_id=student_id, admin_id=admin.id).exists()
+        ).scalar()
+        if not is_linked:
+            return None
+
+    is_demo = db.session.query(DemoStudent.query.filter_by(student_id=student_id).exists()).scalar()
+    if is_demo:
+        return None
+
+    return db.session.get(Student, student_id)
 
 
 def is_viewing_as_student():
@@ -7,7 +7,7 @@ import time
 from datetime import datetime, timezone
 
 from app.extensions import db
-from app.models import Student, StudentTeacher, TeacherBlock
+from app.models import Student, StudentBalance, StudentTeacher, TeacherBlock
 from app.utils.join_code import generate_join_code
 from app.routes.admin import (
     MAX_JOIN_CODE_RETRIES,
@@ -571,8 +571,26 @@ def normalize_claim_credentials_command():
     click.echo(f"Updated {updated} record(s) to use canonical claim hashes.")
 
 
+@click.command('rebuild-student-balances')
+def rebuild_student_balances_command():
+    """Recompute the student_balances roll-up from the transaction table."""
+
+    click.echo("Rebuilding student balance roll-up from transaction history...")
+
+    try:
+        StudentBalance.rebuild()
+        db.session.commit()
+    except Exception as exc:
+        db.session.rollback()
+        click.echo(f"Failed to rebuild student balances: {exc}", err=True)
+        raise click.Abort()
+
+    click.echo(f"Rebuilt {StudentBalance.query.count()} balance row(s).")
+
+
 def init_app(app):
     """Register CLI commands with Flask app."""
     app.cli.add_command(migrate_legacy_students_command)
     app.cli.add_command(normalize_claim_credentials_command)
     app.cli.add_command(fix_missing_teacher_blocks_command)
+    app.cli.add_command(rebuild_student_balances_command)
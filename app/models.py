@@ -6,15 +6,109 @@ Times are stored as UTC in the database.
 """
 
 from datetime import datetime, timedelta, timezone
+from decimal import Decimal, ROUND_HALF_UP
+from functools import cached_property, lru_cache
+from operator import attrgetter
 import enum
 
+from sqlalchemy import event, or_
+from sqlalchemy.orm import Session, validates
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.dialects import postgresql, sqlite
+
 from app.extensions import db
 from app.utils.encryption import PIIEncryptedType
+from hash_utils import hash_first_name_lookup
+
+
+_UTC = timezone.utc
 
 
 def _utc_now():
     """Helper function for timezone-aware datetime defaults in SQLAlchemy models."""
-    return datetime.now(timezone.utc)
+    return datetime.now(_UTC)
+
+
+def first_name_filter(model, first_name):
+    """SQL pre-filter for rows whose encrypted ``first_name`` may equal ``first_name``.
+
+    Matches on the deterministic search hash; rows written before the hash
+    existed (NULL) are kept so callers' exact decrypted comparison still decides.
+    """
+    return or_(
+        model.first_name_search_hash == hash_first_name_lookup(first_name),
+        model.first_name_search_hash.is_(None),
+    )
+
+
+def _normalize_block(block):
+    """Canonical stored form of a block name: trimmed and upper-case."""
+    return block.strip().upper() if block else block
+
+
+def _replace_visible_blocks(owner, owner_fk, block_list):
+    """
+    Make ``owner``'s block-visibility rows equal ``block_list``.
+
+    The owner row is locked FOR UPDATE so concurrent edits of the same
+    item/policy serialize; only the difference is written, as one DELETE
+    and one multi-row INSERT. On PostgreSQL and SQLite the INSERT uses
+    ON CONFLICT DO NOTHING, so a row another writer already added is not
+    an error. ``owner_fk`` is the association table's foreign key column
+    to the owner.
+    """
+    if owner.id is None:
+        db.session.flush()
+    owner_table = type(owner).__table__
+    db.session.execute(
+        db.select(owner_table.c.id).where(owner_table.c.id == owner.id).with_for_update()
+    )
+
+    table = owner_fk.table
+    desired = {_normalize_block(block) for block in block_list or []}
+    existing = set(db.session.execute(
+        db.select(table.c.block).where(owner_fk == owner.id)
+    ).scalars())
+
+    to_remove = existing - desired
+    if to_remove:
+        db.session.execute(table.delete().where(owner_fk == owner.id, table.c.block.in_(to_remove)))
+    to_add = desired - existing
+    if to_add:
+        dialect = db.session.get_bind().dialect.name
+        if dialect in ('postgresql', 'sqlite'):
+            insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+            stmt = insert(table).on_conflict_do_nothing(index_elements=[owner_fk.key, 'block'])
+        else:
+            stmt = table.insert()
+        db.session.execute(stmt, [
+            {owner_fk.key: owner.id, 'block': block} for block in sorted(to_add)
+        ])
+    db.session.expire(owner, ['visible_blocks'])
+
+
+@lru_cache(maxsize=None)
+def _unscoped_balance_sum(column_key, account_type=None):
+    """
+    Prebuilt SUM over a student's roll-up rows, bound by :student_id.
+
+    Unscoped reads (total_earnings, checking_balance on reports) run once per
+    student; reusing one statement skips rebuilding the query each call.
+    """
+    column = getattr(StudentBalance, column_key)
+    stmt = db.select(db.func.coalesce(db.func.sum(column), 0)).where(
+        StudentBalance.student_id == db.bindparam('student_id')
+    )
+    if account_type is not None:
+        stmt = stmt.where(StudentBalance.account_type == account_type)
+    return stmt
+
+
+def _sync_first_name_search_hash(target, value, oldvalue, initiator):
+    if isinstance(value, bytes):
+        # PIIEncryptedType also accepts raw bytes
+        value = value.decode('utf-8')
+    target.first_name_search_hash = hash_first_name_lookup(value) if value else None
 
 
 # -------------------- MODELS --------------------
@@ -42,6 +136,8 @@ class TeacherBlock(db.Model):
     # Student identifiers (used for matching during claim)
     first_name = db.Column(PIIEncryptedType(key_env_var='ENCRYPTION_KEY'), nullable=False)
     last_initial = db.Column(db.String(1), nullable=False)
+    # Deterministic HMAC of the normalized first name; kept in sync by an attribute listener
+    first_name_search_hash = db.Column(db.String(64), nullable=True, index=True)
 
     # Fuzzy name matching - stores hash of each last name part separately
     # Example: "Smith-Jones" → ["hash(smith)", "hash(jones)"]
@@ -66,14 +162,16 @@ class TeacherBlock(db.Model):
     claimed_at = db.Column(db.DateTime, nullable=True)
 
     # Relationships
-    teacher = db.relationship('Admin', backref=db.backref('roster_seats', lazy='dynamic', passive_deletes=True))
+    # Admin-side collections load once on access and can be batched with selectinload()
+    teacher = db.relationship('Admin', backref=db.backref('roster_seats', lazy='select', passive_deletes=True))
     student = db.relationship('Student', backref='roster_seats')
 
     # Indexes for efficient lookups
     __table_args__ = (
-        db.Index('ix_teacher_blocks_join_code', 'join_code'),
         db.Index('ix_teacher_blocks_teacher_block', 'teacher_id', 'block'),
         db.Index('ix_teacher_blocks_claimed', 'is_claimed'),
+        # Claim matching narrows unclaimed seats by DOB sum before hashing
+        db.Index('ix_teacher_blocks_join_claimed_dob', 'join_code', 'is_claimed', 'dob_sum'),
     )
 
     def get_class_label(self):
@@ -90,6 +188,8 @@ class Student(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     first_name = db.Column(PIIEncryptedType(key_env_var='ENCRYPTION_KEY'), nullable=False)
     last_initial = db.Column(db.String(1), nullable=False)
+    # Deterministic HMAC of the normalized first name; kept in sync by an attribute listener
+    first_name_search_hash = db.Column(db.String(64), nullable=True, index=True)
     block = db.Column(db.String(10), nullable=False)
 
     # Hash and credential fields
@@ -110,13 +210,13 @@ class Student(db.Model):
     # Students are now linked to teachers via student_teachers table only
     # This column kept temporarily for backwards compatibility during migration
     teacher_id = db.Column(db.Integer, db.ForeignKey('admins.id'), nullable=True)
-    teacher = db.relationship('Admin', backref=db.backref('students', lazy='dynamic'))
+    teacher = db.relationship('Admin', backref=db.backref('students', lazy='select'))
 
     # Teachers associated with this student (many-to-many)
     teachers = db.relationship(
         'Admin',
         secondary='student_teachers',
-        backref=db.backref('linked_students', lazy='dynamic'),
+        backref=db.backref('linked_students', lazy='select'),
         lazy='dynamic',
     )
 
@@ -136,20 +236,36 @@ class Student(db.Model):
     # Track if student has completed the legacy profile migration
     has_completed_profile_migration = db.Column(db.Boolean, default=False)
 
+    __table_args__ = (
+        # Duplicate/claim checks filter by these before comparing salted hashes
+        db.Index('ix_students_last_initial_dob_sum', 'last_initial', 'dob_sum'),
+    )
+
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_initial}."
 
-    transactions = db.relationship('Transaction', backref='student', lazy=True)
+    # Lazy loads are per-student; list views should selectinload(Student.transactions)
+    # or selectinload(Student.balances) to batch them into one IN query.
+    transactions = db.relationship('Transaction', backref='student', lazy='select')
+    balances = db.relationship('StudentBalance', lazy='select', viewonly=True)
 
 
-    @property
+    # Cached per instance; cleared by the Transaction session listeners below
+    _CACHED_BALANCES = ('checking_balance', 'savings_balance', 'total_earnings', 'recent_deposits')
+
+    @cached_property
     def checking_balance(self):
-        return round(sum(tx.amount for tx in self.transactions if tx.account_type == 'checking' and not tx.is_void), 2)
+        return self._sum_balances(StudentBalance.balance_cents, 'checking')
 
-    @property
+    @cached_property
     def savings_balance(self):
-        return round(sum(tx.amount for tx in self.transactions if tx.account_type == 'savings' and not tx.is_void), 2)
+        return self._sum_balances(StudentBalance.balance_cents, 'savings')
+
+    def invalidate_balance_cache(self):
+        """Drop cached balance properties so the next read hits the roll-up again."""
+        for attr in self._CACHED_BALANCES:
+            self.__dict__.pop(attr, None)
 
     def get_active_insurance(self, teacher_id):
         """Return the active insurance enrollment scoped to a teacher, if any."""
@@ -164,6 +280,100 @@ class Student(db.Model):
             InsurancePolicy.teacher_id == teacher_id
         ).first()
 
+    @classmethod
+    def bulk_active_insurance(cls, student_ids, teacher_id):
+        """
+        Return {student_id: StudentInsurance} of active enrollments scoped to a teacher.
+
+        Batched equivalent of get_active_insurance for roster views: one JOIN
+        query for all students, with each enrollment's policy already loaded.
+        """
+        if not teacher_id or not student_ids:
+            return {}
+
+        enrollments = (
+            StudentInsurance.query
+            .join(InsurancePolicy, StudentInsurance.policy_id == InsurancePolicy.id)
+            .options(db.contains_eager(StudentInsurance.policy))
+            .filter(
+                StudentInsurance.student_id.in_(student_ids),
+                StudentInsurance.status == 'active',
+                InsurancePolicy.teacher_id == teacher_id,
+            )
+            .order_by(StudentInsurance.id)
+            .all()
+        )
+        active = {}
+        for enrollment in enrollments:
+            active.setdefault(enrollment.student_id, enrollment)
+        return active
+
+    def _sum_balances(self, column, account_type=None, teacher_id=None, join_code=None):
+        """
+        Sum a StudentBalance roll-up cents column for this student, in dollars.
+
+        Reads the materialized per-class roll-up rows instead of scanning the
+        transaction history, so a balance read is a handful of indexed rows.
+        When the rows were eager-loaded (selectinload(Student.balances)) they
+        are summed in Python and no query is issued. Sums are exact integer
+        cents, so no rounding is needed.
+        """
+        if 'balances' in self.__dict__:
+            cents = sum(
+                getattr(row, column.key) for row in self.balances
+                if (account_type is None or row.account_type == account_type)
+                and self._balance_row_in_scope(row, teacher_id, join_code)
+            )
+            return cents / 100
+
+        if not teacher_id and not join_code:
+            stmt = _unscoped_balance_sum(column.key, account_type)
+            return int(db.session.execute(stmt, {'student_id': self.id}).scalar() or 0) / 100
+
+        query = db.session.query(
+            db.func.coalesce(db.func.sum(column), 0)
+        ).filter(StudentBalance.student_id == self.id)
+        if account_type is not None:
+            query = query.filter(StudentBalance.account_type == account_type)
+        query = query.filter(*self._balance_scope(teacher_id, join_code))
+        return int(query.scalar() or 0) / 100
+
+    @staticmethod
+    def _balance_scope(teacher_id=None, join_code=None):
+        """
+        Build the class-economy filter shared by the scoped balance getters.
+
+        Returns a list of SQL criteria (empty when no scope is provided).
+        Legacy roll-up rows (transactions with NULL join_code) are stored
+        with join_code '' and keep their teacher_id.
+        """
+        if join_code:
+            # Proper scoping by join_code (period-level isolation)
+            # Include legacy transactions with NULL join_code but matching teacher_id
+            if teacher_id:
+                return [db.or_(
+                    StudentBalance.join_code == join_code,
+                    db.and_(StudentBalance.join_code == '', StudentBalance.teacher_id == teacher_id),
+                )]
+            return [StudentBalance.join_code == join_code]
+        if teacher_id:
+            # DEPRECATED: Only use this for backward compatibility during migration
+            # This will aggregate across all periods with same teacher
+            return [StudentBalance.teacher_id == teacher_id]
+        # No scope provided - total across all classes
+        return []
+
+    @staticmethod
+    def _balance_row_in_scope(row, teacher_id=None, join_code=None):
+        """Python equivalent of _balance_scope for eager-loaded roll-up rows."""
+        if join_code:
+            if row.join_code == join_code:
+                return True
+            return bool(teacher_id) and row.join_code == '' and row.teacher_id == teacher_id
+        if teacher_id:
+            return row.teacher_id == teacher_id
+        return True
+
     def get_checking_balance(self, teacher_id=None, join_code=None):
         """
         Get checking balance scoped to a specific class economy.
@@ -178,28 +388,7 @@ class Student(db.Model):
         Returns:
             float: The checking balance rounded to 2 decimal places
         """
-        if join_code:
-            # Proper scoping by join_code (period-level isolation)
-            # Include legacy transactions with NULL join_code but matching teacher_id
-            return round(sum(
-                tx.amount for tx in self.transactions
-                if tx.account_type == 'checking' and not tx.is_void and (
-                    tx.join_code == join_code or (tx.join_code is None and teacher_id and tx.teacher_id == teacher_id)
-                )
-            ), 2)
-        elif teacher_id:
-            # DEPRECATED: Only use this for backward compatibility during migration
-            # This will show aggregated balance across all periods with same teacher
-            return round(sum(
-                tx.amount for tx in self.transactions
-                if tx.account_type == 'checking' and not tx.is_void and tx.teacher_id == teacher_id
-            ), 2)
-        else:
-            # No scope provided - return total across all classes
-            return round(sum(
-                tx.amount for tx in self.transactions
-                if tx.account_type == 'checking' and not tx.is_void
-            ), 2)
+        return self._sum_balances(StudentBalance.balance_cents, 'checking', teacher_id, join_code)
 
     def get_savings_balance(self, teacher_id=None, join_code=None):
         """
@@ -215,28 +404,7 @@ class Student(db.Model):
         Returns:
             float: The savings balance rounded to 2 decimal places
         """
-        if join_code:
-            # Proper scoping by join_code (period-level isolation)
-            # Include legacy transactions with NULL join_code but matching teacher_id
-            return round(sum(
-                tx.amount for tx in self.transactions
-                if tx.account_type == 'savings' and not tx.is_void and (
-                    tx.join_code == join_code or (tx.join_code is None and teacher_id and tx.teacher_id == teacher_id)
-                )
-            ), 2)
-        elif teacher_id:
-            # DEPRECATED: Only use this for backward compatibility during migration
-            # This will show aggregated balance across all periods with same teacher
-            return round(sum(
-                tx.amount for tx in self.transactions
-                if tx.account_type == 'savings' and not tx.is_void and tx.teacher_id == teacher_id
-            ), 2)
-        else:
-            # No scope provided - return total across all classes
-            return round(sum(
-                tx.amount for tx in self.transactions
-                if tx.account_type == 'savings' and not tx.is_void
-            ), 2)
+        return self._sum_balances(StudentBalance.balance_cents, 'savings', teacher_id, join_code)
 
     def get_total_earnings(self, teacher_id=None, join_code=None):
         """
@@ -252,30 +420,47 @@ class Student(db.Model):
         Returns:
             float: The total earnings rounded to 2 decimal places
         """
-        if join_code:
-            # Proper scoping by join_code (period-level isolation)
-            # Include legacy transactions with NULL join_code but matching teacher_id
-            return round(sum(
-                tx.amount for tx in self.transactions
-                if (tx.join_code == join_code or (tx.join_code is None and teacher_id and tx.teacher_id == teacher_id))
-                and tx.amount > 0 and not tx.is_void
-                and not (tx.description or "").startswith("Transfer")
-            ), 2)
-        elif teacher_id:
-            # DEPRECATED: Only use this for backward compatibility during migration
-            # This will show aggregated earnings across all periods with same teacher
-            return round(sum(
-                tx.amount for tx in self.transactions
-                if tx.teacher_id == teacher_id and tx.amount > 0 and not tx.is_void
-                and not (tx.description or "").startswith("Transfer")
-            ), 2)
+        return self._sum_balances(StudentBalance.earnings_cents, teacher_id=teacher_id, join_code=join_code)
+
+    def get_all_balances(self, teacher_id=None, join_code=None):
+        """
+        Get checking, savings and earnings for one class economy in a single pass.
+
+        Use this when a view needs more than one figure: the roll-up rows are
+        read once with conditional aggregation instead of one SUM per getter.
+        Scoping rules are the same as get_checking_balance.
+
+        Returns:
+            dict: {'checking': float, 'savings': float, 'earnings': float}
+        """
+        if 'balances' in self.__dict__:
+            rows = [
+                row for row in self.balances
+                if self._balance_row_in_scope(row, teacher_id, join_code)
+            ]
+            checking = sum(row.balance_cents for row in rows if row.account_type == 'checking')
+            savings = sum(row.balance_cents for row in rows if row.account_type == 'savings')
+            earnings = sum(row.earnings_cents for row in rows)
         else:
-            # No scope provided - return total across all classes
-            return round(sum(
-                tx.amount for tx in self.transactions
-                if tx.amount > 0 and not tx.is_void
-                and not (tx.description or "").startswith("Transfer")
-            ), 2)
+            def _sum_for(account_type):
+                return db.func.coalesce(db.func.sum(db.case(
+                    (StudentBalance.account_type == account_type, StudentBalance.balance_cents),
+                    else_=0,
+                )), 0)
+
+            checking, savings, earnings = db.session.query(
+                _sum_for('checking'),
+                _sum_for('savings'),
+                db.func.coalesce(db.func.sum(StudentBalance.earnings_cents), 0),
+            ).filter(
+                StudentBalance.student_id == self.id,
+                *self._balance_scope(teacher_id, join_code),
+            ).one()
+        return {
+            'checking': int(checking) / 100,
+            'savings': int(savings) / 100,
+            'earnings': int(earnings) / 100,
+        }
 
     def get_all_teachers(self):
         """
@@ -286,33 +471,27 @@ class Student(db.Model):
         """
         return list(self.teachers.all())
 
-    @property
+    @cached_property
     def total_earnings(self):
-        return round(sum(tx.amount for tx in self.transactions if tx.amount > 0 and not tx.is_void and not tx.description.startswith("Transfer")), 2)
+        return self._sum_balances(StudentBalance.earnings_cents)
 
-    @property
+    @cached_property
     def recent_deposits(self):
-        now = datetime.now(timezone.utc)
-        recent_timeframe = now - timedelta(days=2)
-
-        def _as_utc(dt):
-            if dt is None:
-                return None
-            if dt.tzinfo is None:
-                return dt.replace(tzinfo=timezone.utc)
-            return dt.astimezone(timezone.utc)
-
-        deposits = []
-        for tx in self.transactions:
-            if tx.amount <= 0 or tx.is_void:
-                continue
-            if (tx.description or "").lower().startswith("transfer"):
-                continue
-            tx_time = _as_utc(tx.timestamp)
-            if not tx_time or tx_time < recent_timeframe:
-                continue
-            deposits.append(tx)
-        return deposits
+        """Non-void, non-transfer deposits from the last two days, in insertion order."""
+        # timestamp is stored as naive UTC; compare naive so the session TimeZone cannot shift it
+        cutoff = (_utc_now() - timedelta(days=2)).replace(tzinfo=None)
+        return (
+            Transaction.query
+            .filter(
+                Transaction.student_id == self.id,
+                Transaction.amount > 0,
+                Transaction.is_void.isnot(True),
+                Transaction.is_transfer.is_(False),
+                Transaction.timestamp >= cutoff,
+            )
+            .order_by(Transaction.id)
+            .all()
+        )
 
     @property
     def amount_needed_to_cover_bills(self):
@@ -345,7 +524,6 @@ class StudentTeacher(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint('student_id', 'admin_id', name='uq_student_teachers_student_admin'),
-        db.Index('ix_student_teachers_student_id', 'student_id'),
         db.Index('ix_student_teachers_admin_id', 'admin_id'),
     )
 
@@ -360,10 +538,10 @@ class DeletionRequestType(enum.Enum):
         """Convert string to enum, raising ValueError if invalid."""
         if isinstance(value, cls):
             return value
-        for member in cls:
-            if member.value == value:
-                return member
-        raise ValueError(f"Invalid DeletionRequestType: {value}")
+        try:
+            return cls._value2member_map_[value]
+        except (KeyError, TypeError):
+            raise ValueError(f"Invalid DeletionRequestType: {value}") from None
 
 
 class DeletionRequestStatus(enum.Enum):
@@ -382,10 +560,27 @@ class DeletionRequest(db.Model):
     __tablename__ = 'deletion_requests'
     id = db.Column(db.Integer, primary_key=True)
     admin_id = db.Column(db.Integer, db.ForeignKey('admins.id', ondelete='CASCADE'), nullable=False)
-    request_type = db.Column(db.Enum(DeletionRequestType, values_callable=lambda x: [e.value for e in x]), nullable=False)
+    # Stored as VARCHAR + CHECK (native_enum=False) so adding a value needs no
+    # PostgreSQL ALTER TYPE; rows still load as enum members
+    request_type = db.Column(
+        db.Enum(
+            DeletionRequestType, values_callable=lambda x: [e.value for e in x],
+            native_enum=False, create_constraint=True, length=16,
+            name='ck_deletion_requests_request_type',
+        ),
+        nullable=False,
+    )
     period = db.Column(db.String(10), nullable=True)  # Specified for period deletions only
     reason = db.Column(db.Text, nullable=True)  # Optional reason from teacher
-    status = db.Column(db.Enum(DeletionRequestStatus, values_callable=lambda x: [e.value for e in x]), default=DeletionRequestStatus.PENDING, nullable=False)
+    status = db.Column(
+        db.Enum(
+            DeletionRequestStatus, values_callable=lambda x: [e.value for e in x],
+            native_enum=False, create_constraint=True, length=16,
+            name='ck_deletion_requests_status',
+        ),
+        default=DeletionRequestStatus.PENDING,
+        nullable=False,
+    )
     requested_at = db.Column(db.DateTime, default=_utc_now, nullable=False)
     resolved_at = db.Column(db.DateTime, nullable=True)
     resolved_by = db.Column(db.Integer, db.ForeignKey('system_admins.id'), nullable=True)
@@ -431,7 +626,7 @@ class SystemAdminCredential(db.Model):
     last_used = db.Column(db.DateTime)
 
     # Relationships
-    sysadmin = db.relationship('SystemAdmin', backref=db.backref('credentials', lazy='dynamic', cascade='all, delete-orphan'))
+    sysadmin = db.relationship('SystemAdmin', backref=db.backref('credentials', lazy='select', cascade='all, delete-orphan'))
 
     def __repr__(self):
         return f'<SystemAdminCredential {self.authenticator_name or "Unnamed"} for SysAdmin {self.sysadmin_id}>'
@@ -455,6 +650,8 @@ class Transaction(db.Model):
     account_type = db.Column(db.String(20), default='checking')
     description = db.Column(db.String(255))
     is_void = db.Column(db.Boolean, default=False)
+    # Set for both legs of a student checking/savings transfer; transfers are not earnings
+    is_transfer = db.Column(db.Boolean, default=False, nullable=False)
     type = db.Column(db.String(50))  # optional field to describe the transaction type
     # All times stored as UTC
     date_funds_available = db.Column(db.DateTime, default=_utc_now)
@@ -462,6 +659,282 @@ class Transaction(db.Model):
     # Relationship to track which teacher created this transaction
     teacher = db.relationship('Admin', backref=db.backref('transactions', lazy='dynamic'))
 
+    __table_args__ = (
+        # Covering index for scoped balance sums (roll-up rebuilds and ledger totals);
+        # on PostgreSQL the INCLUDE columns allow index-only scans
+        db.Index(
+            'ix_tx_balance_cover',
+            'student_id', 'account_type', 'is_void', 'join_code', 'teacher_id',
+            postgresql_include=['amount', 'is_transfer'],
+        ),
+        # Range scans over a student's recent history (recent_deposits)
+        db.Index('ix_tx_student_timestamp', 'student_id', 'timestamp'),
+    )
+
+
+
+class StudentBalance(db.Model):
+    """
+    Materialized balance roll-up per student and class economy.
+
+    One row per (student, join_code, teacher, account_type) holds the running
+    non-void balance and earnings for that slice of the ledger. Rows are kept
+    current by the Transaction flush listeners below, so balance reads are a
+    few indexed rows instead of a SUM over the full transaction history.
+
+    Amounts are stored as integer cents so the running deltas never accumulate
+    floating point drift; Student's getters convert back to dollars.
+
+    Legacy transactions without a join_code are rolled up under join_code ''
+    (and transactions without a teacher under teacher_id 0) because primary
+    key columns cannot be NULL.
+    """
+    __tablename__ = 'student_balances'
+
+    student_id = db.Column(db.Integer, db.ForeignKey('students.id', ondelete='CASCADE'), primary_key=True)
+    join_code = db.Column(db.String(20), primary_key=True, default='')
+    teacher_id = db.Column(db.Integer, primary_key=True, default=0)
+    account_type = db.Column(db.String(20), primary_key=True, default='')
+
+    balance_cents = db.Column(db.BigInteger, nullable=False, default=0)
+    earnings_cents = db.Column(db.BigInteger, nullable=False, default=0)  # Positive, non-transfer deposits
+    updated_at = db.Column(db.DateTime, default=_utc_now, onupdate=_utc_now)
+
+    def __repr__(self):
+        return f'<StudentBalance student={self.student_id} {self.join_code or "legacy"}/{self.account_type}: {self.balance}>'
+
+    @property
+    def balance(self):
+        return self.balance_cents / 100
+
+    @property
+    def earnings(self):
+        return self.earnings_cents / 100
+
+    @staticmethod
+    def to_cents(amount):
+        # Half away from zero on the decimal value, matching SQL ROUND(numeric) in rebuild()
+        return int((Decimal(str(amount or 0)) * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+    @classmethod
+    def contribution(cls, amount, is_void, is_transfer):
+        """Return the (balance, earnings) cents a single transaction adds to its roll-up row."""
+        if is_void or not amount:
+            return 0, 0
+        cents = cls.to_cents(amount)
+        is_earning = amount > 0 and not is_transfer
+        return cents, (cents if is_earning else 0)
+
+    @classmethod
+    def apply_delta(cls, connection, student_id, join_code, teacher_id, account_type,
+                    balance_delta, earnings_delta):
+        """Add a delta to one roll-up row, creating the row on first write."""
+        if not balance_delta and not earnings_delta:
+            return
+
+        table = cls.__table__
+        key = {
+            'student_id': student_id,
+            'join_code': join_code or '',
+            'teacher_id': teacher_id or 0,
+            'account_type': account_type or '',
+        }
+        now = _utc_now()
+        dialect = connection.dialect.name
+
+        if dialect in ('postgresql', 'sqlite'):
+            insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+            stmt = insert(table).values(
+                **key, balance_cents=balance_delta, earnings_cents=earnings_delta, updated_at=now
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(key),
+                set_={
+                    'balance_cents': table.c.balance_cents + stmt.excluded.balance_cents,
+                    'earnings_cents': table.c.earnings_cents + stmt.excluded.earnings_cents,
+                    'updated_at': stmt.excluded.updated_at,
+                },
+            )
+            connection.execute(stmt)
+            return
+
+        result = connection.execute(
+            table.update()
+            .where(db.and_(*(table.c[col] == value for col, value in key.items())))
+            .values(
+                balance_cents=table.c.balance_cents + balance_delta,
+                earnings_cents=table.c.earnings_cents + earnings_delta,
+                updated_at=now,
+            )
+        )
+        if result.rowcount == 0:
+            connection.execute(
+                table.insert().values(
+                    **key, balance_cents=balance_delta, earnings_cents=earnings_delta, updated_at=now
+                )
+            )
+
+    @classmethod
+    def rebuild(cls, student_ids=None):
+        """
+        Recompute roll-up rows from the transaction table.
+
+        Used for the initial backfill and after raw SQL that bypasses the ORM
+        (e.g. bulk join_code backfills). Pass student_ids to limit the rebuild.
+        Caller is responsible for committing.
+        """
+        tx = Transaction.__table__
+        live = tx.c.is_void.isnot(True)
+        is_earning = db.and_(live, tx.c.amount > 0, tx.c.is_transfer.isnot(True))
+        join_code = db.func.coalesce(tx.c.join_code, '')
+        teacher_id = db.func.coalesce(tx.c.teacher_id, 0)
+        account_type = db.func.coalesce(tx.c.account_type, '')
+        cents = db.cast(db.func.round(db.cast(tx.c.amount, db.Numeric) * 100), db.BigInteger)
+
+        source = db.select(
+            tx.c.student_id,
+            join_code,
+            teacher_id,
+            account_type,
+            db.func.sum(db.case((live, cents), else_=0)),
+            db.func.sum(db.case((is_earning, cents), else_=0)),
+            db.func.max(tx.c.timestamp),
+        ).group_by(tx.c.student_id, join_code, teacher_id, account_type)
+
+        delete = cls.__table__.delete()
+        if student_ids is not None:
+            source = source.where(tx.c.student_id.in_(student_ids))
+            delete = delete.where(cls.__table__.c.student_id.in_(student_ids))
+
+        db.session.execute(delete)
+        db.session.execute(
+            cls.__table__.insert().from_select(
+                ['student_id', 'join_code', 'teacher_id', 'account_type',
+                 'balance_cents', 'earnings_cents', 'updated_at'],
+                source,
+            )
+        )
+        _invalidate_cached_balances(db.session, student_ids)
+
+
+_BALANCE_FIELDS = ('student_id', 'join_code', 'teacher_id', 'account_type', 'amount', 'is_void', 'is_transfer')
+
+
+def _apply_transaction_balance(connection, values, sign):
+    balance, earnings = StudentBalance.contribution(
+        values['amount'], values['is_void'], values['is_transfer']
+    )
+    StudentBalance.apply_delta(
+        connection,
+        values['student_id'], values['join_code'], values['teacher_id'], values['account_type'],
+        sign * balance, sign * earnings,
+    )
+
+
+def _persisted_transaction_values(connection, transaction_id):
+    """Read the balance-relevant columns of a transaction row as currently stored."""
+    table = Transaction.__table__
+    row = connection.execute(
+        db.select(*(table.c[field] for field in _BALANCE_FIELDS)).where(table.c.id == transaction_id)
+    ).mappings().first()
+    return dict(row) if row else None
+
+
+event.listen(TeacherBlock.first_name, 'set', _sync_first_name_search_hash)
+event.listen(Student.first_name, 'set', _sync_first_name_search_hash)
+
+
+@event.listens_for(Transaction, 'after_insert')
+def _rollup_transaction_insert(mapper, connection, target):
+    values = {field: getattr(target, field) for field in _BALANCE_FIELDS}
+    _apply_transaction_balance(connection, values, 1)
+
+
+@event.listens_for(Transaction, 'before_update')
+def _rollup_transaction_update(mapper, connection, target):
+    state = db.inspect(target)
+    if not any(state.attrs[field].history.has_changes() for field in _BALANCE_FIELDS):
+        return
+    old = _persisted_transaction_values(connection, target.id)
+    if old is None:
+        return
+    # Attributes missing from __dict__ were not modified (or were expired) and keep their stored value
+    new = {field: target.__dict__.get(field, old[field]) for field in _BALANCE_FIELDS}
+    _apply_transaction_balance(connection, old, -1)
+    _apply_transaction_balance(connection, new, 1)
+
+
+@event.listens_for(Transaction, 'before_delete')
+def _rollup_transaction_delete(mapper, connection, target):
+    old = _persisted_transaction_values(connection, target.id)
+    if old is not None:
+        _apply_transaction_balance(connection, old, -1)
+
+
+def _invalidate_cached_balances(session, student_ids=None):
+    """Clear cached balances of the given loaded students, or of every loaded student if None."""
+    if student_ids is None:
+        students = [obj for obj in session.identity_map.values() if isinstance(obj, Student)]
+    else:
+        students = [session.identity_map.get(identity_key(Student, student_id)) for student_id in student_ids]
+    for student in students:
+        if student is not None:
+            student.invalidate_balance_cache()
+
+
+def _transaction_student_ids(transaction):
+    """Student ids whose balances a pending or flushed transaction can change."""
+    student_ids = set(db.inspect(transaction).attrs.student_id.history.deleted)
+    student = transaction.__dict__.get('student')
+    student_ids.add(student.id if student is not None else transaction.student_id)
+    student_ids.discard(None)
+    return student_ids
+
+
+@event.listens_for(Session, 'transient_to_pending')
+def _invalidate_balances_on_add(session, instance):
+    # Pending rows are picked up by autoflush, but only if the cached value is dropped
+    if isinstance(instance, Transaction):
+        student = instance.__dict__.get('student')
+        if student is not None:
+            student.invalidate_balance_cache()
+        _invalidate_cached_balances(session, _transaction_student_ids(instance))
+
+
+def _invalidate_balances_on_set(target, value, oldvalue, initiator):
+    # An edit is only flushed when a balance query runs, which a cached value would skip
+    session = db.inspect(target).session
+    if session is None:
+        return
+    student_ids = _transaction_student_ids(target)
+    if initiator.key == 'student_id' and value is not None:
+        student_ids.add(value)
+    _invalidate_cached_balances(session, student_ids)
+
+
+for _field in _BALANCE_FIELDS:
+    event.listen(getattr(Transaction, _field), 'set', _invalidate_balances_on_set)
+
+
+@event.listens_for(Session, 'after_flush')
+def _invalidate_balances_on_flush(session, flush_context):
+    student_ids = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Transaction):
+            student_ids |= _transaction_student_ids(obj)
+    if student_ids:
+        _invalidate_cached_balances(session, student_ids)
+
+
+@event.listens_for(Student, 'expire')
+def _invalidate_balances_on_expire(target, attrs):
+    target.invalidate_balance_cache()
+
+
+@event.listens_for(Student, 'refresh')
+def _invalidate_balances_on_refresh(target, context, attrs):
+    target.invalidate_balance_cache()
+
 
 # ---- TapEvent Model (append-only) ----
 class StudentBlock(db.Model):
@@ -492,7 +965,6 @@ class StudentBlock(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint('student_id', 'period', name='uq_student_blocks_student_period'),
-        db.Index('ix_student_blocks_student_id', 'student_id'),
         db.Index('ix_student_blocks_period', 'period'),
     )
 
@@ -518,6 +990,11 @@ class TapEvent(db.Model):
     student = db.relationship("Student", backref="tap_events")
     deleted_by_admin = db.relationship("Admin", foreign_keys=[deleted_by])
 
+    __table_args__ = (
+        # Partial index over non-deleted taps; matches the `is_deleted == False` attendance filters
+        db.Index('ix_tap_live', 'student_id', 'period', postgresql_where=db.text('is_deleted = false')),
+    )
+
 
 # ---- Hall Pass Log Model ----
 class HallPassLog(db.Model):
@@ -557,7 +1034,7 @@ class HallPassSettings(db.Model):
     updated_at = db.Column(db.DateTime, default=_utc_now, onupdate=_utc_now)
 
     # Relationships
-    teacher = db.relationship('Admin', backref=db.backref('hall_pass_settings', lazy='dynamic'))
+    teacher = db.relationship('Admin', backref=db.backref('hall_pass_settings', lazy='select'))
 
 
 # -------------------- STORE MODELS --------------------
@@ -602,25 +1079,22 @@ class StoreItem(db.Model):
     visible_blocks = db.relationship(
         'StoreItemBlock',
         backref='store_item',
-        lazy='dynamic',
+        lazy='selectin',
         cascade='all, delete-orphan'
     )
 
     @property
     def blocks_list(self):
-        """Return list of block names this item is visible to (empty list means all blocks)."""
+        """Return list of block names this item is visible to (empty list means all blocks).
+
+        Built from the selectin-loaded collection; a new plain list on each
+        access, so change visibility with set_blocks() rather than mutating it.
+        """
         return [b.block for b in self.visible_blocks]
 
     def set_blocks(self, block_list):
         """Set the blocks this item is visible to. Pass empty list for all blocks."""
-        # Clear existing blocks
-        StoreItemBlock.query.filter_by(store_item_id=self.id).delete()
-        # Add new blocks
-        if block_list:
-            db.session.add_all([
-                StoreItemBlock(store_item_id=self.id, block=block.strip().upper())
-                for block in block_list
-            ])
+        _replace_visible_blocks(self, StoreItemBlock.__table__.c.store_item_id, block_list)
 
 
 class StoreItemBlock(db.Model):
@@ -630,10 +1104,14 @@ class StoreItemBlock(db.Model):
     block = db.Column(db.String(10), primary_key=True)
 
     __table_args__ = (
-        db.Index('ix_store_item_blocks_item', 'store_item_id'),
         db.Index('ix_store_item_blocks_block', 'block'),
+        db.CheckConstraint('block = upper(trim(block))', name='ck_store_item_blocks_block_normalized'),
     )
 
+    @validates('block')
+    def _validate_block(self, key, block):
+        return _normalize_block(block)
+
 
 class StudentItem(db.Model):
     __tablename__ = 'student_items'
@@ -672,7 +1150,7 @@ class RentSettings(db.Model):
     is_enabled = db.Column(db.Boolean, default=True)
 
     # Rent amount and frequency
-    rent_amount = db.Column(db.Float, default=50.0)
+    rent_amount = db.Column(db.Numeric(10, 2, asdecimal=False), default=50.0)
     frequency_type = db.Column(db.String(20), default='monthly')  # 'daily', 'weekly', 'monthly', 'custom'
     custom_frequency_value = db.Column(db.Integer, nullable=True)  # For custom: x per time unit
     custom_frequency_unit = db.Column(db.String(20), nullable=True)  # 'days', 'weeks', 'months'
@@ -683,7 +1161,7 @@ class RentSettings(db.Model):
 
     # Grace period and late penalties
     grace_period_days = db.Column(db.Integer, default=3)
-    late_penalty_amount = db.Column(db.Float, default=10.0)
+    late_penalty_amount = db.Column(db.Numeric(10, 2, asdecimal=False), default=10.0)
     late_penalty_type = db.Column(db.String(20), default='once')  # 'once' or 'recurring'
     late_penalty_frequency_days = db.Column(db.Integer, nullable=True)  # For recurring type
 
@@ -697,7 +1175,7 @@ class RentSettings(db.Model):
     updated_at = db.Column(db.DateTime, default=_utc_now, onupdate=_utc_now)
 
     # Relationships
-    teacher = db.relationship('Admin', backref=db.backref('rent_settings', lazy='dynamic'))
+    teacher = db.relationship('Admin', backref=db.backref('rent_settings', lazy='select'))
 
     # Keep old field names for backward compatibility (deprecated)
     @property
@@ -713,17 +1191,24 @@ class RentPayment(db.Model):
 
     # CRITICAL: join_code is the source of truth for class isolation
     # Each rent payment should be scoped to the specific class/period
-    join_code = db.Column(db.String(20), nullable=True, index=True)
+    join_code = db.Column(db.String(20), nullable=True)  # Indexed via ix_rent_payments_lookup
 
-    amount_paid = db.Column(db.Float, nullable=False)
+    amount_paid = db.Column(db.Numeric(10, 2, asdecimal=False), nullable=False)
     period_month = db.Column(db.Integer, nullable=False)  # Month (1-12)
     period_year = db.Column(db.Integer, nullable=False)  # Year (e.g., 2025)
     payment_date = db.Column(db.DateTime, default=_utc_now)
     was_late = db.Column(db.Boolean, default=False)
-    late_fee_charged = db.Column(db.Float, default=0.0)
+    late_fee_charged = db.Column(db.Numeric(10, 2, asdecimal=False), default=0.0)
 
     student = db.relationship('Student', backref='rent_payments')
 
+    __table_args__ = (
+        # Class-scoped rent reconciliation: join_code + billing period (+ student)
+        db.Index('ix_rent_payments_lookup', 'join_code', 'period_year', 'period_month', 'student_id'),
+        # Per-student payment checks and history
+        db.Index('ix_rent_payments_student_period', 'student_id', 'period_year', 'period_month'),
+    )
+
 
 class RentWaiver(db.Model):
     __tablename__ = 'rent_waivers'
@@ -739,6 +1224,17 @@ class RentWaiver(db.Model):
     student = db.relationship('Student', backref='rent_waivers')
     created_by = db.relationship('Admin', backref='rent_waivers_created')
 
+    @classmethod
+    def bulk_create(cls, rows):
+        """
+        Insert one waiver per dict in ``rows`` with a single executemany INSERT.
+
+        Skips per-object flush and identity-map bookkeeping; use when waiving
+        rent for many students at once. Caller is responsible for committing.
+        """
+        if rows:
+            db.session.execute(cls.__table__.insert(), rows)
+
 
 class RentItem(db.Model):
     """
@@ -766,7 +1262,11 @@ class RentItem(db.Model):
     updated_at = db.Column(db.DateTime, default=_utc_now, onupdate=_utc_now)
 
     # Relationships
-    rent_setting = db.relationship('RentSettings', backref=db.backref('rent_items', lazy='dynamic', cascade='all, delete-orphan'))
+    # Loaded on access (or batched with selectinload); not selectin so plain RentSettings lookups stay one query
+    rent_setting = db.relationship(
+        'RentSettings',
+        backref=db.backref('rent_items', lazy='select', order_by='RentItem.order_index', cascade='all, delete-orphan'),
+    )
     store_item = db.relationship('StoreItem', backref='rent_item_source', foreign_keys=[store_item_id])
 
 
@@ -778,14 +1278,14 @@ class InsurancePolicy(db.Model):
     teacher_id = db.Column(db.Integer, db.ForeignKey('admins.id'), nullable=True)  # Owner teacher
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=True)
-    premium = db.Column(db.Float, nullable=False)  # Monthly cost
+    premium = db.Column(db.Numeric(10, 2, asdecimal=False), nullable=False)  # Monthly cost
     charge_frequency = db.Column(db.String(20), default='monthly')  # monthly, weekly, etc
     autopay = db.Column(db.Boolean, default=True)
     waiting_period_days = db.Column(db.Integer, default=7)  # Days before coverage starts
     max_claims_count = db.Column(db.Integer, nullable=True)  # Max claims per period (null = unlimited)
     max_claims_period = db.Column(db.String(20), default='month')  # month, semester, year
-    max_claim_amount = db.Column(db.Float, nullable=True)  # Max $ per claim (null = unlimited)
-    max_payout_per_period = db.Column(db.Float, nullable=True)  # Max total $ payout per period (null = unlimited)
+    max_claim_amount = db.Column(db.Numeric(10, 2, asdecimal=False), nullable=True)  # Max $ per claim (null = unlimited)
+    max_payout_per_period = db.Column(db.Numeric(10, 2, asdecimal=False), nullable=True)  # Max total $ payout per period (null = unlimited)
 
     # Claim type
     claim_type = db.Column(db.String(20), nullable=False, default='legacy_monetary')  # transaction_monetary, non_monetary, legacy_monetary
@@ -801,7 +1301,7 @@ class InsurancePolicy(db.Model):
     # Bundle settings (JSON or separate table in future)
     bundle_with_policy_ids = db.Column(db.Text, nullable=True)  # Comma-separated IDs
     bundle_discount_percent = db.Column(db.Float, default=0)  # Discount % for bundle
-    bundle_discount_amount = db.Column(db.Float, default=0)  # Discount $ amount for bundle
+    bundle_discount_amount = db.Column(db.Numeric(10, 2, asdecimal=False), default=0)  # Discount $ amount for bundle
 
     # Marketing badge for student-facing display
     marketing_badge = db.Column(db.String(50), nullable=True)  # Predefined badge options
@@ -828,25 +1328,31 @@ class InsurancePolicy(db.Model):
     visible_blocks = db.relationship(
         'InsurancePolicyBlock',
         backref='policy',
-        lazy='dynamic',
+        lazy='selectin',
         cascade='all, delete-orphan'
     )
 
     @property
     def blocks_list(self):
-        """Return list of block names this policy is visible to (empty list means all blocks)."""
+        """Return list of block names this policy is visible to (empty list means all blocks).
+
+        Built from the selectin-loaded collection; a new plain list on each
+        access, so change visibility with set_blocks() rather than mutating it.
+        """
         return [b.block for b in self.visible_blocks]
 
+    @classmethod
+    def visible_to_block(cls, block):
+        """SQL criterion: the policy has no block restriction or includes ``block``."""
+        restricted = db.exists().where(InsurancePolicyBlock.policy_id == cls.id)
+        return db.or_(
+            ~restricted,
+            restricted.where(InsurancePolicyBlock.block == _normalize_block(block)),
+        )
+
     def set_blocks(self, block_list):
         """Set the blocks this policy is visible to. Pass empty list for all blocks."""
-        # Clear existing blocks
-        InsurancePolicyBlock.query.filter_by(policy_id=self.id).delete()
-        # Add new blocks
-        if block_list:
-            db.session.add_all([
-                InsurancePolicyBlock(policy_id=self.id, block=block.strip().upper())
-                for block in block_list
-            ])
+        _replace_visible_blocks(self, InsurancePolicyBlock.__table__.c.policy_id, block_list)
 
     @property
     def is_monetary_claim(self):
@@ -860,10 +1366,14 @@ class InsurancePolicyBlock(db.Model):
     block = db.Column(db.String(10), primary_key=True)
 
     __table_args__ = (
-        db.Index('ix_insurance_policy_blocks_policy', 'policy_id'),
         db.Index('ix_insurance_policy_blocks_block', 'block'),
+        db.CheckConstraint('block = upper(trim(block))', name='ck_insurance_policy_blocks_block_normalized'),
     )
 
+    @validates('block')
+    def _validate_block(self, key, block):
+        return _normalize_block(block)
+
 
 class StudentInsurance(db.Model):
     __tablename__ = 'student_insurance'
@@ -888,7 +1398,12 @@ class StudentInsurance(db.Model):
 
     # Relationships
     student = db.relationship('Student', backref='insurance_policies')
-    claims = db.relationship('InsuranceClaim', backref='student_policy', lazy='dynamic')
+    claims = db.relationship('InsuranceClaim', backref='student_policy', lazy='select')
+
+    __table_args__ = (
+        # Active-enrollment lookups per student (get_active_insurance, bulk_active_insurance)
+        db.Index('ix_si_student_status', 'student_id', 'status'),
+    )
 
 
 class InsuranceClaim(db.Model):
@@ -904,14 +1419,14 @@ class InsuranceClaim(db.Model):
     incident_date = db.Column(db.DateTime, nullable=False)  # When incident occurred
     filed_date = db.Column(db.DateTime, default=_utc_now)
     description = db.Column(db.Text, nullable=False)
-    claim_amount = db.Column(db.Float, nullable=True)  # For monetary claims: requested amount
+    claim_amount = db.Column(db.Numeric(10, 2, asdecimal=False), nullable=True)  # For monetary claims: requested amount
     claim_item = db.Column(db.Text, nullable=True)  # For non-monetary claims: what they're claiming
     comments = db.Column(db.Text, nullable=True)  # Optional comments from student
 
     status = db.Column(db.String(20), default='pending')  # pending, approved, rejected, paid
     rejection_reason = db.Column(db.Text, nullable=True)
     admin_notes = db.Column(db.Text, nullable=True)
-    approved_amount = db.Column(db.Float, nullable=True)
+    approved_amount = db.Column(db.Numeric(10, 2, asdecimal=False), nullable=True)
     processed_date = db.Column(db.DateTime, nullable=True)
     processed_by_admin_id = db.Column(db.Integer, db.ForeignKey('admins.id'), nullable=True)
     transaction_id = db.Column(db.Integer, db.ForeignKey('transaction.id'), nullable=True)
@@ -933,8 +1448,9 @@ class ErrorLog(db.Model):
     request_method = db.Column(db.String(10), nullable=True)  # HTTP method (GET, POST, etc.)
     user_agent = db.Column(db.String(500), nullable=True)  # Browser/client info
     ip_address = db.Column(db.String(50), nullable=True)  # IP address of requester
-    log_output = db.Column(db.Text, nullable=False)  # Last 50 lines of log
-    stack_trace = db.Column(db.Text, nullable=True)  # Full stack trace
+    # Large diagnostic text is only shown on the log pages; those queries undefer it
+    log_output = db.deferred(db.Column(db.Text, nullable=False), group='diagnostics')  # Last 50 lines of log
+    stack_trace = db.deferred(db.Column(db.Text, nullable=True), group='diagnostics')  # Full stack trace
 
 
 # ---- User Report Model (Bug Reports, Suggestions, Comments) ----
@@ -943,7 +1459,7 @@ class UserReport(db.Model):
     id = db.Column(db.Integer, primary_key=True)
 
     # Anonymous user identification (HMAC of user identifier)
-    anonymous_code = db.Column(db.String(64), nullable=False, index=True)
+    anonymous_code = db.Column(db.String(64), nullable=False)
     user_type = db.Column(db.String(20), nullable=False)  # 'student', 'teacher', 'anonymous'
 
     # Report details
@@ -967,7 +1483,7 @@ class UserReport(db.Model):
     reviewed_by_sysadmin_id = db.Column(db.Integer, db.ForeignKey('system_admins.id'), nullable=True)
 
     # Reward tracking (for legitimate bugs)
-    reward_amount = db.Column(db.Float, nullable=True, default=0.0)
+    reward_amount = db.Column(db.Numeric(10, 2, asdecimal=False), nullable=True, default=0.0)
     reward_sent_at = db.Column(db.DateTime, nullable=True)
 
     # Internal student ID (hidden from sysadmin, used only for reward routing)
@@ -980,6 +1496,11 @@ class UserReport(db.Model):
 
     reviewed_by = db.relationship('SystemAdmin', backref='reviewed_reports', foreign_keys=[reviewed_by_sysadmin_id])
 
+    __table_args__ = (
+        # "My reports" looks up one reporter's newest reports; the sort key lets the index supply the order
+        db.Index('ix_user_reports_anonymous_submitted', 'anonymous_code', db.text('submitted_at DESC')),
+    )
+
 
 # ---- Issue Resolution System Models ----
 
@@ -1025,7 +1546,7 @@ class Issue(db.Model):
     id = db.Column(db.Integer, primary_key=True)
 
     # Student identification (non-identifying for sysadmin)
-    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False, index=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)  # Indexed via ix_issues_student_status
     student_first_name = db.Column(db.String(100), nullable=False)  # Cached for display
     student_last_initial = db.Column(db.String(1), nullable=False)
 
@@ -1033,8 +1554,9 @@ class Issue(db.Model):
     opaque_student_reference = db.Column(db.String(64), nullable=False, index=True)
 
     # Class context
-    teacher_id = db.Column(db.Integer, db.ForeignKey('admins.id'), nullable=False, index=True)
-    join_code = db.Column(db.String(20), nullable=False, index=True)
+    # Both indexed as leading columns of the (…, status) composites below
+    teacher_id = db.Column(db.Integer, db.ForeignKey('admins.id'), nullable=False)
+    join_code = db.Column(db.String(20), nullable=False)
     class_label = db.Column(db.String(50), nullable=True)  # Cached class name
 
     # Issue categorization
@@ -1051,10 +1573,10 @@ class Issue(db.Model):
     related_record_type = db.Column(db.String(50), nullable=True)  # 'transaction', 'tap_event', 'rent_payment', etc.
     related_record_id = db.Column(db.Integer, nullable=True)  # Generic ID for other record types
 
-    # System context snapshot (automatic, immutable)
-    context_snapshot = db.Column(db.JSON, nullable=True)  # Ledger state, amounts, timestamps, etc.
+    # System context snapshot (automatic, immutable); JSONB on PostgreSQL
+    context_snapshot = db.Column(db.JSON().with_variant(postgresql.JSONB(), 'postgresql'), nullable=True)  # Ledger state, amounts, timestamps, etc.
     page_url = db.Column(db.String(500), nullable=True)
-    system_metadata = db.Column(db.JSON, nullable=True)  # Recent events, browser info, etc.
+    system_metadata = db.Column(db.JSON().with_variant(postgresql.JSONB(), 'postgresql'), nullable=True)  # Recent events, browser info, etc.
 
     # Status tracking
     status = db.Column(db.String(50), default='submitted', nullable=False, index=True)
@@ -1092,16 +1614,40 @@ class Issue(db.Model):
     teacher = db.relationship('Admin', backref=db.backref('class_issues', lazy='dynamic'))
     sysadmin = db.relationship('SystemAdmin', backref=db.backref('reviewed_issues', lazy='dynamic'))
     related_transaction = db.relationship('Transaction', backref='related_issues')
-    status_history = db.relationship('IssueStatusHistory', backref='issue', lazy='dynamic', cascade='all, delete-orphan', order_by='IssueStatusHistory.changed_at.desc()')
-    resolution_actions = db.relationship('IssueResolutionAction', backref='issue', lazy='dynamic', cascade='all, delete-orphan', order_by='IssueResolutionAction.created_at.desc()')
+    # Bounded per-issue collections: plain lists so they load once and can be selectinload()-ed
+    status_history = db.relationship('IssueStatusHistory', backref='issue', lazy='select', cascade='all, delete-orphan', order_by='IssueStatusHistory.changed_at.desc()')
+    resolution_actions = db.relationship('IssueResolutionAction', backref='issue', lazy='select', cascade='all, delete-orphan', order_by='IssueResolutionAction.created_at.desc()')
 
     # Indexes
     __table_args__ = (
         db.Index('ix_issues_teacher_status', 'teacher_id', 'status'),
         db.Index('ix_issues_student_status', 'student_id', 'status'),
         db.Index('ix_issues_join_code_status', 'join_code', 'status'),
+        # The teacher pending queue only reads issues awaiting the teacher, a small share of all rows
+        db.Index(
+            'ix_issues_open_teacher', 'teacher_id', db.text('submitted_at DESC'),
+            postgresql_where=db.text("status IN ('submitted', 'teacher_review')"),
+        ),
+        db.Index(
+            'ix_issues_open_join_code', 'join_code', db.text('submitted_at DESC'),
+            postgresql_where=db.text("status IN ('submitted', 'teacher_review')"),
+        ),
     )
 
+    @classmethod
+    def detail_query(cls):
+        """Issue query that loads everything the detail pages render up front.
+
+        Category and teacher come from the same SELECT; status history and
+        resolution actions are batched into one IN query each.
+        """
+        return cls.query.options(
+            db.joinedload(cls.category),
+            db.joinedload(cls.teacher),
+            db.selectinload(cls.status_history),
+            db.selectinload(cls.resolution_actions),
+        )
+
     def get_student_visible_status(self):
         """Return simplified status badge for student view."""
         status_map = {
@@ -1162,7 +1708,7 @@ class IssueResolutionAction(db.Model):
 
     # Related changes (for audit trail)
     related_transaction_id = db.Column(db.Integer, db.ForeignKey('transaction.id'), nullable=True)
-    amount_changed = db.Column(db.Float, nullable=True)
+    amount_changed = db.Column(db.Numeric(10, 2, asdecimal=False), nullable=True)
     before_value = db.Column(db.Text, nullable=True)
     after_value = db.Column(db.Text, nullable=True)
 
@@ -1246,7 +1792,7 @@ class RecoveryRequest(db.Model):
 
     # Relationships
     admin = db.relationship('Admin', backref=db.backref('recovery_requests', lazy='dynamic'))
-    verification_codes = db.relationship('StudentRecoveryCode', backref='recovery_request', lazy='dynamic', cascade='all, delete-orphan')
+    verification_codes = db.relationship('StudentRecoveryCode', backref='recovery_request', lazy='select', cascade='all, delete-orphan')
 
 
 class StudentRecoveryCode(db.Model):
@@ -1311,7 +1857,9 @@ class PayrollSettings(db.Model):
     expected_weekly_hours = db.Column(db.Float, nullable=True, default=5.0)  # Expected class hours per week
 
     # Relationships
-    teacher = db.relationship('Admin', backref=db.backref('payroll_settings', lazy='dynamic'))
+    # Per-teacher settings/config backrefs are bounded (a few rows per block): plain lists that
+    # load only on access and can be batched with selectinload(Admin.payroll_settings)
+    teacher = db.relationship('Admin', backref=db.backref('payroll_settings', lazy='select'))
 
     def __repr__(self):
         return f'<PayrollSettings {self.block or "Global"}>'
@@ -1329,7 +1877,7 @@ class PayrollReward(db.Model):
     created_at = db.Column(db.DateTime, default=_utc_now)
 
     # Relationships
-    teacher = db.relationship('Admin', backref=db.backref('payroll_rewards', lazy='dynamic'))
+    teacher = db.relationship('Admin', backref=db.backref('payroll_rewards', lazy='select'))
 
     def __repr__(self):
         return f'<PayrollReward {self.name}: ${self.amount}>'
@@ -1347,7 +1895,7 @@ class PayrollFine(db.Model):
     created_at = db.Column(db.DateTime, default=_utc_now)
 
     # Relationships
-    teacher = db.relationship('Admin', backref=db.backref('payroll_fines', lazy='dynamic'))
+    teacher = db.relationship('Admin', backref=db.backref('payroll_fines', lazy='select'))
 
     def __repr__(self):
         return f'<PayrollFine {self.name}: -${self.amount}>'
@@ -1391,7 +1939,7 @@ class BankingSettings(db.Model):
     updated_at = db.Column(db.DateTime, default=_utc_now, onupdate=_utc_now)
 
     # Relationships
-    teacher = db.relationship('Admin', backref=db.backref('banking_settings', lazy='dynamic'))
+    teacher = db.relationship('Admin', backref=db.backref('banking_settings', lazy='select'))
 
     def __repr__(self):
         return f'<BankingSettings APY:{self.savings_apy}% OD:{self.overdraft_protection_enabled}>'
@@ -1431,6 +1979,11 @@ class DemoStudent(db.Model):
     admin = db.relationship('Admin', backref='demo_sessions')
     student = db.relationship('Student', backref='demo_sessions', foreign_keys=[student_id])
 
+    __table_args__ = (
+        # Cleanup sweep: active sessions past expires_at
+        db.Index('ix_demo_students_active_expires', 'expires_at', postgresql_where=db.text('is_active = true')),
+    )
+
     def __repr__(self):
         status = 'active' if self.is_active else 'ended'
         return f'<DemoStudent admin_id={self.admin_id} student_id={self.student_id} {status}>'
@@ -1477,12 +2030,11 @@ class FeatureSettings(db.Model):
     updated_at = db.Column(db.DateTime, default=_utc_now, onupdate=_utc_now)
 
     # Relationships
-    teacher = db.relationship('Admin', backref=db.backref('feature_settings', lazy='dynamic', passive_deletes=True))
+    teacher = db.relationship('Admin', backref=db.backref('feature_settings', lazy='select', passive_deletes=True))
 
     # Unique constraint: one settings row per teacher-block combination
     __table_args__ = (
         db.UniqueConstraint('teacher_id', 'block', name='uq_feature_settings_teacher_block'),
-        db.Index('ix_feature_settings_teacher_id', 'teacher_id'),
     )
 
     def __repr__(self):
@@ -1491,30 +2043,66 @@ class FeatureSettings(db.Model):
 
     def to_dict(self):
         """Return feature settings as a dictionary."""
-        return {
-            'payroll_enabled': self.payroll_enabled,
-            'insurance_enabled': self.insurance_enabled,
-            'banking_enabled': self.banking_enabled,
-            'rent_enabled': self.rent_enabled,
-            'hall_pass_enabled': self.hall_pass_enabled,
-            'store_enabled': self.store_enabled,
-            'bug_reports_enabled': self.bug_reports_enabled,
-            'bug_rewards_enabled': self.bug_rewards_enabled,
-        }
+        return dict(zip(self.FEATURE_KEYS, self._feature_values(self)))
+
+    DEFAULTS = {
+        'payroll_enabled': True,
+        'insurance_enabled': True,
+        'banking_enabled': True,
+        'rent_enabled': True,
+        'hall_pass_enabled': True,
+        'store_enabled': True,
+        'bug_reports_enabled': True,
+        'bug_rewards_enabled': True,
+    }
+    FEATURE_KEYS = tuple(DEFAULTS)
+    # Reads every toggle in one call; attrgetter objects do not bind as methods
+    _feature_values = attrgetter(*FEATURE_KEYS)
 
     @classmethod
     def get_defaults(cls):
         """Return default feature settings dictionary."""
-        return {
-            'payroll_enabled': True,
-            'insurance_enabled': True,
-            'banking_enabled': True,
-            'rent_enabled': True,
-            'hall_pass_enabled': True,
-            'store_enabled': True,
-            'bug_reports_enabled': True,
-            'bug_rewards_enabled': True,
-        }
+        return dict(cls.DEFAULTS)
+
+    @classmethod
+    def resolve(cls, teacher_id, block=None):
+        """Return effective settings for a teacher's period as a dictionary.
+
+        Block-specific settings override the teacher's global (block=NULL) row,
+        which overrides system defaults. Both candidate rows are fetched in a
+        single query, ordered so the block-specific row comes first.
+        """
+        query = cls.query.options(
+            db.load_only(*(getattr(cls, key) for key in cls.FEATURE_KEYS))
+        ).filter(cls.teacher_id == teacher_id)
+        if block:
+            query = query.filter(db.or_(cls.block == block, cls.block.is_(None)))
+        else:
+            query = query.filter(cls.block.is_(None))
+        settings = query.order_by(cls.block.is_(None)).first()
+        return settings.to_dict() if settings else cls.get_defaults()
+
+    @classmethod
+    def for_blocks(cls, teacher_id, blocks, create=False):
+        """Return a teacher's period settings rows keyed by block.
+
+        All rows are fetched with one query. With ``create=True``, missing
+        blocks get new rows added to the session so callers can update every
+        period and flush the inserts together.
+        """
+        blocks = list(dict.fromkeys(blocks))
+        rows = {}
+        if blocks:
+            rows = {
+                settings.block: settings
+                for settings in cls.query.filter(cls.teacher_id == teacher_id, cls.block.in_(blocks))
+            }
+        if create:
+            for block in blocks:
+                if block not in rows:
+                    rows[block] = cls(teacher_id=teacher_id, block=block)
+                    db.session.add(rows[block])
+        return rows
 
 
 # -------------------- TEACHER ONBOARDING MODEL --------------------
@@ -1568,12 +2156,22 @@ class TeacherOnboarding(db.Model):
 
     def mark_step_completed(self, step_name):
         """Mark a specific step as completed."""
+        self.mark_steps_completed([step_name])
+
+    def mark_steps_completed(self, step_names):
+        """Mark several steps as completed with a single JSON rewrite.
+
+        The JSON column is only flagged as modified when a step actually
+        changes, so repeated calls do not re-serialize an unchanged value.
+        """
         from sqlalchemy.orm.attributes import flag_modified
         if self.steps_completed is None:
             self.steps_completed = {}
-        self.steps_completed[step_name] = True
-        flag_modified(self, 'steps_completed')
-        self.last_activity_at = datetime.now(timezone.utc)
+        pending = [name for name in step_names if self.steps_completed.get(name) is not True]
+        if pending:
+            self.steps_completed.update(dict.fromkeys(pending, True))
+            flag_modified(self, 'steps_completed')
+        self.last_activity_at = _utc_now()
 
     def is_step_completed(self, step_name):
         """Check if a specific step is completed."""
@@ -1584,14 +2182,12 @@ class TeacherOnboarding(db.Model):
     def complete_onboarding(self):
         """Mark the onboarding as completed."""
         self.is_completed = True
-        self.completed_at = datetime.now(timezone.utc)
-        self.last_activity_at = datetime.now(timezone.utc)
+        self.completed_at = self.last_activity_at = _utc_now()
 
     def skip_onboarding(self):
         """Mark the onboarding as skipped."""
         self.is_skipped = True
-        self.skipped_at = datetime.now(timezone.utc)
-        self.last_activity_at = datetime.now(timezone.utc)
+        self.skipped_at = self.last_activity_at = _utc_now()
 
     @property
     def needs_onboarding(self):
@@ -1603,9 +2199,10 @@ class TeacherOnboarding(db.Model):
         from sqlalchemy.orm.attributes import flag_modified
         if self.widget_tasks_completed is None:
             self.widget_tasks_completed = {}
-        self.widget_tasks_completed[task_name] = status
-        flag_modified(self, 'widget_tasks_completed')
-        self.last_activity_at = datetime.now(timezone.utc)
+        if self.widget_tasks_completed.get(task_name) != status:
+            self.widget_tasks_completed[task_name] = status
+            flag_modified(self, 'widget_tasks_completed')
+        self.last_activity_at = _utc_now()
 
     def is_widget_task_completed(self, task_name):
         """Check if a getting started widget task is completed/skipped."""
@@ -1617,8 +2214,7 @@ class TeacherOnboarding(db.Model):
     def dismiss_widget(self):
         """Dismiss the getting started widget permanently."""
         self.widget_dismissed = True
-        self.widget_dismissed_at = datetime.now(timezone.utc)
-        self.last_activity_at = datetime.now(timezone.utc)
+        self.widget_dismissed_at = self.last_activity_at = _utc_now()
 
 
 # -------------------- ANNOUNCEMENT MODEL --------------------
@@ -1662,15 +2258,29 @@ class Announcement(db.Model):
     expires_at = db.Column(db.DateTime, nullable=True)  # Optional expiration
 
     # Relationships
-    teacher = db.relationship('Admin', foreign_keys=[teacher_id], backref=db.backref('announcements', lazy='dynamic', passive_deletes=True))
-    system_admin = db.relationship('SystemAdmin', foreign_keys=[system_admin_id], backref=db.backref('announcements', lazy='dynamic', passive_deletes=True))
-    target_teacher = db.relationship('Admin', foreign_keys=[target_teacher_id], backref=db.backref('targeted_announcements', lazy='dynamic', passive_deletes=True))
+    # Feeds list many announcements; author/target lookups must be requested with a loader option
+    teacher = db.relationship(
+        'Admin', foreign_keys=[teacher_id], lazy='raise_on_sql',
+        backref=db.backref('announcements', lazy='dynamic', passive_deletes=True),
+    )
+    system_admin = db.relationship(
+        'SystemAdmin', foreign_keys=[system_admin_id], lazy='raise_on_sql',
+        backref=db.backref('announcements', lazy='dynamic', passive_deletes=True),
+    )
+    target_teacher = db.relationship(
+        'Admin', foreign_keys=[target_teacher_id], lazy='raise_on_sql',
+        backref=db.backref('targeted_announcements', lazy='dynamic', passive_deletes=True),
+    )
 
     # Indexes
     __table_args__ = (
-        db.Index('ix_announcements_join_code_active', 'join_code', 'is_active'),
+        # The student feed reads only active announcements; deactivated ones accumulate over a year
+        db.Index('ix_announcements_live_join_code', 'join_code', postgresql_where=db.text('is_active = true')),
         db.Index('ix_announcements_teacher_join_code', 'teacher_id', 'join_code'),
-        db.Index('ix_announcements_audience_type', 'audience_type', 'is_active'),
+        db.Index(
+            'ix_announcements_live_audience', 'audience_type', 'target_teacher_id',
+            postgresql_where=db.text('is_active = true'),
+        ),
         db.Index('ix_announcements_system_admin', 'system_admin_id', 'is_active'),
     )
 
@@ -1682,43 +2292,56 @@ class Announcement(db.Model):
         """Check if announcement has expired."""
         if self.expires_at is None:
             return False
-        return datetime.now(timezone.utc) > self.expires_at
+        return _utc_now() > self.expires_at
 
     def should_display(self):
-        """Check if announcement should be displayed."""
+        """Check if announcement should be displayed.
+
+        For a single loaded row; listings should filter with :meth:`visible`.
+        """
         return self.is_active and not self.is_expired()
 
+    @classmethod
+    def visible(cls, now=None):
+        """Query active, unexpired announcements (SQL form of should_display)."""
+        now = now or _utc_now()
+        return cls.query.filter(
+            cls.is_active == True,  # Matches the partial indexes' is_active = true predicate
+            or_(cls.expires_at.is_(None), cls.expires_at > now),
+        )
+
+    PRIORITY_CLASSES = {
+        'low': 'alert-secondary',
+        'normal': 'alert-info',
+        'high': 'alert-warning',
+        'urgent': 'alert-danger'
+    }
+    PRIORITY_ICONS = {
+        'low': 'push_pin',
+        'normal': 'campaign',
+        'high': 'warning',
+        'urgent': 'error'
+    }
+    AUDIENCE_LABELS = {
+        'class': 'Class Period',
+        'system_wide': 'Everyone (System-Wide)',
+        'all_teachers': 'All Teachers',
+        'all_students': 'All Students',
+        'teacher_all_classes': 'Teacher\'s All Classes',
+        'specific_class': 'Specific Class'
+    }
+
     def get_priority_class(self):
         """Get CSS class for announcement priority."""
-        priority_classes = {
-            'low': 'alert-secondary',
-            'normal': 'alert-info',
-            'high': 'alert-warning',
-            'urgent': 'alert-danger'
-        }
-        return priority_classes.get(self.priority, 'alert-info')
+        return self.PRIORITY_CLASSES.get(self.priority, 'alert-info')
 
     def get_priority_icon(self):
         """Get icon for announcement priority."""
-        priority_icons = {
-            'low': 'push_pin',
-            'normal': 'campaign',
-            'high': 'warning',
-            'urgent': 'error'
-        }
-        return priority_icons.get(self.priority, 'campaign')
+        return self.PRIORITY_ICONS.get(self.priority, 'campaign')
 
     def get_audience_label(self):
         """Get human-readable label for audience type."""
-        labels = {
-            'class': 'Class Period',
-            'system_wide': 'Everyone (System-Wide)',
-            'all_teachers': 'All Teachers',
-            'all_students': 'All Students',
-            'teacher_all_classes': 'Teacher\'s All Classes',
-            'specific_class': 'Specific Class'
-        }
-        return labels.get(self.audience_type, 'Unknown')
+        return self.AUDIENCE_LABELS.get(self.audience_type, 'Unknown')
 
     def is_system_admin_announcement(self):
         """Check if this is a system admin announcement."""
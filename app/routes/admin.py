@@ -18,18 +18,18 @@ import qrcode
 import hashlib
 from calendar import monthrange
 from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
 
 from flask import (
     Blueprint, redirect, url_for, flash, request, session,
-    jsonify, Response, send_file, current_app, abort
+    jsonify, Response, send_file, current_app, abort, stream_with_context
 )
 from urllib.parse import urlparse
 from sqlalchemy import desc, text, or_, func
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
 from sqlalchemy.exc import SQLAlchemyError
 import sqlalchemy as sa
 import pyotp
-import pytz
 
 from app.extensions import db, limiter
 from app.models import (
@@ -38,7 +38,7 @@ from app.models import (
     StudentInsurance, InsuranceClaim, HallPassLog, HallPassSettings, PayrollSettings, PayrollReward, PayrollFine,
     BankingSettings, TeacherBlock, DeletionRequest, DeletionRequestType, DeletionRequestStatus,
     UserReport, FeatureSettings, TeacherOnboarding, StudentBlock, RecoveryRequest, StudentRecoveryCode,
-    DemoStudent, Announcement, AdminCredential
+    DemoStudent, Announcement, AdminCredential, StudentBalance, first_name_filter
 )
 from app.auth import admin_required, get_admin_student_query, get_student_for_admin
 from forms import (
@@ -47,7 +47,7 @@ from forms import (
     PayrollRewardForm, PayrollFineForm, ManualPaymentForm, BankingSettingsForm
 )
 # Import utility functions
-from app.utils.helpers import is_safe_url, format_utc_iso, generate_anonymous_code, render_template_with_fallback as render_template
+from app.utils.helpers import is_safe_url, format_utc_iso, as_utc, generate_anonymous_code, render_template_with_fallback as render_template
 from app.utils.join_code import generate_join_code
 from app.utils.economy_balance import EconomyBalanceChecker
 from app.utils.claim_credentials import (
@@ -64,13 +64,13 @@ from app.utils.passwordless_client import (
     verify_signin_token,
     get_public_api_key
 )
-from hash_utils import get_random_salt, hash_hmac, hash_username, hash_username_lookup
+from hash_utils import get_random_salt, hash_first_name_lookup, hash_hmac, hash_username, hash_username_lookup
 from payroll import calculate_payroll
 from attendance import get_last_payroll_time, calculate_unpaid_attendance_seconds, get_join_code_for_student_period
 import time
 
 # Timezone
-PACIFIC = pytz.timezone('America/Los_Angeles')
+PACIFIC = ZoneInfo('America/Los_Angeles')
 
 # Join code generation constants
 MAX_JOIN_CODE_RETRIES = 10  # Maximum attempts to generate a unique join code
@@ -328,26 +328,7 @@ def _get_feature_settings(teacher_id, block=None):
     Returns:
         dict: Feature settings with all toggle values
     """
-    # Try block-specific settings first
-    if block:
-        block_settings = FeatureSettings.query.filter_by(
-            teacher_id=teacher_id,
-            block=block.strip().upper()
-        ).first()
-        if block_settings:
-            return block_settings.to_dict()
-
-    # Fall back to global settings
-    global_settings = FeatureSettings.query.filter_by(
-        teacher_id=teacher_id,
-        block=None
-    ).first()
-
-    if global_settings:
-        return global_settings.to_dict()
-
-    # Return defaults if no settings exist
-    return FeatureSettings.get_defaults()
+    return FeatureSettings.resolve(teacher_id, block.strip().upper() if block else None)
 
 
 def _get_or_create_onboarding(teacher_id):
@@ -523,8 +504,13 @@ def dashboard():
     # Auto-tapout students who have exceeded their daily limit
     auto_tapout_all_over_limit()
 
-    # Get all students for calculations
-    students = _scoped_students().order_by(Student.first_name).all()
+    # Get all students for calculations (balance roll-ups batched into one IN query)
+    students = (
+        _scoped_students()
+        .options(selectinload(Student.balances))
+        .order_by(Student.first_name)
+        .all()
+    )
     student_lookup = {s.id: s for s in students}
 
     # Quick Stats
@@ -1777,7 +1763,12 @@ def students():
         )
 
     # Get claimed students (Student records)
-    all_students = _scoped_students().order_by(Student.block, Student.first_name).all()
+    all_students = (
+        _scoped_students()
+        .options(selectinload(Student.balances))
+        .order_by(Student.block, Student.first_name)
+        .all()
+    )
 
     # Get ALL TeacherBlock records (both claimed and unclaimed seats)
     teacher_blocks = TeacherBlock.query.filter_by(teacher_id=current_admin).all()
@@ -1864,11 +1855,7 @@ def students():
             join_code = join_codes_by_block[block]
             for student in students_by_block.get(block, []):
                 key = (student.id, block)
-                student_balances_by_block[key] = {
-                    'checking': student.get_checking_balance(join_code=join_code),
-                    'savings': student.get_savings_balance(join_code=join_code),
-                    'earnings': student.get_total_earnings(join_code=join_code)
-                }
+                student_balances_by_block[key] = student.get_all_balances(join_code=join_code)
 
     # Calculate rent privileges for each student in each block (batched)
     from app.models import RentItem, RentSettings, RentPayment, StudentItem
@@ -2015,9 +2002,10 @@ def student_detail(student_id):
     scoped_total_earnings = 0
 
     if join_code:
-        scoped_checking_balance = student.get_checking_balance(join_code=join_code)
-        scoped_savings_balance = student.get_savings_balance(join_code=join_code)
-        scoped_total_earnings = student.get_total_earnings(join_code=join_code)
+        scoped_balances = student.get_all_balances(join_code=join_code)
+        scoped_checking_balance = scoped_balances['checking']
+        scoped_savings_balance = scoped_balances['savings']
+        scoped_total_earnings = scoped_balances['earnings']
     else:
         # Fallback: Log a warning and show $0 balances if no join_code is available.
         # This prevents accidentally showing aggregated data.
@@ -2171,6 +2159,10 @@ def edit_student():
                     )
             # If 'start_fresh', do nothing - student starts with $0 in that period
 
+        # Bulk join_code moves bypass the roll-up listeners
+        if transferred_blocks:
+            StudentBalance.rebuild(student_ids=[student.id])
+
     # Check if name changed (need to recalculate hashes)
     name_changed = (new_first_name != student.first_name or new_last_initial != student.last_initial)
     dob_changed = False
@@ -2231,7 +2223,9 @@ def edit_student():
             student_id=student.id,
             teacher_id=current_admin_id
         ).update({
+            # Bulk UPDATE skips the first_name 'set' listener, so write the search hash too
             'first_name': student.first_name,
+            'first_name_search_hash': hash_first_name_lookup(student.first_name),
             'last_initial': student.last_initial,
             'last_name_hash_by_part': student.last_name_hash_by_part or [],
             'dob_sum': student.dob_sum or 0,
@@ -2367,6 +2361,7 @@ def delete_student():
     try:
         # Delete associated records (cascade should handle this, but being explicit)
         Transaction.query.filter_by(student_id=student.id).delete()
+        StudentBalance.query.filter_by(student_id=student.id).delete()
         TapEvent.query.filter_by(student_id=student.id).delete()
         StudentItem.query.filter_by(student_id=student.id).delete()
         RentPayment.query.filter_by(student_id=student.id).delete()
@@ -2411,6 +2406,7 @@ def bulk_delete_students():
             if student:
                 # Delete associated records
                 Transaction.query.filter_by(student_id=student.id).delete()
+                StudentBalance.query.filter_by(student_id=student.id).delete()
                 TapEvent.query.filter_by(student_id=student.id).delete()
                 StudentItem.query.filter_by(student_id=student.id).delete()
                 RentPayment.query.filter_by(student_id=student.id).delete()
@@ -2465,6 +2461,7 @@ def delete_block():
             # Delete all associated records in bulk where possible to avoid N+1 queries
             # Using synchronize_session=False to avoid session synchronization issues
             Transaction.query.filter(Transaction.student_id.in_(student_ids)).delete(synchronize_session=False)
+            StudentBalance.query.filter(StudentBalance.student_id.in_(student_ids)).delete(synchronize_session=False)
             TapEvent.query.filter(TapEvent.student_id.in_(student_ids)).delete(synchronize_session=False)
             StudentItem.query.filter(StudentItem.student_id.in_(student_ids)).delete(synchronize_session=False)
             RentPayment.query.filter(RentPayment.student_id.in_(student_ids)).delete(synchronize_session=False)
@@ -2663,6 +2660,7 @@ def bulk_delete_legacy_unclaimed_students():
         for student in students:
             # Delete associated records
             Transaction.query.filter_by(student_id=student.id).delete()
+            StudentBalance.query.filter_by(student_id=student.id).delete()
             TapEvent.query.filter_by(student_id=student.id).delete()
             StudentItem.query.filter_by(student_id=student.id).delete()
             RentPayment.query.filter_by(student_id=student.id).delete()
@@ -2739,7 +2737,7 @@ def add_individual_student():
         potential_duplicates = Student.query.filter_by(
             last_initial=last_initial,
             dob_sum=dob_sum
-        ).all()
+        ).filter(first_name_filter(Student, first_name)).all()
 
         # Check if any existing student matches (using new credential system)
         for existing_student in potential_duplicates:
@@ -2900,7 +2898,7 @@ def add_manual_student():
         potential_duplicates = Student.query.filter_by(
             last_initial=last_initial,
             dob_sum=dob_sum
-        ).all()
+        ).filter(first_name_filter(Student, first_name)).all()
 
         for existing_student in potential_duplicates:
             if existing_student.first_name == first_name:
@@ -3194,11 +3192,9 @@ def _sync_rent_items_to_store(rent_settings, teacher_id, block):
     Creates or updates store items for rent items that are marked as available in store.
     Deactivates store items for rent items that are no longer available.
     """
-    from app.models import RentItem, StoreItem, StoreItemBlock
-
-    rent_items = RentItem.query.filter_by(rent_setting_id=rent_settings.id).all()
+    from app.models import StoreItem, StoreItemBlock
 
-    for rent_item in rent_items:
+    for rent_item in rent_settings.rent_items:
         if rent_item.is_available_in_store and rent_item.store_price:
             # Determine purchase limit based on duration type
             if rent_item.purchase_duration == 'per_period':
@@ -3344,7 +3340,7 @@ def rent_settings():
                     rent_item_indices.add(idx)
 
             # Get existing rent items for this setting
-            existing_items = {str(item.id): item for item in settings.rent_items.all()}
+            existing_items = {str(item.id): item for item in settings.rent_items}
             processed_item_ids = set()
 
             # Process each rent item from the form
@@ -3484,8 +3480,7 @@ def rent_settings():
     # Get rent items for this setting
     rent_items = []
     if settings:
-        from app.models import RentItem
-        rent_items = RentItem.query.filter_by(rent_setting_id=settings.id).order_by(RentItem.order_index).all()
+        rent_items = settings.rent_items
 
     return render_template('admin_rent_settings.html',
                           settings=settings,
@@ -3549,21 +3544,28 @@ def add_rent_waiver():
     # Get current admin
     admin_id = session.get('admin_id')
 
-    # Create waivers for each student
-    count = 0
-    for student_id in student_ids:
-        student = _get_student_or_404(int(student_id))
-        if student:
-            waiver = RentWaiver(
-                student_id=student.id,
-                waiver_start_date=waiver_start,
-                waiver_end_date=waiver_end,
-                periods_count=periods_count,
-                reason=reason,
-                created_by_admin_id=admin_id
-            )
-            db.session.add(waiver)
-            count += 1
+    # Every selected student must be accessible to this admin (one scoped query)
+    student_ids = [int(student_id) for student_id in student_ids]
+    accessible_ids = {
+        student_id for student_id, in
+        _scoped_students().filter(Student.id.in_(set(student_ids))).with_entities(Student.id)
+    }
+    if accessible_ids != set(student_ids):
+        abort(404)
+
+    # Create waivers for each student in one INSERT
+    RentWaiver.bulk_create([
+        {
+            'student_id': student_id,
+            'waiver_start_date': waiver_start,
+            'waiver_end_date': waiver_end,
+            'periods_count': periods_count,
+            'reason': reason,
+            'created_by_admin_id': admin_id,
+        }
+        for student_id in student_ids
+    ])
+    count = len(student_ids)
 
     db.session.commit()
     flash(f"Rent waiver added for {count} student(s) for {periods_count} period(s).", "success")
@@ -4428,12 +4430,10 @@ def economy_health():
 
     insurance_policies_query = InsurancePolicy.query.filter_by(teacher_id=admin_id, is_active=True)
     if selected_block:
-        insurance_policies = [
-            policy for policy in insurance_policies_query.all()
-            if not policy.blocks_list or selected_block.upper() in [b.upper() for b in policy.blocks_list]
-        ]
-    else:
-        insurance_policies = insurance_policies_query.all()
+        insurance_policies_query = insurance_policies_query.filter(
+            InsurancePolicy.visible_to_block(selected_block)
+        )
+    insurance_policies = insurance_policies_query.all()
 
     fines = PayrollFine.query.filter_by(teacher_id=admin_id, is_active=True).all()
     store_items = StoreItem.query.filter_by(teacher_id=admin_id, is_active=True).all()
@@ -4607,8 +4607,7 @@ def payroll_history():
     current_app.logger.info(f"Payroll records prepared: {len(payroll_records)}")
 
     # Current timestamp for header (Pacific Time)
-    pacific = pytz.timezone('America/Los_Angeles')
-    current_time = datetime.now(pacific)
+    current_time = datetime.now(PACIFIC)
 
     return render_template(
         'admin_payroll_history.html',
@@ -4659,25 +4658,30 @@ def run_payroll():
         # Pass teacher_id to ensure correct payroll settings are used
         summary = calculate_payroll(students, last_payroll_time, teacher_id=current_admin_id)
 
+        # Find the join_code for each paid student with this teacher in one query.
+        # If a student has multiple periods, use the first one.
+        join_codes = {}
+        if summary:
+            claimed_seats = db.session.query(TeacherBlock.student_id, TeacherBlock.join_code).filter(
+                TeacherBlock.teacher_id == current_admin_id,
+                TeacherBlock.student_id.in_(list(summary)),
+                TeacherBlock.is_claimed.is_(True),
+            ).order_by(TeacherBlock.id)
+            for seat_student_id, seat_join_code in claimed_seats:
+                join_codes.setdefault(seat_student_id, seat_join_code)
+
+        # One timestamp for the whole run so every payroll row shares the same cutoff
+        paid_at = datetime.now(timezone.utc)
         for student_id, amount in summary.items():
-            # Find the join_code for this student with this teacher
-            # If student has multiple periods, use the first one
-            teacher_block = TeacherBlock.query.filter_by(
-                teacher_id=current_admin_id,
-                student_id=student_id,
-                is_claimed=True
-            ).first()
-
-            join_code = teacher_block.join_code if teacher_block else None
-
             tx = Transaction(
                 student_id=student_id,
                 teacher_id=current_admin_id,
-                join_code=join_code,  # CRITICAL: Add join_code for proper scoping
+                join_code=join_codes.get(student_id),  # CRITICAL: Add join_code for proper scoping
                 amount=amount,
                 description=f"Payroll based on attendance",
                 account_type="checking",
-                type="payroll"
+                type="payroll",
+                timestamp=paid_at,
             )
             db.session.add(tx)
 
@@ -4711,7 +4715,6 @@ def payroll():
     """
     Enhanced payroll page with tabs for settings, students, rewards, fines, and manual payments.
     """
-    pacific = pytz.timezone('America/Los_Angeles')
     last_payroll_time = get_last_payroll_time()
 
     # Normalize to UTC to avoid any naive/aware mismatches downstream
@@ -4724,8 +4727,8 @@ def payroll():
     # Get student scope subquery for filtering
     student_ids_subq = _student_scope_subquery()
 
-    # Get all students
-    students = _scoped_students().all()
+    # Get all students (balance roll-ups batched for the students tab)
+    students = _scoped_students().options(selectinload(Student.balances)).all()
 
     # Get all blocks (split multi-block assignments like "A, B")
     blocks = sorted({b.strip() for s in students for b in (s.block or "").split(',') if b.strip()})
@@ -4752,14 +4755,9 @@ def payroll():
         if setting.block:
             settings_by_block[setting.block] = setting
 
-    def _as_utc(dt):
-        if not dt:
-            return None
-        return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
-
     def _compute_next_pay_date(setting, now):
         freq_days = setting.payroll_frequency_days if setting and setting.payroll_frequency_days else 14
-        first_pay = _as_utc(setting.first_pay_date) if setting and setting.first_pay_date else None
+        first_pay = as_utc(setting.first_pay_date) if setting and setting.first_pay_date else None
 
         # Anchor the schedule strictly to the configured first pay date so manual runs
         # don't shift the calendar. If no first date is set, fall back to now + frequency.
@@ -5552,7 +5550,7 @@ def attendance_log():
     periods_query = (
         db.session.query(TapEvent.period)
         .filter(TapEvent.student_id.in_(student_ids_subq))
-        .filter(TapEvent.is_deleted.is_not(True))
+        .filter(TapEvent.is_deleted == False)
         .distinct()
         .order_by(TapEvent.period)
     )
@@ -5672,13 +5670,13 @@ def upload_students():
 
             # Check if this seat already exists for this teacher
             # Duplicate detection: same teacher + block + last_initial + dob_sum + first_name
-            # Note: first_name is encrypted, so we must fetch candidates and check in Python
+            # Note: first_name is encrypted; the search hash narrows candidates and Python confirms
             candidate_seats = TeacherBlock.query.filter_by(
                 teacher_id=teacher_id,
                 block=block,
                 last_initial=last_initial,
                 dob_sum=dob_sum
-            ).all()
+            ).filter(first_name_filter(TeacherBlock, first_name)).all()
             
             # Check if any candidate has matching first name (after decryption)
             existing_seat = None
@@ -5757,64 +5755,75 @@ def download_csv_template():
     return send_file(template_path, as_attachment=True, download_name="student_upload_template.csv", mimetype='text/csv')
 
 
+# Students hydrated per round trip when streaming the CSV export
+EXPORT_BATCH_SIZE = 200
+
+
 @admin_bp.route('/export-students')
 @admin_required
 def export_students():
-    """Export all student data to CSV."""
-    # Create CSV in memory
-    output = io.StringIO()
-    writer = csv.writer(output)
-
-    # Write header
-    writer.writerow([
-        'First Name', 'Last Initial', 'Block', 'Checking Balance',
-        'Savings Balance', 'Total Earnings', 'Insurance Plan',
-        'Rent Enabled', 'Has Completed Setup'
-    ])
-
-    # Write student data
-    students = _scoped_students().order_by(Student.first_name, Student.last_initial).all()
+    """Export all student data to CSV, streamed in batches of EXPORT_BATCH_SIZE."""
     teacher_id = session.get('admin_id')
+    students = (
+        _scoped_students()
+        .options(selectinload(Student.balances))
+        .order_by(Student.first_name, Student.last_initial)
+        .yield_per(EXPORT_BATCH_SIZE)
+    )
 
-    # Prefetch active insurances to avoid N+1 queries
-    student_ids = [s.id for s in students]
-    active_insurances_map = {}
-    if teacher_id and student_ids:
-        scoped_insurances = StudentInsurance.query.join(
-            InsurancePolicy, StudentInsurance.policy_id == InsurancePolicy.id
-        ).filter(
-            StudentInsurance.student_id.in_(student_ids),
-            StudentInsurance.status == 'active',
-            InsurancePolicy.teacher_id == teacher_id
-        ).all()
+    def _student_rows(batch):
+        # Prefetch active insurances (with their policies) per batch to avoid N+1 queries
+        active_insurances_map = Student.bulk_active_insurance([s.id for s in batch], teacher_id)
+
+        for student in batch:
+            active_insurance = active_insurances_map.get(student.id)
+            insurance_name = active_insurance.policy.title if active_insurance else 'None'
+
+            yield [
+                _sanitize_csv_field(student.first_name),
+                _sanitize_csv_field(student.last_initial),
+                _sanitize_csv_field(student.block),
+                f"{student.checking_balance:.2f}",
+                f"{student.savings_balance:.2f}",
+                f"{student.total_earnings:.2f}",
+                _sanitize_csv_field(insurance_name),
+                'Yes' if student.is_rent_enabled else 'No',
+                'Yes' if student.has_completed_setup else 'No'
+            ]
 
-        for ins in scoped_insurances:
-            if ins.student_id not in active_insurances_map:
-                active_insurances_map[ins.student_id] = ins
+    def generate():
+        output = io.StringIO()
+        writer = csv.writer(output)
 
-    for student in students:
-        # Get active insurance for this student from pre-fetched map
-        active_insurance = active_insurances_map.get(student.id)
-        insurance_name = active_insurance.policy.title if active_insurance else 'None'
+        def flush():
+            data = output.getvalue()
+            output.seek(0)
+            output.truncate(0)
+            return data
 
         writer.writerow([
-            _sanitize_csv_field(student.first_name),
-            _sanitize_csv_field(student.last_initial),
-            _sanitize_csv_field(student.block),
-            f"{student.checking_balance:.2f}",
-            f"{student.savings_balance:.2f}",
-            f"{student.total_earnings:.2f}",
-            _sanitize_csv_field(insurance_name),
-            'Yes' if student.is_rent_enabled else 'No',
-            'Yes' if student.has_completed_setup else 'No'
+            'First Name', 'Last Initial', 'Block', 'Checking Balance',
+            'Savings Balance', 'Total Earnings', 'Insurance Plan',
+            'Rent Enabled', 'Has Completed Setup'
         ])
+        yield flush()
+
+        # Rows stream from the database; only one batch of students is held at a time
+        batch = []
+        for student in students:
+            batch.append(student)
+            if len(batch) == EXPORT_BATCH_SIZE:
+                writer.writerows(_student_rows(batch))
+                batch = []
+                yield flush()
+        if batch:
+            writer.writerows(_student_rows(batch))
+            yield flush()
 
-    # Prepare response
-    output.seek(0)
     filename = f"students_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
 
     return Response(
-        output.getvalue(),
+        stream_with_context(generate()),
         mimetype='text/csv',
         headers={'Content-Disposition': f'attachment; filename={filename}'}
     )
@@ -5830,7 +5839,6 @@ def enforce_daily_limits():
     Returns a report of students who were auto-tapped out.
     """
     from app.routes.api import check_and_auto_tapout_if_limit_reached
-    import pytz
     from payroll import get_daily_limit_seconds
 
     students = _scoped_students().all()
@@ -5838,7 +5846,6 @@ def enforce_daily_limits():
     checked = 0
     errors = []
 
-    pacific = pytz.timezone('America/Los_Angeles')
     now_utc = datetime.now(timezone.utc)
 
     for student in students:
@@ -6004,8 +6011,7 @@ def tap_out_students():
                 db.session.add(student_block)
             
             # Set done_for_day_date to lock them out until midnight
-            pacific = pytz.timezone('America/Los_Angeles')
-            now_pacific = now_utc.astimezone(pacific)
+            now_pacific = now_utc.astimezone(PACIFIC)
             today_pacific = now_pacific.date()
             student_block.done_for_day_date = today_pacific
             
@@ -6363,8 +6369,8 @@ def banking():
             'is_void': tx.is_void
         })
 
-    # Get all students for stats
-    students = _scoped_students().all()
+    # Get all students for stats (balance roll-ups batched into one IN query)
+    students = _scoped_students().options(selectinload(Student.balances)).all()
 
     # Calculate banking stats
     total_checking = sum(s.checking_balance for s in students)
@@ -6714,16 +6720,7 @@ def feature_settings():
                 global_settings.updated_at = datetime.now(timezone.utc)
 
                 # Also update all period-specific settings
-                for period in periods:
-                    period_settings = FeatureSettings.query.filter_by(
-                        teacher_id=admin_id,
-                        block=period
-                    ).first()
-
-                    if not period_settings:
-                        period_settings = FeatureSettings(teacher_id=admin_id, block=period)
-                        db.session.add(period_settings)
-
+                for period_settings in FeatureSettings.for_blocks(admin_id, periods, create=True).values():
                     for key, value in features_data.items():
                         setattr(period_settings, key, value)
 
@@ -6732,19 +6729,10 @@ def feature_settings():
                 flash('Feature settings applied to all periods successfully!', 'success')
             else:
                 # Apply to selected periods only
-                for period in selected_periods:
-                    period_settings = FeatureSettings.query.filter_by(
-                        teacher_id=admin_id,
-                        block=period.strip().upper()
-                    ).first()
-
-                    if not period_settings:
-                        period_settings = FeatureSettings(
-                            teacher_id=admin_id,
-                            block=period.strip().upper()
-                        )
-                        db.session.add(period_settings)
-
+                selected_settings = FeatureSettings.for_blocks(
+                    admin_id, [period.strip().upper() for period in selected_periods], create=True
+                )
+                for period_settings in selected_settings.values():
                     for key, value in features_data.items():
                         setattr(period_settings, key, value)
 
@@ -6774,11 +6762,9 @@ def feature_settings():
 
     # Load period-specific settings
     period_settings = {}
+    existing_settings = FeatureSettings.for_blocks(admin_id, periods)
     for period in periods:
-        settings = FeatureSettings.query.filter_by(
-            teacher_id=admin_id,
-            block=period
-        ).first()
+        settings = existing_settings.get(period)
 
         if settings:
             period_settings[period] = settings.to_dict()
@@ -6897,19 +6883,10 @@ def copy_feature_settings():
 
         # Copy to target periods
         copied_count = 0
-        for period in target_periods:
-            if period == source_period:
-                continue  # Skip copying to self
-
-            target_settings = FeatureSettings.query.filter_by(
-                teacher_id=admin_id,
-                block=period
-            ).first()
-
-            if not target_settings:
-                target_settings = FeatureSettings(teacher_id=admin_id, block=period)
-                db.session.add(target_settings)
-
+        target_settings_by_period = FeatureSettings.for_blocks(
+            admin_id, [period for period in target_periods if period != source_period], create=True
+        )
+        for target_settings in target_settings_by_period.values():
             # Only copy valid feature columns to prevent attribute injection
             for key, value in source_dict.items():
                 if key in valid_feature_columns:
@@ -7988,7 +7965,7 @@ def view_issue(issue_id):
     admin_id = session.get('admin_id')
 
     # Get the issue and verify it belongs to this teacher
-    issue = Issue.query.filter_by(id=issue_id, teacher_id=admin_id).first_or_404()
+    issue = Issue.detail_query().filter_by(id=issue_id, teacher_id=admin_id).first_or_404()
 
     # Mark as being reviewed if still in submitted status
     if issue.status == 'submitted':
@@ -27,6 +27,7 @@ from app.auth import login_required, admin_required, get_logged_in_student, get_
 from app.routes.student import get_current_class_context, get_current_teacher_id, get_rent_settings_for_context
 from app.utils.join_code import generate_join_code
 from app.utils.name_utils import hash_last_name_parts
+from app.utils.helpers import as_utc
 
 # Import external modules
 from attendance import (
@@ -261,7 +262,7 @@ def purchase_item():
         return jsonify({"status": "error", "message": "This item is not available."}), 404
 
     # Check rent late restrictions
-    from app.models import RentSettings, RentPayment, RentItem
+    from app.models import RentSettings, RentPayment
     from datetime import datetime, timedelta
 
     rent_settings = get_rent_settings_for_context(context)
@@ -291,7 +292,7 @@ def purchase_item():
                 # Student is late if they haven't paid full rent
                 if total_paid < rent_settings.rent_amount:
                     # Check if itemization is enabled
-                    rent_items = RentItem.query.filter_by(rent_setting_id=rent_settings.id).all()
+                    rent_items = rent_settings.rent_items
 
                     if rent_items:
                         # Itemization is enabled: check if this item is a rent item
@@ -1371,7 +1372,7 @@ def attendance_history():
         # Build query scoped to admin's students and exclude deleted records
         query = TapEvent.query.filter(
             TapEvent.student_id.in_(accessible_student_ids_query),
-            TapEvent.is_deleted.is_(False)
+            TapEvent.is_deleted == False
         )
 
         # Apply filters
@@ -2020,22 +2021,6 @@ def check_and_auto_tapout_if_limit_reached(student):
     from payroll import get_daily_limit_seconds
     from attendance import calculate_period_attendance_utc_range
 
-    # Helper function to ensure UTC timezone-aware datetime
-    def _as_utc(dt):
-        if dt is None:
-            return None
-        if dt.tzinfo is None:
-            return dt.replace(tzinfo=timezone.utc)
-        return dt.astimezone(timezone.utc)
-
-    # Helper function to ensure UTC timezone-aware datetime
-    def _as_utc(dt):
-        if dt is None:
-            return None
-        if dt.tzinfo is None:
-            return dt.replace(tzinfo=timezone.utc)
-        return dt.astimezone(timezone.utc)
-
     # Keep original case for settings lookup, but uppercase for TapEvent queries
     student_blocks = [b.strip() for b in student.block.split(',') if b.strip()]
     now_utc = datetime.now(timezone.utc)
@@ -2086,7 +2071,7 @@ def check_and_auto_tapout_if_limit_reached(student):
 
                 # Add current active session time
                 # Convert to UTC-aware datetime to prevent TypeError
-                last_tap_in_utc = _as_utc(latest_event.timestamp)
+                last_tap_in_utc = as_utc(latest_event.timestamp)
 
                 # Only add active session time if tapped in today (within Pacific day boundaries)
                 if start_of_day_utc <= last_tap_in_utc < end_of_day_utc:
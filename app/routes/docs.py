@@ -5,9 +5,14 @@ Serves feature-based documentation with markdown rendering,
 allowing users to access help without leaving the app or losing their session.
 """
 
+import hashlib
+import os
 import re
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
-from flask import Blueprint, abort, current_app, session, request, url_for
+from flask import Blueprint, abort, current_app, make_response, session, request, url_for
 from werkzeug.exceptions import HTTPException
 import bleach
 import markdown
@@ -25,9 +30,15 @@ docs_bp = Blueprint('docs', __name__, url_prefix='/docs')
 # Documentation root directory
 DOCS_ROOT = Path(__file__).parent.parent.parent / 'docs'
 
+# Allowed characters in a requested documentation path
+DOC_PATH_PATTERN = re.compile(r"[A-Za-z0-9_./-]+")
+
 # Directories excluded from user-facing search (internal documentation only)
 EXCLUDED_DIRECTORIES = {'security', 'archive', 'ai'}
 
+# Longest time, in seconds, a documentation page may be revalidated with a 304
+DOC_ETAG_WINDOW_SECONDS = 1800
+
 # Friendly category names for search results
 CATEGORY_MAP = {
     'user-guides': 'User Guides',
@@ -75,6 +86,9 @@ DOCS_ALLOWED_ATTRIBUTES = {
 }
 DOCS_ALLOWED_PROTOCOLS = ['http', 'https', 'mailto']
 
+# Markdown and bleach objects keep parser state, so each thread reuses its own pair
+_renderers = threading.local()
+
 
 def parse_front_matter(content):
     """
@@ -135,29 +149,186 @@ def render_markdown_content(content, toc_title='On This Page'):
     line breaks in formatted content like code blocks and tables. Standard
     markdown requires two spaces at the end of a line or a blank line for breaks.
     """
-    md = markdown.Markdown(
-        extensions=[
-            'extra',
-            TocExtension(title=toc_title, toc_depth='2-6'),
-            CodeHiliteExtension(linenums=False, css_class='highlight'),
-            FencedCodeExtension(),
-            TableExtension(),
-        ]
-    )
+    md, cleaner = _get_renderers()
 
+    md.reset()
+    md.treeprocessors['toc'].title = toc_title
     html = md.convert(content)
     toc = md.toc if hasattr(md, 'toc') else ''
 
     # Sanitize HTML to prevent XSS
-    cleaner = bleach.Cleaner(
-        tags=DOCS_ALLOWED_TAGS,
-        attributes=DOCS_ALLOWED_ATTRIBUTES,
-        protocols=DOCS_ALLOWED_PROTOCOLS,
-        strip=True,
-        strip_comments=True,
+    return cleaner.clean(html), cleaner.clean(toc)
+
+
+def _get_renderers():
+    """
+    Return this thread's reusable Markdown converter and bleach cleaner.
+
+    Building the extension pipeline and sanitizer is more expensive than a
+    conversion, and neither object is thread-safe, so each worker thread
+    creates the pair once and resets the converter between documents.
+    """
+    if not hasattr(_renderers, 'md'):
+        _renderers.md = markdown.Markdown(
+            extensions=[
+                'extra',
+                TocExtension(toc_depth='2-6'),
+                CodeHiliteExtension(linenums=False, css_class='highlight'),
+                FencedCodeExtension(),
+                TableExtension(),
+            ]
+        )
+        _renderers.cleaner = bleach.Cleaner(
+            tags=DOCS_ALLOWED_TAGS,
+            attributes=DOCS_ALLOWED_ATTRIBUTES,
+            protocols=DOCS_ALLOWED_PROTOCOLS,
+            strip=True,
+            strip_comments=True,
+        )
+    return _renderers.md, _renderers.cleaner
+
+
+@lru_cache(maxsize=None)
+def resolve_docs_root(docs_root):
+    """
+    Return the absolute, symlink-free form of a documentation root.
+
+    Resolving walks every path component with stat/readlink calls, so the
+    result is memoized; the root does not move while the app is running.
+    """
+    return docs_root.resolve(strict=False)
+
+
+@lru_cache(maxsize=512)
+def render_doc_file(doc_file, mtime_ns, size, doc_path):
+    """
+    Read, parse and render a documentation file, memoized per file version.
+
+    The file's modification time and size are part of the cache key, so an
+    edited file is re-rendered on its next request while unchanged files skip
+    markdown conversion and sanitization entirely.
+
+    Args:
+        doc_file: Absolute path of the markdown file
+        mtime_ns: File modification time in nanoseconds (cache key only)
+        size: File size in bytes (cache key only)
+        doc_path: Requested documentation path, used as the fallback title
+
+    Returns:
+        tuple: (metadata_dict, sanitized_html_content, sanitized_toc_html)
+    """
+    content = Path(doc_file).read_text(encoding='utf-8')
+    metadata, body = parse_front_matter(content)
+    html_content, toc = render_markdown_content(body, toc_title=metadata.get('title', doc_path))
+    return metadata, html_content, toc
+
+
+@lru_cache(maxsize=1024)
+def load_search_entry(doc_file, mtime_ns, size):
+    """
+    Read and pre-process a documentation file for search, memoized per file version.
+
+    Lowercased text and word sets are computed once here so each search only
+    scores the query against prepared values instead of re-reading the file.
+
+    Args:
+        doc_file: Absolute path of the markdown file
+        mtime_ns: File modification time in nanoseconds (cache key only)
+        size: File size in bytes (cache key only)
+
+    Returns:
+        dict: Prepared search fields, or None if the document is not searchable.
+              The dict is shared between requests and must not be mutated.
+    """
+    content = Path(doc_file).read_text(encoding='utf-8')
+    metadata, body = parse_front_matter(content)
+
+    # Skip if explicitly marked as not searchable
+    if metadata.get('searchable', True) is False:
+        return None
+
+    title = metadata.get('title', Path(doc_file).stem)
+    description = metadata.get('description', '').strip()
+    keywords = metadata.get('keywords', []) or []
+    if not isinstance(keywords, list):
+        keywords = [str(keywords)] if keywords else []
+    keywords_lower = tuple(keyword.lower() for keyword in keywords)
+
+    # First non-empty, non-heading line, used as search context when nothing else matches
+    summary_line = next(
+        (line.strip()[:200] for line in body.split('\n') if line.strip() and not line.strip().startswith('#')),
+        '',
     )
 
-    return cleaner.clean(html), cleaner.clean(toc)
+    return {
+        'title': title,
+        'title_lower': title.lower(),
+        'description': description,
+        'description_lower': description.lower(),
+        'keywords_lower': keywords_lower,
+        'body': body,
+        'body_lower': body.lower(),
+        'title_words': frozenset(title.lower().split()),
+        'keyword_words': frozenset(word for keyword in keywords_lower for word in keyword.split()),
+        'desc_words': frozenset(description.lower().split()),
+        'summary_line': summary_line,
+    }
+
+
+def _iter_md_files(root, excluded_dirs=frozenset()):
+    """
+    Yield directory entries for markdown files under root.
+
+    Uses os.scandir so file/directory checks come from the directory listing
+    instead of extra stat calls per path. Hidden entries are skipped, symlinked
+    directories are not followed, and top-level directories named in
+    excluded_dirs are pruned without being walked.
+
+    Args:
+        root: Directory to search
+        excluded_dirs: Top-level directory names to skip
+
+    Yields:
+        os.DirEntry: One entry per ``.md`` file
+    """
+    pending = [(os.fspath(root), True)]
+    while pending:
+        directory, is_top = pending.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            # Unreadable or missing directories are skipped, as Path.rglob does
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    if not (is_top and entry.name in excluded_dirs):
+                        pending.append((entry.path, False))
+                elif entry.name.endswith('.md') and entry.is_file():
+                    yield entry
+
+
+@lru_cache(maxsize=1024)
+def _prettify(name):
+    """Turn a path segment like 'getting-started' into a display title."""
+    return name.replace('-', ' ').replace('_', ' ').title()
+
+
+@lru_cache(maxsize=4096)
+def _cached_doc_url(script_root, doc_path):
+    return url_for('docs.view_doc', doc_path=doc_path)
+
+
+def _doc_url(doc_path):
+    """
+    Return the URL of a documentation page, memoized per doc path.
+
+    The request's script root is part of the cache key, so the cached URL is
+    still correct when the app is mounted under a different prefix.
+    """
+    return _cached_doc_url(request.script_root, doc_path)
 
 
 def build_breadcrumbs(category, page=None):
@@ -174,22 +345,42 @@ def build_breadcrumbs(category, page=None):
     breadcrumbs = []
 
     if category:
-        category_title = category.replace('-', ' ').replace('_', ' ').title()
+        category_title = _prettify(category)
         breadcrumbs.append({
             'title': category_title,
-            'url': url_for('docs.view_doc', doc_path=category)
+            'url': _doc_url(category)
         })
 
     if page:
-        page_title = page.replace('-', ' ').replace('_', ' ').title()
+        page_title = _prettify(page)
         breadcrumbs.append({
             'title': page_title,
-            'url': url_for('docs.view_doc', doc_path=f'{category}/{page}')
+            'url': _doc_url(f'{category}/{page}')
         })
 
     return breadcrumbs
 
 
+def _doc_etag(doc_stat, user_role):
+    """
+    Build the validator for a rendered documentation page.
+
+    The page also carries session-specific markup (navigation and a signed
+    CSRF token), so the viewer's role and CSRF secret are hashed in with the
+    file version. A time window bounds how long a cached copy, and the token
+    inside it, keeps being revalidated.
+    """
+    window = int(time.time() // DOC_ETAG_WINDOW_SECONDS)
+    key = f"{doc_stat.st_mtime_ns}:{doc_stat.st_size}:{user_role}:{session.get('csrf_token', '')}:{window}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def _set_doc_cache_headers(response, etag):
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
 # -------------------- ROUTES --------------------
 
 @docs_bp.route('/')
@@ -220,7 +411,7 @@ def view_doc(doc_path):
             abort(404)
 
         # Reject paths with suspicious characters
-        if not re.fullmatch(r"[A-Za-z0-9_./-]+", doc_path):
+        if not DOC_PATH_PATTERN.fullmatch(doc_path):
             current_app.logger.warning(f"Invalid characters in doc path: {doc_path}")
             abort(404)
 
@@ -238,7 +429,7 @@ def view_doc(doc_path):
 
             # Ensure docs_root is absolute and normalized
             try:
-                root_resolved = docs_root.resolve(strict=False)
+                root_resolved = resolve_docs_root(docs_root)
             except OSError as e:
                 current_app.logger.error(f"Invalid DOCS_ROOT '{docs_root}': {e}")
                 abort(500)
@@ -270,23 +461,40 @@ def view_doc(doc_path):
         doc_file = resolve_doc_path(doc_path, Path(docs_root))
 
 
-        if not doc_file.exists():
+        try:
+            doc_stat = doc_file.stat()
+        except FileNotFoundError:
             current_app.logger.info(f"Documentation not found: {doc_path}")
             abort(404)
 
-        # Read and parse the file
+        # Get user role for UI filtering
+        # Note: Role-based filtering is for UI display only, not access control.
+        # All documentation is accessible to all users. The 'roles' metadata
+        # is used for contextual highlighting and navigation suggestions.
+        user_role = None
+        if session.get('admin_id'):
+            user_role = 'teacher'
+        elif session.get('student_id'):
+            user_role = 'student'
+        elif session.get('is_system_admin'):
+            user_role = 'sysadmin'
+
+        # Repeat visits to an unchanged page skip rendering entirely
+        etag = _doc_etag(doc_stat, user_role)
+        if request.if_none_match.contains_weak(etag):
+            return _set_doc_cache_headers(current_app.response_class(status=304), etag)
+
+        # Read, parse and convert markdown to HTML (with sanitization), cached per file version
         try:
-            content = doc_file.read_text(encoding='utf-8')
+            metadata, html_content, toc = render_doc_file(
+                str(doc_file), doc_stat.st_mtime_ns, doc_stat.st_size, doc_path
+            )
         except UnicodeDecodeError as e:
             current_app.logger.error(f"File encoding error for {doc_path}: {e}")
             abort(500, description="Unable to read documentation file (encoding error)")
 
-        metadata, body = parse_front_matter(content)
         doc_title = metadata.get('title', doc_path)
 
-        # Convert markdown to HTML (with sanitization)
-        html_content, toc = render_markdown_content(body, toc_title=doc_title)
-
         # Determine category and page from path
         path_parts = Path(doc_path).parts
         category = None
@@ -313,25 +521,13 @@ def view_doc(doc_path):
                     # Remove leading slash and ensure proper path
                     rel_path = rel_path.lstrip('/')
                     related_articles.append({
-                        'title': rel_path.replace('/', ' / ').replace('-', ' ').replace('_', ' ').title(),
-                        'url': url_for('docs.view_doc', doc_path=rel_path)
+                        'title': _prettify(rel_path.replace('/', ' / ')),
+                        'url': _doc_url(rel_path)
                     })
                 except Exception as e:
                     current_app.logger.warning(f"Error processing related article {rel_path}: {e}")
 
-        # Get user role for UI filtering
-        # Note: Role-based filtering is for UI display only, not access control.
-        # All documentation is accessible to all users. The 'roles' metadata
-        # is used for contextual highlighting and navigation suggestions.
-        user_role = None
-        if session.get('admin_id'):
-            user_role = 'teacher'
-        elif session.get('student_id'):
-            user_role = 'student'
-        elif session.get('is_system_admin'):
-            user_role = 'sysadmin'
-
-        return render_template_with_fallback(
+        response = make_response(render_template_with_fallback(
             'docs/view.html',
             content=html_content,
             toc=toc,
@@ -343,7 +539,9 @@ def view_doc(doc_path):
             related=related_articles,
             user_role=user_role,
             doc_path=doc_path,
-        )
+        ))
+        # Recomputed because rendering may have just issued the session's CSRF secret
+        return _set_doc_cache_headers(response, _doc_etag(doc_stat, user_role))
 
     except HTTPException:
         raise
@@ -376,70 +574,57 @@ def search():
     results = []
     query_lower = query.lower()
     query_words = set(query_lower.split())
+    query_pattern = re.compile(re.escape(query), re.IGNORECASE)
 
     try:
-        # Search through all markdown files
-        # Note: This implementation reads all files on every search request.
-        # For production with many documentation files, consider implementing
-        # a search index (in-memory or cached) built at startup for better performance.
-        for doc_file in DOCS_ROOT.rglob('*.md'):
+        # Search through all markdown files; parsed content is cached per file version
+        docs_root_resolved = resolve_docs_root(DOCS_ROOT)
+        # Excluded directories (internal docs) are pruned by the walker
+        for doc_entry in _iter_md_files(DOCS_ROOT, EXCLUDED_DIRECTORIES):
+            doc_file = Path(doc_entry.path)
             try:
                 # Skip if not relative to DOCS_ROOT (safety check)
-                if not doc_file.is_relative_to(DOCS_ROOT.resolve()):
+                if not doc_file.is_relative_to(docs_root_resolved):
                     continue
 
                 rel_path = doc_file.relative_to(DOCS_ROOT)
 
-                # Skip excluded directories (internal docs)
-                if rel_path.parts and rel_path.parts[0] in EXCLUDED_DIRECTORIES:
+                doc_stat = doc_entry.stat()
+                entry = load_search_entry(str(doc_file), doc_stat.st_mtime_ns, doc_stat.st_size)
+                if entry is None:
                     continue
 
-                content = doc_file.read_text(encoding='utf-8')
-                metadata, body = parse_front_matter(content)
-
-                # Skip if explicitly marked as not searchable
-                if metadata.get('searchable', True) is False:
-                    continue
-
-                # Get metadata fields for relevance scoring
-                title = metadata.get('title', doc_file.stem)
-                description = metadata.get('description', '').strip()
-                keywords = metadata.get('keywords', []) or []
-                if not isinstance(keywords, list):
-                    keywords = [str(keywords)] if keywords else []
+                title = entry['title']
+                description = entry['description']
+                body = entry['body']
 
                 # Calculate relevance score
                 relevance_score = 0
 
                 # Title match (highest priority - 10 points)
-                if query_lower in title.lower():
+                if query_lower in entry['title_lower']:
                     relevance_score += 10
                     # Exact title match gets bonus
-                    if query_lower == title.lower():
+                    if query_lower == entry['title_lower']:
                         relevance_score += 5
 
                 # Keyword match (high priority - 8 points per keyword)
-                for keyword in keywords:
-                    if query_lower in keyword.lower():
+                for keyword in entry['keywords_lower']:
+                    if query_lower in keyword:
                         relevance_score += 8
 
                 # Description match (medium priority - 5 points)
-                if description and query_lower in description.lower():
+                if description and query_lower in entry['description_lower']:
                     relevance_score += 5
 
                 # Body match (lower priority - 1 point, max 3)
-                body_matches = body.lower().count(query_lower)
+                body_matches = entry['body_lower'].count(query_lower)
                 relevance_score += min(body_matches, 3)
 
-                # Word-based relevance (check if query words appear)
-                title_words = set(title.lower().split())
-                keyword_words = {word for keyword in keywords for word in keyword.lower().split()}
-                desc_words = set(description.lower().split()) if description else set()
-
                 # Bonus for word matches
-                word_matches_in_title = len(query_words & title_words)
-                word_matches_in_keywords = len(query_words & keyword_words)
-                word_matches_in_desc = len(query_words & desc_words)
+                word_matches_in_title = len(query_words & entry['title_words'])
+                word_matches_in_keywords = len(query_words & entry['keyword_words'])
+                word_matches_in_desc = len(query_words & entry['desc_words'])
 
                 relevance_score += word_matches_in_title * 3
                 relevance_score += word_matches_in_keywords * 2
@@ -458,18 +643,15 @@ def search():
                         context = description[:200]
                     else:
                         # Find first line with query match
-                        for line in body.split('\n'):
-                            if query_lower in line.lower():
-                                context = line.strip()[:200]
-                                break
+                        match = query_pattern.search(body)
+                        if match:
+                            line_start = body.rfind('\n', 0, match.start()) + 1
+                            line_end = body.find('\n', match.end())
+                            context = body[line_start:line_end if line_end != -1 else None].strip()[:200]
 
                         # Fallback: first non-empty line
                         if not context:
-                            for line in body.split('\n'):
-                                stripped = line.strip()
-                                if stripped and not stripped.startswith('#'):
-                                    context = stripped[:200]
-                                    break
+                            context = entry['summary_line']
 
                     # Determine category display name
                     category = 'Other'
@@ -479,7 +661,7 @@ def search():
 
                     results.append({
                         'title': title,
-                        'url': url_for('docs.view_doc', doc_path=str(rel_path_no_ext.as_posix())),
+                        'url': _doc_url(rel_path_no_ext.as_posix()),
                         'context': context,
                         'category': category,
                         'relevance': relevance_score
@@ -12,7 +12,7 @@ import re
 from calendar import monthrange
 from datetime import datetime, timedelta, timezone
 
-from flask import Blueprint, redirect, url_for, flash, request, session, jsonify, current_app
+from flask import Blueprint, redirect, url_for, flash, request, session, jsonify, current_app, g
 from sqlalchemy import or_, func, select, and_
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -22,7 +22,7 @@ from app.extensions import db, limiter
 from app.models import (
     Student, Transaction, TapEvent, StoreItem, StudentItem,
     RentSettings, RentPayment, InsurancePolicy, StudentInsurance, InsuranceClaim,
-    BankingSettings, UserReport, FeatureSettings
+    BankingSettings, UserReport, FeatureSettings, first_name_filter
 )
 from app.auth import admin_required, login_required, get_logged_in_student, SESSION_TIMEOUT_MINUTES
 from forms import (
@@ -31,7 +31,7 @@ from forms import (
 )
 
 # Import utility functions
-from app.utils.helpers import generate_anonymous_code, is_safe_url, format_utc_iso, render_template_with_fallback as render_template
+from app.utils.helpers import generate_anonymous_code, is_safe_url, format_utc_iso, as_utc, render_template_with_fallback as render_template
 from app.utils.constants import THEME_PROMPTS
 from app.utils.turnstile import verify_turnstile_token
 from app.utils.demo_sessions import cleanup_demo_student_data
@@ -161,7 +161,9 @@ def get_feature_settings_for_student():
     Get feature settings for the currently logged-in student.
 
     Returns the merged feature settings for the student's current teacher/period context.
-    Settings cascade: period-specific > global > system defaults.
+    Settings cascade: period-specific > global > system defaults. The result is
+    memoized on ``g`` because a single page render asks for it several times
+    (route feature gate, dashboard and the template context processor).
 
     Returns:
         dict: Feature settings dictionary with enabled/disabled flags
@@ -181,26 +183,11 @@ def get_feature_settings_for_student():
 
     current_block = (context.get('block') or '').strip().upper() or None
 
-    # Try block-specific settings first
-    if current_block:
-        block_settings = FeatureSettings.query.filter_by(
-            teacher_id=teacher_id,
-            block=current_block
-        ).first()
-        if block_settings:
-            return block_settings.to_dict()
-
-    # Fall back to global settings for this teacher
-    global_settings = FeatureSettings.query.filter_by(
-        teacher_id=teacher_id,
-        block=None
-    ).first()
-
-    if global_settings:
-        return global_settings.to_dict()
-
-    # Return system defaults
-    return FeatureSettings.get_defaults()
+    cache = g.setdefault('_feature_settings_cache', {})
+    key = (teacher_id, current_block)
+    if key not in cache:
+        cache[key] = FeatureSettings.resolve(teacher_id, current_block)
+    return cache[key]
 
 
 def is_feature_enabled(feature_name):
@@ -238,19 +225,42 @@ def calculate_scoped_balances(student: 'Student', join_code: str, teacher_id: in
     Returns:
         tuple[float, float]: (checking_balance, savings_balance) as rounded floats
     """
-    checking_balance = round(sum(
-        tx.amount for tx in student.transactions
-        if tx.account_type == 'checking' and not tx.is_void and
-        (tx.join_code == join_code or (tx.join_code is None and tx.teacher_id == teacher_id))
-    ), 2)
-    
-    savings_balance = round(sum(
-        tx.amount for tx in student.transactions
-        if tx.account_type == 'savings' and not tx.is_void and
-        (tx.join_code == join_code or (tx.join_code is None and tx.teacher_id == teacher_id))
-    ), 2)
-    
-    return checking_balance, savings_balance
+    balances = student.get_all_balances(teacher_id=teacher_id, join_code=join_code)
+
+    return balances['checking'], balances['savings']
+
+
+def _unvoided_rent_payments(student_id, payments, *criteria):
+    """Keep rent payments whose matching 'Rent Payment' transaction exists and is not voided.
+
+    A payment is matched to a transaction of the opposite amount within five
+    seconds of its payment_date; ``criteria`` further restrict the candidate
+    transactions (e.g. class scoping). Candidates for all payments are loaded
+    in one query rather than one query per payment.
+    """
+    if not payments:
+        return []
+
+    window = timedelta(seconds=5)
+    query = Transaction.query.filter(
+        Transaction.student_id == student_id,
+        Transaction.type == 'Rent Payment',
+        Transaction.timestamp >= min(p.payment_date for p in payments) - window,
+        Transaction.timestamp <= max(p.payment_date for p in payments) + window,
+        *criteria,
+    )
+    candidates = query.order_by(Transaction.id).all()
+
+    unvoided = []
+    for payment in payments:
+        txn = next((
+            t for t in candidates
+            if t.amount == -payment.amount_paid
+            and payment.payment_date - window <= t.timestamp <= payment.payment_date + window
+        ), None)
+        if txn and not txn.is_void:
+            unvoided.append(payment)
+    return unvoided
 
 
 # -------------------- LEGACY PROFILE MIGRATION --------------------
@@ -504,17 +514,21 @@ def claim_account():
         unclaimed_seats = TeacherBlock.query.filter_by(
             join_code=join_code,
             is_claimed=False
-        ).all()
+        )
 
-        if not unclaimed_seats:
+        if not db.session.query(unclaimed_seats.exists()).scalar():
             flash("Invalid join code or all seats already claimed. Check with your teacher.", "claim")
             return redirect(url_for('student.claim_account'))
 
+        # Seat hashes are salted per row, so narrow by the plaintext DOB sum in SQL
+        # and only run the HMAC comparisons on the few remaining candidates
+        candidate_seats = unclaimed_seats.filter_by(dob_sum=dob_sum).all()
+
         # Try to find a matching seat
         from app.utils.name_utils import verify_last_name_parts
 
         matched_seat = None
-        for seat in unclaimed_seats:
+        for seat in candidate_seats:
             credential_matches, matched_primary, canonical_hash = match_claim_hash(
                 seat.first_half_hash,
                 first_initial,
@@ -530,7 +544,7 @@ def claim_account():
                 seat.salt
             )
 
-            if credential_matches and last_name_matches and seat.dob_sum == dob_sum:
+            if credential_matches and last_name_matches:
                 if canonical_hash and not matched_primary:
                     seat.first_half_hash = canonical_hash
                 matched_seat = seat
@@ -546,7 +560,7 @@ def claim_account():
         all_students = Student.query.filter_by(
             last_initial=matched_seat.last_initial,
             dob_sum=dob_sum
-        ).all()
+        ).filter(first_name_filter(Student, matched_seat.first_name)).all()
 
         for student in all_students:
             if student.first_name == matched_seat.first_name:
@@ -828,15 +842,21 @@ def add_class():
         unclaimed_seats = TeacherBlock.query.filter_by(
             join_code=join_code,
             is_claimed=False
-        ).all()
+        )
 
-        if not unclaimed_seats:
+        if not db.session.query(unclaimed_seats.exists()).scalar():
             flash("Invalid join code or all seats already claimed. Check with your teacher.", "danger")
             return redirect(_get_return_target())  # nosec # Safe: validated by _is_safe_url() with same-origin check
 
+        # Narrow by DOB sum, last initial and first-name search hash in SQL before the per-seat hash checks
+        candidate_seats = unclaimed_seats.filter_by(
+            dob_sum=dob_sum,
+            last_initial=student.last_initial
+        ).filter(first_name_filter(TeacherBlock, student.first_name)).all()
+
         # Try to find a matching seat for this student
         matched_seat = None
-        for seat in unclaimed_seats:
+        for seat in candidate_seats:
             credential_matches, matched_primary, canonical_hash = match_claim_hash(
                 seat.first_half_hash,
                 first_initial,
@@ -855,7 +875,7 @@ def add_class():
             # Check if names match (encrypted first name comparison)
             name_matches = seat.first_name == student.first_name and seat.last_initial == student.last_initial
 
-            if credential_matches and last_name_matches and name_matches and seat.dob_sum == dob_sum:
+            if credential_matches and last_name_matches and name_matches:
                 if canonical_hash and not matched_primary:
                     seat.first_half_hash = canonical_hash
                 matched_seat = seat
@@ -955,14 +975,9 @@ def dashboard():
 
     # CRITICAL FIX: Calculate balances using join_code scoping
     # Sum only transactions for THIS specific class (join_code)
-    checking_balance = round(sum(
-        tx.amount for tx in student.transactions
-        if tx.account_type == 'checking' and not tx.is_void and tx.join_code == join_code
-    ), 2)
-    savings_balance = round(sum(
-        tx.amount for tx in student.transactions
-        if tx.account_type == 'savings' and not tx.is_void and tx.join_code == join_code
-    ), 2)
+    balances = student.get_all_balances(join_code=join_code)
+    checking_balance = balances['checking']
+    savings_balance = balances['savings']
     forecast_interest = round(savings_balance * (0.045 / 12), 2)
 
     # FIX: Only show tap in/out status for CURRENT class, not all classes
@@ -1047,18 +1062,7 @@ def dashboard():
                 period_year=current_year
             ).all()
 
-            payments = []
-            for payment in all_payments_for_period:
-                txn = Transaction.query.filter(
-                    Transaction.student_id == student.id,
-                    Transaction.type == 'Rent Payment',
-                    Transaction.timestamp >= payment.payment_date - timedelta(seconds=5),
-                    Transaction.timestamp <= payment.payment_date + timedelta(seconds=5),
-                    Transaction.amount == -payment.amount_paid
-                ).first()
-
-                if txn and not txn.is_void:
-                    payments.append(payment)
+            payments = _unvoided_rent_payments(student.id, all_payments_for_period)
 
             total_paid = sum(p.amount_paid for p in payments) if payments else 0.0
             late_fee = rent_settings.late_fee if rent_is_active and now > grace_end_date else 0.0
@@ -1112,13 +1116,6 @@ def dashboard():
     week_start = now_utc - timedelta(days=now_utc.weekday())  # Monday of current week
     month_start = now_utc.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
-    def _as_utc(ts):
-        if not ts:
-            return None
-        if ts.tzinfo is None:
-            return ts.replace(tzinfo=timezone.utc)
-        return ts.astimezone(timezone.utc)
-
     # Days tapped in this week
     tap_events_this_week = TapEvent.query.filter(
         TapEvent.student_id == student.id,
@@ -1128,7 +1125,7 @@ def dashboard():
     ).all()
 
     # Calculate unique days and total minutes
-    unique_days_tapped = len(set(_as_utc(event.timestamp).date() for event in tap_events_this_week if event.status == 'active'))
+    unique_days_tapped = len(set(as_utc(event.timestamp).date() for event in tap_events_this_week if event.status == 'active'))
 
     # Calculate total minutes this week
     total_minutes_this_week = 0
@@ -1136,7 +1133,7 @@ def dashboard():
 
     for event in sorted(tap_events_this_week, key=lambda e: e.timestamp):
         period = event.period
-        event_ts = _as_utc(event.timestamp)
+        event_ts = as_utc(event.timestamp)
         if event.status == 'active':
             active_sessions[period] = event_ts
         elif event.status == 'inactive' and period in active_sessions:
@@ -1150,7 +1147,7 @@ def dashboard():
         total_minutes_this_week += duration
 
     def _occurred_after(ts, start):
-        ts_utc = _as_utc(ts)
+        ts_utc = as_utc(ts)
         return ts_utc is not None and ts_utc >= start
 
     # Earnings this week/month
@@ -1178,12 +1175,7 @@ def dashboard():
     from app.models import Announcement
     from sqlalchemy import or_
 
-    announcements = Announcement.query.filter(
-        Announcement.is_active.is_(True),
-        or_(
-            Announcement.expires_at.is_(None),
-            Announcement.expires_at > datetime.now(timezone.utc)
-        ),
+    announcements = Announcement.visible().filter(
         or_(
             # Class-specific announcements
             Announcement.join_code == join_code,
@@ -1378,7 +1370,8 @@ def transfer():
                 amount=-amount,
                 account_type=from_account,
                 type='Withdrawal',
-                description=f'Transfer to {to_account}'
+                description=f'Transfer to {to_account}',
+                is_transfer=True
             ))
             # Record the deposit side of the transfer
             db.session.add(Transaction(
@@ -1388,7 +1381,8 @@ def transfer():
                 amount=amount,
                 account_type=to_account,
                 type='Deposit',
-                description=f'Transfer from {from_account}'
+                description=f'Transfer from {from_account}',
+                is_transfer=True
             ))
             try:
                 db.session.commit()
@@ -1502,13 +1496,6 @@ def apply_savings_interest(student, annual_rate=0.045):
     this_month = now.month
     this_year = now.year
 
-    def _as_utc(dt):
-        if dt is None:
-            return None
-        if dt.tzinfo is None:
-            return dt.replace(tzinfo=timezone.utc)
-        return dt.astimezone(timezone.utc)
-
     # Get banking settings for current teacher
     teacher_id = get_current_teacher_id()
     settings = BankingSettings.query.filter_by(teacher_id=teacher_id).first() if teacher_id else None
@@ -1522,7 +1509,7 @@ def apply_savings_interest(student, annual_rate=0.045):
 
     # Check if interest was already applied this month
     for tx in student.transactions:
-        tx_timestamp = _as_utc(tx.timestamp)
+        tx_timestamp = as_utc(tx.timestamp)
         if (
             tx.account_type == 'savings'
             and tx.description == "Monthly Savings Interest"
@@ -1533,9 +1520,9 @@ def apply_savings_interest(student, annual_rate=0.045):
             return  # Interest already applied this month
 
     for tx in student.transactions:
-        if tx.account_type != 'savings' or "Transfer" not in (tx.description or ""):
+        if tx.account_type != 'savings' or not tx.is_transfer:
             continue
-        tx_timestamp = _as_utc(tx.timestamp)
+        tx_timestamp = as_utc(tx.timestamp)
         if tx_timestamp and tx_timestamp.date() == now.date():
             return
 
@@ -1571,7 +1558,7 @@ def apply_savings_interest(student, annual_rate=0.045):
             # Exclude interest transactions from principal calculation
             if tx.type == 'Interest' or 'Interest' in (tx.description or ''):
                 continue
-            available_at = _as_utc(tx.date_funds_available)
+            available_at = as_utc(tx.date_funds_available)
             if available_at and (now - available_at).days >= 30:
                 eligible_balance += tx.amount
 
@@ -1788,10 +1775,7 @@ def purchase_insurance(policy_id):
             return redirect(url_for('student.student_insurance'))
 
     # CRITICAL FIX v2: Check sufficient funds using join_code scoped balance
-    checking_balance = round(sum(
-        tx.amount for tx in student.transactions
-        if tx.account_type == 'checking' and not tx.is_void and tx.join_code == join_code
-    ), 2)
+    checking_balance = student.get_checking_balance(join_code=join_code)
     if checking_balance < policy.premium:
         flash("Insufficient funds to purchase this insurance policy.", "danger")
         return redirect(url_for('student.student_insurance'))
@@ -2416,19 +2400,10 @@ def rent():
     ).all()
 
     # Filter out payments where the corresponding transaction was voided
-    payments = []
-    for payment in all_payments_for_period:
-        txn = Transaction.query.filter(
-            Transaction.student_id == student.id,
-            Transaction.type == 'Rent Payment',
-            or_(Transaction.join_code == join_code, Transaction.join_code.is_(None)),
-            Transaction.timestamp >= payment.payment_date - timedelta(seconds=5),
-            Transaction.timestamp <= payment.payment_date + timedelta(seconds=5),
-            Transaction.amount == -payment.amount_paid
-        ).first()
-
-        if txn and not txn.is_void:
-            payments.append(payment)
+    payments = _unvoided_rent_payments(
+        student.id, all_payments_for_period,
+        or_(Transaction.join_code == join_code, Transaction.join_code.is_(None)),
+    )
 
     total_paid = sum(p.amount_paid for p in payments) if payments else 0.0
 
@@ -2454,8 +2429,7 @@ def rent():
     }
 
     # Get scoped balances for this class only
-    checking_balance = student.get_checking_balance(teacher_id=teacher_id, join_code=join_code)
-    savings_balance = student.get_savings_balance(teacher_id=teacher_id, join_code=join_code)
+    checking_balance, savings_balance = calculate_scoped_balances(student, join_code, teacher_id)
 
     # Get payment history for the current class only
     payment_history = RentPayment.query.filter(
@@ -2466,10 +2440,7 @@ def rent():
     ).limit(24).all()  # Increased to show more history with multiple periods
 
     # Get rent items for this setting to show what rent includes
-    from app.models import RentItem
-    rent_items = []
-    if settings:
-        rent_items = RentItem.query.filter_by(rent_setting_id=settings.id).order_by(RentItem.order_index).all()
+    rent_items = settings.rent_items if settings else []
 
     return render_template('student_rent.html',
                           student=student,
@@ -2535,8 +2506,7 @@ def rent_pay(period):
     current_month = now.month
     current_year = now.year
 
-    checking_balance = student.get_checking_balance(teacher_id=teacher_id, join_code=join_code)
-    savings_balance = student.get_savings_balance(teacher_id=teacher_id, join_code=join_code)
+    checking_balance, savings_balance = calculate_scoped_balances(student, join_code, teacher_id)
 
     # Get all existing payments for this period this month
     all_payments = RentPayment.query.filter(
@@ -2548,21 +2518,10 @@ def rent_pay(period):
     ).all()
 
     # Filter out payments where the corresponding transaction was voided
-    existing_payments = []
-    for payment in all_payments:
-        # Find the transaction for this payment
-        txn = Transaction.query.filter(
-            Transaction.student_id == student.id,
-            Transaction.type == 'Rent Payment',
-            or_(Transaction.join_code == join_code, Transaction.join_code.is_(None)),
-            Transaction.timestamp >= payment.payment_date - timedelta(seconds=5),
-            Transaction.timestamp <= payment.payment_date + timedelta(seconds=5),
-            Transaction.amount == -payment.amount_paid
-        ).first()
-
-        # Only include if transaction exists and is not voided
-        if txn and not txn.is_void:
-            existing_payments.append(payment)
+    existing_payments = _unvoided_rent_payments(
+        student.id, all_payments,
+        or_(Transaction.join_code == join_code, Transaction.join_code.is_(None)),
+    )
 
     total_paid_so_far = sum(p.amount_paid for p in existing_payments) if existing_payments else 0.0
 
@@ -2607,6 +2566,10 @@ def rent_pay(period):
         # Full payment required (or no amount specified with incremental disabled)
         payment_amount = remaining_amount
 
+    # RentPayment.amount_paid is stored to the cent; write the same value to the
+    # Transaction so _unvoided_rent_payments can match the two exactly
+    payment_amount = round(payment_amount, 2)
+
     # Get banking settings for overdraft handling (reuse teacher_id from above)
     banking_settings = BankingSettings.query.filter_by(teacher_id=teacher_id).first() if teacher_id else None
 
@@ -27,7 +27,7 @@ from app.models import (
     DeletionRequestType, DeletionRequestStatus, TeacherBlock, StudentBlock, UserReport,
     FeatureSettings, TeacherOnboarding, RentSettings, BankingSettings,
     DemoStudent, HallPassSettings, PayrollFine, PayrollReward,
-    PayrollSettings, StoreItem, Announcement, Issue, IssueStatusHistory
+    PayrollSettings, StoreItem, Announcement, Issue, StudentBalance
 )
 from app.auth import system_admin_required, SESSION_TIMEOUT_MINUTES
 from forms import SystemAdminLoginForm, SystemAdminInviteForm
@@ -547,7 +547,8 @@ def error_logs():
     # Get error type filter if provided
     error_type_filter = request.args.get('error_type', '')
 
-    query = ErrorLog.query
+    # Each entry expands to show its stack trace and log output
+    query = ErrorLog.query.options(db.undefer_group('diagnostics'))
 
     if error_type_filter:
         query = query.filter(ErrorLog.error_type == error_type_filter)
@@ -608,7 +609,7 @@ def network_activity():
     ip_filter = request.args.get('ip', '')
 
     # Query error logs as proxy for network activity
-    query = ErrorLog.query
+    query = ErrorLog.query.options(db.undefer(ErrorLog.stack_trace))
 
     if ip_filter:
         query = query.filter(ErrorLog.ip_address == ip_filter)
@@ -811,6 +812,7 @@ def delete_admin(admin_id):
 
         if exclusive_student_ids:
             Transaction.query.filter(Transaction.student_id.in_(exclusive_student_ids)).delete(synchronize_session=False)
+            StudentBalance.query.filter(StudentBalance.student_id.in_(exclusive_student_ids)).delete(synchronize_session=False)
             TapEvent.query.filter(TapEvent.student_id.in_(exclusive_student_ids)).delete(synchronize_session=False)
             HallPassLog.query.filter(HallPassLog.student_id.in_(exclusive_student_ids)).delete(synchronize_session=False)
             StudentItem.query.filter(StudentItem.student_id.in_(exclusive_student_ids)).delete(synchronize_session=False)
@@ -1570,17 +1572,16 @@ def announcements():
     from app.models import Announcement
 
     # Get only system admin announcements (not teacher announcements)
-    announcements_list = Announcement.query.filter(
+    announcements_list = Announcement.query.options(
+        db.selectinload(Announcement.target_teacher)
+    ).filter(
         Announcement.system_admin_id != None
     ).order_by(Announcement.created_at.desc()).all()
 
-    # Get list of teachers for display
-    teachers_dict = {admin.id: admin for admin in Admin.query.all()}
-
     # Attach audience info to each announcement
     for announcement in announcements_list:
         if announcement.audience_type == 'teacher_all_classes' and announcement.target_teacher_id:
-            teacher = teachers_dict.get(announcement.target_teacher_id)
+            teacher = announcement.target_teacher
             announcement.audience_display = f"All classes of {teacher.get_display_name() if teacher else 'Unknown Teacher'}"
         else:
             announcement.audience_display = announcement.get_audience_label()
@@ -1786,21 +1787,16 @@ def escalated_issues():
 def view_escalated_issue(issue_id):
     """View detailed information about a specific escalated issue."""
     # Get the issue and verify it's escalated
-    issue = Issue.query.filter(
+    issue = Issue.detail_query().filter(
         Issue.id == issue_id,
         Issue.status.in_(['elevated', 'developer_review', 'developer_resolved'])
     ).first_or_404()
 
-    # Get status history
-    history = IssueStatusHistory.query.filter_by(
-        issue_id=issue.id
-    ).order_by(IssueStatusHistory.changed_at.desc()).all()
-
     return render_template('sysadmin_view_escalated_issue.html',
                          current_page='issues',
                          page_title=f'Issue #{issue.id}',
                          issue=issue,
-                         history=history,
+                         history=issue.status_history,  # Newest first, loaded with the issue
                          format_utc_iso=format_utc_iso)
 
 
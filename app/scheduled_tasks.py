@@ -85,7 +85,7 @@ def cleanup_expired_demo_sessions_job():
     # Import here to avoid circular imports
     from app.models import DemoStudent
     from app.extensions import db
-    from app.utils.demo_sessions import cleanup_demo_student_data
+    from app.utils.demo_sessions import cleanup_demo_sessions_bulk, cleanup_demo_student_data
 
     logger = logging.getLogger('scheduled_tasks')
     logger.info("Starting demo session cleanup job")
@@ -98,6 +98,24 @@ def cleanup_expired_demo_sessions_job():
             DemoStudent.is_active == True,
             DemoStudent.expires_at < now
         ).all()
+        if not expired_sessions:
+            return
+
+        # Fast path: clear every expired session with one DELETE per table
+        try:
+            cleanup_demo_sessions_bulk(expired_sessions)
+            db.session.commit()
+            logger.info(
+                f"Demo session cleanup completed. Cleaned up {len(expired_sessions)} expired sessions"
+            )
+            return
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"Bulk demo session cleanup failed, retrying per session: {e}")
+            expired_sessions = DemoStudent.query.filter(
+                DemoStudent.is_active == True,
+                DemoStudent.expires_at < now
+            ).all()
 
         cleaned_count = 0
         for demo_session in expired_sessions:
@@ -10,6 +10,7 @@ from app.models import (
     RentPayment,
     RentWaiver,
     Student,
+    StudentBalance,
     StudentBlock,
     StudentInsurance,
     StudentItem,
@@ -40,28 +41,59 @@ def cleanup_demo_student_data(demo_session: DemoStudent, delete_session_record:
     demo_session.is_active = False
     demo_session.ended_at = demo_session.ended_at or datetime.now(timezone.utc)
 
+    _delete_student_artifacts([student_id])
+
+    if delete_session_record:
+        db.session.delete(demo_session)
+
+    Student.query.filter_by(id=student_id).delete()
+
+
+def cleanup_demo_sessions_bulk(demo_sessions: list[DemoStudent]) -> None:
+    """Remove several demo sessions and their students in one pass.
+
+    Equivalent to calling :func:`cleanup_demo_student_data` for each session,
+    but every dependent table is cleared with a single ``IN`` DELETE instead of
+    one DELETE per session, which keeps the scheduled sweep's cost flat as
+    expired sessions accumulate.
+
+    Args:
+        demo_sessions: The demo session records to clean up.
+    """
+
+    if not demo_sessions:
+        return
+
+    student_ids = [demo_session.student_id for demo_session in demo_sessions]
+    session_ids = [demo_session.id for demo_session in demo_sessions]
+
+    _delete_student_artifacts(student_ids)
+    DemoStudent.query.filter(DemoStudent.id.in_(session_ids)).delete()
+    Student.query.filter(Student.id.in_(student_ids)).delete()
+
+
+def _delete_student_artifacts(student_ids: list[int]) -> None:
+    """Delete rows that reference the given demo students, in FK-safe order."""
+
     # Insurance-related artifacts
-    InsuranceClaim.query.filter_by(student_id=student_id).delete()
-    StudentInsurance.query.filter_by(student_id=student_id).delete()
+    InsuranceClaim.query.filter(InsuranceClaim.student_id.in_(student_ids)).delete()
+    StudentInsurance.query.filter(StudentInsurance.student_id.in_(student_ids)).delete()
 
     # Rent artifacts
-    RentPayment.query.filter_by(student_id=student_id).delete()
-    RentWaiver.query.filter_by(student_id=student_id).delete()
+    RentPayment.query.filter(RentPayment.student_id.in_(student_ids)).delete()
+    RentWaiver.query.filter(RentWaiver.student_id.in_(student_ids)).delete()
 
     # Hall pass requests
-    HallPassLog.query.filter_by(student_id=student_id).delete()
+    HallPassLog.query.filter(HallPassLog.student_id.in_(student_ids)).delete()
 
     # Commerce/engagement artifacts
-    StudentItem.query.filter_by(student_id=student_id).delete()
-    TapEvent.query.filter_by(student_id=student_id).delete()
-    Transaction.query.filter_by(student_id=student_id).delete()
+    StudentItem.query.filter(StudentItem.student_id.in_(student_ids)).delete()
+    TapEvent.query.filter(TapEvent.student_id.in_(student_ids)).delete()
+    Transaction.query.filter(Transaction.student_id.in_(student_ids)).delete()
+    # Bulk deletes skip the roll-up listeners, so balance rows go explicitly
+    StudentBalance.query.filter(StudentBalance.student_id.in_(student_ids)).delete()
 
     # Remove student associations
-    StudentTeacher.query.filter_by(student_id=student_id).delete()
-    StudentBlock.query.filter_by(student_id=student_id).delete()
-    TeacherBlock.query.filter_by(student_id=student_id).delete()
-
-    if delete_session_record:
-        db.session.delete(demo_session)
-
-    Student.query.filter_by(id=student_id).delete()
+    StudentTeacher.query.filter(StudentTeacher.student_id.in_(student_ids)).delete()
+    StudentBlock.query.filter(StudentBlock.student_id.in_(student_ids)).delete()
+    TeacherBlock.query.filter(TeacherBlock.student_id.in_(student_ids)).delete()
@@ -7,19 +7,29 @@ encrypting sensitive data at rest using Fernet (AES encryption).
 
 import os
 import base64
+from functools import lru_cache
 from sqlalchemy.types import TypeDecorator, LargeBinary
 from cryptography.fernet import Fernet, InvalidToken
 
 
+@lru_cache(maxsize=8)
+def _fernet_for_key(key):
+    """Return a shared Fernet instance for a key so cipher setup happens once per key."""
+    return Fernet(key)
+
+
 class PIIEncryptedType(TypeDecorator):
     """Custom AES encryption for PII fields using Fernet."""
     impl = LargeBinary
+    # State is only the env var name, so compiled statements using this type can be cached
+    cache_ok = True
 
     def __init__(self, key_env_var, *args, **kwargs):
         key = os.getenv(key_env_var)
         if not key:
             raise RuntimeError(f"Missing required environment variable: {key_env_var}")
-        self.fernet = Fernet(key)
+        self.key_env_var = key_env_var
+        self.fernet = _fernet_for_key(key)
         super().__init__(*args, **kwargs)
 
     def process_bind_param(self, value, dialect):
@@ -42,7 +52,7 @@ def _get_fernet():
     key = os.getenv('ENCRYPTION_KEY')
     if not key:
         raise RuntimeError("Missing required environment variable: ENCRYPTION_KEY")
-    return Fernet(key)
+    return _fernet_for_key(key)
 
 
 def encrypt_totp(plaintext_secret):
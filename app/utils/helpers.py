@@ -51,15 +51,20 @@ def render_template_with_fallback(template_name, **context):
     return render_template(template_name, **context)
 
 
+def as_utc(dt):
+    """Return a timezone-aware UTC datetime, treating naive values as UTC (None passes through)."""
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
 def format_utc_iso(dt):
     """Return a UTC ISO-8601 string (with trailing Z) for a datetime or None."""
     if not dt:
         return None
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    else:
-        dt = dt.astimezone(timezone.utc)
-    return dt.isoformat().replace("+00:00", "Z")
+    return as_utc(dt).isoformat().replace("+00:00", "Z")
 
 
 def is_safe_url(target):
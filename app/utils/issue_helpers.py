@@ -52,12 +52,11 @@ def create_context_snapshot(student, join_code, related_transaction_id=None, rel
     }
 
     # Get current balances (scoped by join_code)
-    checking_balance = student.get_checking_balance(join_code=join_code)
-    savings_balance = student.get_savings_balance(join_code=join_code)
+    balances = student.get_all_balances(join_code=join_code)
     snapshot['balances'] = {
-        'checking': checking_balance,
-        'savings': savings_balance,
-        'total': checking_balance + savings_balance
+        'checking': balances['checking'],
+        'savings': balances['savings'],
+        'total': balances['checking'] + balances['savings']
     }
 
     # If transaction-specific, include transaction details
@@ -36,6 +36,18 @@ def hash_username_lookup(username: str) -> str:
     return hmac.new(pepper, username.encode(), sha256).hexdigest()
 
 
+def hash_first_name_lookup(first_name: str) -> str:
+    """Return a deterministic HMAC hash of a normalized first name.
+
+    Like :func:`hash_username_lookup` this skips the per-row salt so the
+    encrypted ``first_name`` columns can be narrowed with an indexed equality
+    filter. Callers still compare the decrypted value for an exact match.
+    """
+
+    pepper = _get_pepper()
+    return hmac.new(pepper, first_name.strip().lower().encode(), sha256).hexdigest()
+
+
 def get_random_salt() -> bytes:
     """Return 16 cryptographically secure random bytes."""
 
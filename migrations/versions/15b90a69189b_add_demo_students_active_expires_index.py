@@ -0,0 +1,52 @@
+"""Add partial index for the expired demo session sweep
+
+Revision ID: 15b90a69189b
+Revises: 913b512fda93
+Create Date: 2026-01-24 09:00:00.000000
+
+The scheduled cleanup job looks for active demo sessions past expires_at.
+Ended sessions are deleted by the sweep, so a partial index over active
+rows stays tiny. Built CONCURRENTLY on PostgreSQL; other databases get a
+regular index on expires_at.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '15b90a69189b'
+down_revision = '913b512fda93'
+branch_labels = None
+depends_on = None
+
+
+def index_exists(table_name, index_name):
+    """Check if an index exists on a table."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = [idx['name'] for idx in inspector.get_indexes(table_name)]
+    return index_name in indexes
+
+
+def upgrade():
+    if index_exists('demo_students', 'ix_demo_students_active_expires'):
+        print("⚠️  Index 'ix_demo_students_active_expires' already exists, skipping...")
+        return
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with op.get_context().autocommit_block():
+            op.create_index(
+                'ix_demo_students_active_expires', 'demo_students', ['expires_at'],
+                postgresql_where=sa.text('is_active = true'),
+                postgresql_concurrently=True,
+            )
+    else:
+        op.create_index('ix_demo_students_active_expires', 'demo_students', ['expires_at'])
+    print("✅ Added partial index ix_demo_students_active_expires")
+
+
+def downgrade():
+    if index_exists('demo_students', 'ix_demo_students_active_expires'):
+        op.drop_index('ix_demo_students_active_expires', table_name='demo_students')
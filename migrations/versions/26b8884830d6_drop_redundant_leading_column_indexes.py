@@ -0,0 +1,59 @@
+"""Drop single-column indexes already covered by composite indexes
+
+Revision ID: 26b8884830d6
+Revises: 15b90a69189b
+Create Date: 2026-01-25 09:00:00.000000
+
+Each index dropped here indexes a column that is already the leading column
+of a primary key, unique constraint or composite index on the same table.
+Lookups on that column use the wider index equally well, so the singletons
+only add a B-tree write to every INSERT and UPDATE.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '26b8884830d6'
+down_revision = '15b90a69189b'
+branch_labels = None
+depends_on = None
+
+
+# (table, redundant index, its columns, covering index or constraint)
+REDUNDANT_INDEXES = (
+    ('feature_settings', 'ix_feature_settings_teacher_id', ['teacher_id'], 'uq_feature_settings_teacher_block'),
+    ('insurance_policy_blocks', 'ix_insurance_policy_blocks_policy', ['policy_id'], 'primary key (policy_id, block)'),
+    ('store_item_blocks', 'ix_store_item_blocks_item', ['store_item_id'], 'primary key (store_item_id, block)'),
+    ('student_blocks', 'ix_student_blocks_student_id', ['student_id'], 'uq_student_blocks_student_period'),
+    ('student_teachers', 'ix_student_teachers_student_id', ['student_id'], 'uq_student_teachers_student_admin'),
+    ('rent_payments', 'ix_rent_payments_join_code', ['join_code'], 'ix_rent_payments_lookup'),
+    ('teacher_blocks', 'ix_teacher_blocks_join_code', ['join_code'], 'ix_teacher_blocks_join_claimed_dob'),
+    ('issues', 'ix_issues_join_code', ['join_code'], 'ix_issues_join_code_status'),
+    ('issues', 'ix_issues_teacher_id', ['teacher_id'], 'ix_issues_teacher_status'),
+    ('issues', 'ix_issues_student_id', ['student_id'], 'ix_issues_student_status'),
+)
+
+
+def index_exists(table_name, index_name):
+    """Check if an index exists on a table."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = [idx['name'] for idx in inspector.get_indexes(table_name)]
+    return index_name in indexes
+
+
+def upgrade():
+    for table_name, index_name, _columns, covered_by in REDUNDANT_INDEXES:
+        if index_exists(table_name, index_name):
+            op.drop_index(index_name, table_name=table_name)
+            print(f"✅ Dropped index {index_name} (covered by {covered_by})")
+        else:
+            print(f"ℹ️  Index '{index_name}' not present, skipping...")
+
+
+def downgrade():
+    for table_name, index_name, columns, _covered_by in REDUNDANT_INDEXES:
+        if not index_exists(table_name, index_name):
+            op.create_index(index_name, table_name, columns)
@@ -0,0 +1,58 @@
+"""Add composite indexes for rent payment lookups
+
+Revision ID: 299082db27a7
+Revises: 9d99b9a40da4
+Create Date: 2026-01-16 09:00:00.000000
+
+Rent checks filter rent_payments by join_code or student together with
+period_year/period_month, but only join_code was indexed. These composite
+indexes let both shapes be answered with a single range scan.
+
+On PostgreSQL the indexes are built CONCURRENTLY so rent_payments stays
+writable while they are created.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '299082db27a7'
+down_revision = '9d99b9a40da4'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ('ix_rent_payments_lookup', ['join_code', 'period_year', 'period_month', 'student_id']),
+    ('ix_rent_payments_student_period', ['student_id', 'period_year', 'period_month']),
+)
+
+
+def index_exists(table_name, index_name):
+    """Check if an index exists on a table."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = [idx['name'] for idx in inspector.get_indexes(table_name)]
+    return index_name in indexes
+
+
+def upgrade():
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+    for index_name, columns in INDEXES:
+        if index_exists('rent_payments', index_name):
+            print(f"⚠️  Index '{index_name}' already exists, skipping...")
+            continue
+        if concurrently:
+            # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+            with op.get_context().autocommit_block():
+                op.create_index(index_name, 'rent_payments', columns, postgresql_concurrently=True)
+        else:
+            op.create_index(index_name, 'rent_payments', columns)
+        print(f"✅ Added index {index_name}")
+
+
+def downgrade():
+    for index_name, _columns in INDEXES:
+        if index_exists('rent_payments', index_name):
+            op.drop_index(index_name, table_name='rent_payments')
@@ -0,0 +1,69 @@
+"""Add partial indexes for the teacher pending issue queue
+
+Revision ID: 2c052ddc8ac5
+Revises: 299082db27a7
+Create Date: 2026-01-18 09:00:00.000000
+
+The teacher issue queue lists issues still awaiting the teacher
+(status 'submitted' or 'teacher_review') newest first. Resolved and
+escalated issues make up most of the table, so partial indexes over the
+pending rows stay small and return them already ordered by submitted_at.
+The broader (scope, status, submitted_at) indexes are kept because the
+resolved and escalated lists still use them.
+
+On PostgreSQL the indexes are built CONCURRENTLY. On databases without
+partial index support the WHERE clause is ignored and a regular index is
+created.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2c052ddc8ac5'
+down_revision = '299082db27a7'
+branch_labels = None
+depends_on = None
+
+
+OPEN_STATUSES = "status IN ('submitted', 'teacher_review')"
+
+PARTIAL_INDEXES = (
+    ('ix_issues_open_teacher', 'teacher_id'),
+    ('ix_issues_open_join_code', 'join_code'),
+)
+
+
+def index_exists(table_name, index_name):
+    """Check if an index exists on a table."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = [idx['name'] for idx in inspector.get_indexes(table_name)]
+    return index_name in indexes
+
+
+def upgrade():
+    for index_name, scope_column in PARTIAL_INDEXES:
+        if index_exists('issues', index_name):
+            print(f"⚠️  Index '{index_name}' already exists, skipping...")
+            continue
+
+        columns = [scope_column, sa.text('submitted_at DESC')]
+        if op.get_bind().dialect.name == 'postgresql':
+            # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+            with op.get_context().autocommit_block():
+                op.create_index(
+                    index_name, 'issues', columns,
+                    postgresql_where=sa.text(OPEN_STATUSES),
+                    postgresql_concurrently=True,
+                )
+        else:
+            op.create_index(index_name, 'issues', columns)
+        print(f"✅ Added partial index {index_name} ({OPEN_STATUSES})")
+
+
+def downgrade():
+    for index_name, _scope_column in PARTIAL_INDEXES:
+        if index_exists('issues', index_name):
+            op.drop_index(index_name, table_name='issues')
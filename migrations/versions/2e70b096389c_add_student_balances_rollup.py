@@ -0,0 +1,73 @@
+"""Add student_balances roll-up table
+
+Revision ID: 2e70b096389c
+Revises: cf9dfaf556c4
+Create Date: 2026-01-06 09:00:00.000000
+
+Balances and earnings are now read from a per-student, per-class roll-up
+that the application keeps current on every transaction write. This creates
+the table and backfills it from the existing transaction history.
+
+The roll-up is maintained with running += deltas, so amounts are stored as
+BIGINT cents; FLOAT columns would accumulate binary floating point drift.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2e70b096389c'
+down_revision = 'cf9dfaf556c4'
+branch_labels = None
+depends_on = None
+
+
+def table_exists(table_name):
+    """Check if a table exists."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    return table_name in inspector.get_table_names()
+
+
+def upgrade():
+    if table_exists('student_balances'):
+        print("⚠️  Table 'student_balances' already exists, skipping...")
+        return
+
+    op.create_table(
+        'student_balances',
+        sa.Column('student_id', sa.Integer(), sa.ForeignKey('students.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('join_code', sa.String(length=20), nullable=False, server_default=''),
+        sa.Column('teacher_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('account_type', sa.String(length=20), nullable=False, server_default=''),
+        sa.Column('balance_cents', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('earnings_cents', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('student_id', 'join_code', 'teacher_id', 'account_type'),
+    )
+    print("✅ Created student_balances table")
+
+    op.execute("""
+        INSERT INTO student_balances
+            (student_id, join_code, teacher_id, account_type, balance_cents, earnings_cents, updated_at)
+        SELECT
+            student_id,
+            COALESCE(join_code, ''),
+            COALESCE(teacher_id, 0),
+            COALESCE(account_type, ''),
+            SUM(CASE WHEN is_void IS NOT TRUE THEN CAST(ROUND(CAST(amount AS NUMERIC) * 100) AS BIGINT) ELSE 0 END),
+            SUM(CASE WHEN is_void IS NOT TRUE AND amount > 0
+                      AND (description IS NULL OR description NOT LIKE 'Transfer%')
+                     THEN CAST(ROUND(CAST(amount AS NUMERIC) * 100) AS BIGINT) ELSE 0 END),
+            MAX(timestamp)
+        FROM "transaction"
+        WHERE student_id IS NOT NULL
+        GROUP BY student_id, COALESCE(join_code, ''), COALESCE(teacher_id, 0), COALESCE(account_type, '')
+    """)
+    print("✅ Backfilled student_balances from transaction history")
+
+
+def downgrade():
+    if table_exists('student_balances'):
+        op.drop_table('student_balances')
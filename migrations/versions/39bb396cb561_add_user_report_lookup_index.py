@@ -0,0 +1,61 @@
+"""Replace user report anonymous_code index with one that includes submitted_at
+
+Revision ID: 39bb396cb561
+Revises: 6ec789c8a10c
+Create Date: 2026-01-20 09:00:00.000000
+
+The "my reports" panel looks up a reporter's reports by anonymous_code and
+lists the newest first. Adding submitted_at DESC to the index lets the
+planner return them in order without a separate sort. The new index starts
+with anonymous_code, so it also serves plain equality lookups and the old
+single-column index is dropped.
+
+On PostgreSQL the new index is built CONCURRENTLY.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '39bb396cb561'
+down_revision = '6ec789c8a10c'
+branch_labels = None
+depends_on = None
+
+
+OLD_INDEX = 'ix_user_reports_anonymous_code'
+NEW_INDEX = 'ix_user_reports_anonymous_submitted'
+
+
+def index_exists(table_name, index_name):
+    """Check if an index exists on a table."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = [idx['name'] for idx in inspector.get_indexes(table_name)]
+    return index_name in indexes
+
+
+def upgrade():
+    if not index_exists('user_reports', NEW_INDEX):
+        columns = ['anonymous_code', sa.text('submitted_at DESC')]
+        if op.get_bind().dialect.name == 'postgresql':
+            # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+            with op.get_context().autocommit_block():
+                op.create_index(NEW_INDEX, 'user_reports', columns, postgresql_concurrently=True)
+        else:
+            op.create_index(NEW_INDEX, 'user_reports', columns)
+        print(f"✅ Added index {NEW_INDEX}")
+    else:
+        print(f"⚠️  Index '{NEW_INDEX}' already exists, skipping...")
+
+    if index_exists('user_reports', OLD_INDEX):
+        op.drop_index(OLD_INDEX, table_name='user_reports')
+        print(f"✅ Dropped index {OLD_INDEX} (superseded by {NEW_INDEX})")
+
+
+def downgrade():
+    if not index_exists('user_reports', OLD_INDEX):
+        op.create_index(OLD_INDEX, 'user_reports', ['anonymous_code'])
+    if index_exists('user_reports', NEW_INDEX):
+        op.drop_index(NEW_INDEX, table_name='user_reports')
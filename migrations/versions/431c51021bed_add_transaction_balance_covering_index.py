@@ -0,0 +1,58 @@
+"""Replace balance index with a covering index on transactions
+
+Revision ID: 431c51021bed
+Revises: 74adbf5103ce
+Create Date: 2026-01-10 09:00:00.000000
+
+Scoped balance sums filter transactions by student, account type, void flag,
+join code and (for legacy rows) teacher. The covering index orders those
+columns for the filter and, on PostgreSQL, INCLUDEs amount and is_transfer so
+the sums can be answered with an index-only scan. It supersedes
+ix_tx_student_join_acct_void.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '431c51021bed'
+down_revision = '74adbf5103ce'
+branch_labels = None
+depends_on = None
+
+
+def index_exists(table_name, index_name):
+    """Check if an index exists on a table."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = [idx['name'] for idx in inspector.get_indexes(table_name)]
+    return index_name in indexes
+
+
+def upgrade():
+    if not index_exists('transaction', 'ix_tx_balance_cover'):
+        op.create_index(
+            'ix_tx_balance_cover',
+            'transaction',
+            ['student_id', 'account_type', 'is_void', 'join_code', 'teacher_id'],
+            postgresql_include=['amount', 'is_transfer']
+        )
+        print("✅ Added covering index ix_tx_balance_cover")
+    else:
+        print("⚠️  Index 'ix_tx_balance_cover' already exists, skipping...")
+
+    if index_exists('transaction', 'ix_tx_student_join_acct_void'):
+        op.drop_index('ix_tx_student_join_acct_void', table_name='transaction')
+        print("✅ Dropped superseded index ix_tx_student_join_acct_void")
+
+
+def downgrade():
+    if not index_exists('transaction', 'ix_tx_student_join_acct_void'):
+        op.create_index(
+            'ix_tx_student_join_acct_void',
+            'transaction',
+            ['student_id', 'join_code', 'account_type', 'is_void']
+        )
+    if index_exists('transaction', 'ix_tx_balance_cover'):
+        op.drop_index('ix_tx_balance_cover', table_name='transaction')
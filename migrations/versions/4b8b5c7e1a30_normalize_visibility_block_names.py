@@ -0,0 +1,92 @@
+"""Normalize store item / insurance policy block names and enforce it
+
+Revision ID: 4b8b5c7e1a30
+Revises: 75e2ff8742f2
+Create Date: 2026-01-22 09:00:00.000000
+
+Block visibility rows are written trimmed and upper-case by set_blocks,
+but rows created directly could differ only in case or whitespace. This
+migration rewrites existing rows to the canonical form (dropping rows that
+would then duplicate another row for the same item/policy) and adds CHECK
+constraints so lookups can compare block names without UPPER().
+
+NOTE: The CHECK constraints are added on PostgreSQL only; SQLite needs a
+table rebuild to add a constraint. Rows are normalized on every database.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b8b5c7e1a30'
+down_revision = '75e2ff8742f2'
+branch_labels = None
+depends_on = None
+
+
+BLOCK_TABLES = (
+    ('store_item_blocks', 'store_item_id', 'ck_store_item_blocks_block_normalized'),
+    ('insurance_policy_blocks', 'policy_id', 'ck_insurance_policy_blocks_block_normalized'),
+)
+
+
+def table_exists(table_name):
+    """Check if a table exists."""
+    return sa.inspect(op.get_bind()).has_table(table_name)
+
+
+def constraint_exists(conn, constraint_name):
+    return conn.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = :name)"
+    ), {'name': constraint_name}).scalar()
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    for table_name, owner_column, constraint_name in BLOCK_TABLES:
+        if not table_exists(table_name):
+            print(f"ℹ️  Table '{table_name}' does not exist, skipping...")
+            continue
+
+        # Keep one row per (owner, normalized block): the canonical row if present,
+        # otherwise the lowest raw value
+        removed = conn.execute(sa.text(f"""
+            DELETE FROM {table_name}
+            WHERE block <> upper(trim(block))
+              AND EXISTS (
+                  SELECT 1 FROM {table_name} AS other
+                  WHERE other.{owner_column} = {table_name}.{owner_column}
+                    AND other.block <> {table_name}.block
+                    AND upper(trim(other.block)) = upper(trim({table_name}.block))
+                    AND (other.block = upper(trim(other.block)) OR other.block < {table_name}.block)
+              )
+        """)).rowcount
+        updated = conn.execute(sa.text(f"""
+            UPDATE {table_name} SET block = upper(trim(block))
+            WHERE block <> upper(trim(block))
+        """)).rowcount
+        print(f"✅ Normalized {table_name}.block ({updated} updated, {removed} duplicates removed)")
+
+        if conn.dialect.name != 'postgresql':
+            print(f"⚠️  Skipping constraint {constraint_name} on non-PostgreSQL database")
+        elif not constraint_exists(conn, constraint_name):
+            conn.execute(sa.text(f"""
+                ALTER TABLE {table_name}
+                ADD CONSTRAINT {constraint_name} CHECK (block = upper(trim(block)))
+            """))
+            print(f"✅ Added constraint {constraint_name}")
+        else:
+            print(f"⚠️  Constraint '{constraint_name}' already exists, skipping...")
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    if conn.dialect.name != 'postgresql':
+        return
+
+    for table_name, _owner_column, constraint_name in BLOCK_TABLES:
+        if table_exists(table_name) and constraint_exists(conn, constraint_name):
+            conn.execute(sa.text(f"ALTER TABLE {table_name} DROP CONSTRAINT {constraint_name}"))
@@ -0,0 +1,52 @@
+"""Add is_transfer flag to transactions
+
+Revision ID: 6c87fff214dc
+Revises: 2e70b096389c
+Create Date: 2026-01-07 09:00:00.000000
+
+Earnings and recent-deposit calculations excluded student account transfers
+by matching description LIKE 'Transfer%'. Transfers are now flagged when they
+are written, so the check becomes a boolean filter. The flag is only read alongside
+student filters, so it gets no index of its own.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6c87fff214dc'
+down_revision = '2e70b096389c'
+branch_labels = None
+depends_on = None
+
+
+def column_exists(table_name, column_name):
+    """Check if a column exists in a table."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    columns = [col['name'] for col in inspector.get_columns(table_name)]
+    return column_name in columns
+
+
+def upgrade():
+    if not column_exists('transaction', 'is_transfer'):
+        op.add_column(
+            'transaction',
+            sa.Column('is_transfer', sa.Boolean(), nullable=False, server_default=sa.false())
+        )
+        print("✅ Added is_transfer column to transaction")
+
+        op.execute("""
+            UPDATE "transaction"
+            SET is_transfer = TRUE
+            WHERE description LIKE 'Transfer%'
+        """)
+        print("✅ Backfilled is_transfer from transaction descriptions")
+    else:
+        print("⚠️  Column 'is_transfer' already exists, skipping...")
+
+
+def downgrade():
+    if column_exists('transaction', 'is_transfer'):
+        op.drop_column('transaction', 'is_transfer')
@@ -0,0 +1,86 @@
+"""Store rent, insurance and reward amounts as NUMERIC(10, 2)
+
+Revision ID: 6ec789c8a10c
+Revises: 2c052ddc8ac5
+Create Date: 2026-01-19 09:00:00.000000
+
+These money columns were DOUBLE PRECISION, so SUM() over rent payments
+and claim totals picked up binary rounding error that every caller had to
+round away. NUMERIC(10, 2) makes the database do exact decimal arithmetic
+and comparisons. The models use Numeric(asdecimal=False), so application
+code still receives floats.
+
+NOTE: PostgreSQL-specific. SQLite's type affinity stores both the same way.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6ec789c8a10c'
+down_revision = '2c052ddc8ac5'
+branch_labels = None
+depends_on = None
+
+
+MONEY_COLUMNS = (
+    ('rent_settings', 'rent_amount'),
+    ('rent_settings', 'late_penalty_amount'),
+    ('rent_payments', 'amount_paid'),
+    ('rent_payments', 'late_fee_charged'),
+    ('insurance_policies', 'premium'),
+    ('insurance_policies', 'max_claim_amount'),
+    ('insurance_policies', 'max_payout_per_period'),
+    ('insurance_policies', 'bundle_discount_amount'),
+    ('insurance_claims', 'claim_amount'),
+    ('insurance_claims', 'approved_amount'),
+    ('user_reports', 'reward_amount'),
+    ('issue_resolution_actions', 'amount_changed'),
+)
+
+
+def column_data_type(conn, table_name, column_name):
+    """Return the information_schema data_type of a column, or None if it is missing."""
+    return conn.execute(sa.text("""
+        SELECT data_type FROM information_schema.columns
+        WHERE table_name = :table_name AND column_name = :column_name
+    """), {'table_name': table_name, 'column_name': column_name}).scalar()
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    if conn.dialect.name != 'postgresql':
+        print("⚠️  This migration is PostgreSQL-specific, skipping on non-PostgreSQL database")
+        return
+
+    for table_name, column_name in MONEY_COLUMNS:
+        data_type = column_data_type(conn, table_name, column_name)
+        if data_type is None:
+            print(f"ℹ️  {table_name}.{column_name} does not exist, skipping...")
+        elif data_type == 'numeric':
+            print(f"⚠️  {table_name}.{column_name} is already NUMERIC, skipping...")
+        else:
+            conn.execute(sa.text(f"""
+                ALTER TABLE {table_name}
+                ALTER COLUMN {column_name} TYPE NUMERIC(10, 2)
+                USING ROUND({column_name}::numeric, 2)
+            """))
+            print(f"✅ Converted {table_name}.{column_name} from {data_type} to NUMERIC(10, 2)")
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    if conn.dialect.name != 'postgresql':
+        print("⚠️  This migration is PostgreSQL-specific, skipping on non-PostgreSQL database")
+        return
+
+    for table_name, column_name in MONEY_COLUMNS:
+        if column_data_type(conn, table_name, column_name) == 'numeric':
+            conn.execute(sa.text(f"""
+                ALTER TABLE {table_name}
+                ALTER COLUMN {column_name} TYPE DOUBLE PRECISION
+                USING {column_name}::double precision
+            """))
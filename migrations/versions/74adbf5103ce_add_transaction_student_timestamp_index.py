@@ -0,0 +1,44 @@
+"""Add (student_id, timestamp) index on transactions
+
+Revision ID: 74adbf5103ce
+Revises: 9b3b95017260
+Create Date: 2026-01-09 09:00:00.000000
+
+Student.recent_deposits now queries the last two days of a student's
+transactions directly; this index turns that into a bounded range scan.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '74adbf5103ce'
+down_revision = '9b3b95017260'
+branch_labels = None
+depends_on = None
+
+
+def index_exists(table_name, index_name):
+    """Check if an index exists on a table."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = [idx['name'] for idx in inspector.get_indexes(table_name)]
+    return index_name in indexes
+
+
+def upgrade():
+    if not index_exists('transaction', 'ix_tx_student_timestamp'):
+        op.create_index(
+            'ix_tx_student_timestamp',
+            'transaction',
+            ['student_id', 'timestamp']
+        )
+        print("✅ Added index ix_tx_student_timestamp")
+    else:
+        print("⚠️  Index 'ix_tx_student_timestamp' already exists, skipping...")
+
+
+def downgrade():
+    if index_exists('transaction', 'ix_tx_student_timestamp'):
+        op.drop_index('ix_tx_student_timestamp', table_name='transaction')
@@ -0,0 +1,72 @@
+"""Store issue context snapshots and system metadata as JSONB
+
+Revision ID: 75e2ff8742f2
+Revises: 39bb396cb561
+Create Date: 2026-01-21 09:00:00.000000
+
+issues.context_snapshot and issues.system_metadata were JSON, kept as raw
+text that PostgreSQL re-parses whenever an operator or function reads into
+it. JSONB stores the parsed binary form. No GIN index is added: issues are
+looked up through the related_* columns, never by snapshot keys.
+
+NOTE: PostgreSQL-specific. Other databases keep the generic JSON type.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '75e2ff8742f2'
+down_revision = '39bb396cb561'
+branch_labels = None
+depends_on = None
+
+
+JSON_COLUMNS = ('context_snapshot', 'system_metadata')
+
+
+def column_data_type(conn, column_name):
+    """Return the information_schema data_type of an issues column, or None if it is missing."""
+    return conn.execute(sa.text("""
+        SELECT data_type FROM information_schema.columns
+        WHERE table_name = 'issues' AND column_name = :column_name
+    """), {'column_name': column_name}).scalar()
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    if conn.dialect.name != 'postgresql':
+        print("⚠️  This migration is PostgreSQL-specific, skipping on non-PostgreSQL database")
+        return
+
+    for column_name in JSON_COLUMNS:
+        data_type = column_data_type(conn, column_name)
+        if data_type is None:
+            print(f"ℹ️  issues.{column_name} does not exist, skipping...")
+        elif data_type == 'jsonb':
+            print(f"⚠️  issues.{column_name} is already JSONB, skipping...")
+        else:
+            conn.execute(sa.text(f"""
+                ALTER TABLE issues
+                ALTER COLUMN {column_name} TYPE JSONB
+                USING {column_name}::jsonb
+            """))
+            print(f"✅ Converted issues.{column_name} from {data_type} to JSONB")
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    if conn.dialect.name != 'postgresql':
+        print("⚠️  This migration is PostgreSQL-specific, skipping on non-PostgreSQL database")
+        return
+
+    for column_name in JSON_COLUMNS:
+        if column_data_type(conn, column_name) == 'jsonb':
+            conn.execute(sa.text(f"""
+                ALTER TABLE issues
+                ALTER COLUMN {column_name} TYPE JSON
+                USING {column_name}::json
+            """))
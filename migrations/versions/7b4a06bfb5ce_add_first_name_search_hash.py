@@ -0,0 +1,111 @@
+"""Add deterministic first-name search hash to students and teacher_blocks
+
+Revision ID: 7b4a06bfb5ce
+Revises: 7e5f865c0dee
+Create Date: 2026-01-12 09:00:00.000000
+
+first_name is Fernet-encrypted with a random IV, so duplicate and claim
+checks had to decrypt every candidate row to compare names. A peppered
+HMAC of the normalized first name is stored alongside it and indexed, so
+those checks can filter by equality in the database.
+
+Existing rows are backfilled when ENCRYPTION_KEY and PEPPER_KEY are set;
+rows left NULL are still matched by the application's fallback filter.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import hmac
+import os
+from hashlib import sha256
+from cryptography.fernet import Fernet, InvalidToken
+
+
+# revision identifiers, used by Alembic.
+revision = '7b4a06bfb5ce'
+down_revision = '7e5f865c0dee'
+branch_labels = None
+depends_on = None
+
+
+TABLES = ('students', 'teacher_blocks')
+
+
+def column_exists(table_name, column_name):
+    """Check if a column exists in a table."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    columns = [col['name'] for col in inspector.get_columns(table_name)]
+    return column_name in columns
+
+
+def index_exists(table_name, index_name):
+    """Check if an index exists on a table."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = [idx['name'] for idx in inspector.get_indexes(table_name)]
+    return index_name in indexes
+
+
+def backfill(table_name, fernet, pepper):
+    bind = op.get_bind()
+    table = sa.table(
+        table_name,
+        sa.column('id', sa.Integer),
+        sa.column('first_name', sa.LargeBinary),
+        sa.column('first_name_search_hash', sa.String),
+    )
+    rows = bind.execute(
+        sa.select(table.c.id, table.c.first_name).where(table.c.first_name_search_hash.is_(None))
+    ).fetchall()
+
+    updated = 0
+    for row_id, encrypted_name in rows:
+        if not encrypted_name:
+            continue
+        try:
+            first_name = fernet.decrypt(bytes(encrypted_name)).decode('utf-8')
+        except InvalidToken:
+            print(f"⚠️  Could not decrypt {table_name}.first_name for id {row_id}, leaving hash NULL")
+            continue
+        search_hash = hmac.new(pepper, first_name.strip().lower().encode(), sha256).hexdigest()
+        bind.execute(
+            sa.update(table).where(table.c.id == row_id).values(first_name_search_hash=search_hash)
+        )
+        updated += 1
+    print(f"✅ Backfilled first_name_search_hash for {updated} {table_name} row(s)")
+
+
+def upgrade():
+    for table_name in TABLES:
+        if not column_exists(table_name, 'first_name_search_hash'):
+            op.add_column(table_name, sa.Column('first_name_search_hash', sa.String(length=64), nullable=True))
+            print(f"✅ Added first_name_search_hash column to {table_name}")
+        else:
+            print(f"⚠️  Column 'first_name_search_hash' already exists on {table_name}, skipping...")
+
+        index_name = f'ix_{table_name}_first_name_search_hash'
+        if not index_exists(table_name, index_name):
+            op.create_index(index_name, table_name, ['first_name_search_hash'])
+            print(f"✅ Added index {index_name}")
+        else:
+            print(f"⚠️  Index '{index_name}' already exists, skipping...")
+
+    key = os.getenv('ENCRYPTION_KEY')
+    pepper = os.getenv('PEPPER_KEY')
+    if not key or not pepper:
+        print("⚠️  ENCRYPTION_KEY or PEPPER_KEY not set, skipping first_name_search_hash backfill")
+        return
+
+    fernet = Fernet(key.encode())
+    for table_name in TABLES:
+        backfill(table_name, fernet, pepper.encode())
+
+
+def downgrade():
+    for table_name in TABLES:
+        index_name = f'ix_{table_name}_first_name_search_hash'
+        if index_exists(table_name, index_name):
+            op.drop_index(index_name, table_name=table_name)
+        if column_exists(table_name, 'first_name_search_hash'):
+            op.drop_column(table_name, 'first_name_search_hash')
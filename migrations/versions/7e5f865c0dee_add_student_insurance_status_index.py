@@ -0,0 +1,44 @@
+"""Add (student_id, status) index on student_insurance
+
+Revision ID: 7e5f865c0dee
+Revises: 431c51021bed
+Create Date: 2026-01-12 09:00:00.000000
+
+Active enrollment lookups filter student_insurance by student and status,
+both per student and in batches for roster exports.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e5f865c0dee'
+down_revision = '431c51021bed'
+branch_labels = None
+depends_on = None
+
+
+def index_exists(table_name, index_name):
+    """Check if an index exists on a table."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = [idx['name'] for idx in inspector.get_indexes(table_name)]
+    return index_name in indexes
+
+
+def upgrade():
+    if not index_exists('student_insurance', 'ix_si_student_status'):
+        op.create_index(
+            'ix_si_student_status',
+            'student_insurance',
+            ['student_id', 'status']
+        )
+        print("✅ Added index ix_si_student_status")
+    else:
+        print("⚠️  Index 'ix_si_student_status' already exists, skipping...")
+
+
+def downgrade():
+    if index_exists('student_insurance', 'ix_si_student_status'):
+        op.drop_index('ix_si_student_status', table_name='student_insurance')
@@ -0,0 +1,74 @@
+"""Replace announcement feed indexes with partial indexes over active rows
+
+Revision ID: 913b512fda93
+Revises: 4b8b5c7e1a30
+Create Date: 2026-01-23 09:00:00.000000
+
+The student dashboard feed only reads active announcements, matched by
+join code or by audience type (plus target teacher). Deactivated
+announcements pile up over a school year, so partial indexes restricted to
+is_active = true stay small. They replace the (join_code, is_active) and
+(audience_type, is_active) indexes, which no other query used.
+
+On PostgreSQL the new indexes are built CONCURRENTLY. On databases without
+partial index support the WHERE clause is ignored and a regular index is
+created.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '913b512fda93'
+down_revision = '4b8b5c7e1a30'
+branch_labels = None
+depends_on = None
+
+
+REPLACEMENTS = (
+    ('ix_announcements_join_code_active', ['join_code', 'is_active'],
+     'ix_announcements_live_join_code', ['join_code']),
+    ('ix_announcements_audience_type', ['audience_type', 'is_active'],
+     'ix_announcements_live_audience', ['audience_type', 'target_teacher_id']),
+)
+
+LIVE = 'is_active = true'
+
+
+def index_exists(table_name, index_name):
+    """Check if an index exists on a table."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = [idx['name'] for idx in inspector.get_indexes(table_name)]
+    return index_name in indexes
+
+
+def upgrade():
+    for old_name, _old_columns, new_name, new_columns in REPLACEMENTS:
+        if not index_exists('announcements', new_name):
+            if op.get_bind().dialect.name == 'postgresql':
+                # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+                with op.get_context().autocommit_block():
+                    op.create_index(
+                        new_name, 'announcements', new_columns,
+                        postgresql_where=sa.text(LIVE),
+                        postgresql_concurrently=True,
+                    )
+            else:
+                op.create_index(new_name, 'announcements', new_columns)
+            print(f"✅ Added partial index {new_name} ({LIVE})")
+        else:
+            print(f"⚠️  Index '{new_name}' already exists, skipping...")
+
+        if index_exists('announcements', old_name):
+            op.drop_index(old_name, table_name='announcements')
+            print(f"✅ Dropped index {old_name} (superseded by {new_name})")
+
+
+def downgrade():
+    for old_name, old_columns, new_name, _new_columns in REPLACEMENTS:
+        if not index_exists('announcements', old_name):
+            op.create_index(old_name, 'announcements', old_columns)
+        if index_exists('announcements', new_name):
+            op.drop_index(new_name, table_name='announcements')
@@ -0,0 +1,50 @@
+"""Add indexes backing claim and duplicate-student matching
+
+Revision ID: 9b3b95017260
+Revises: 6c87fff214dc
+Create Date: 2026-01-08 09:00:00.000000
+
+Last name part hashes are salted per row, so they cannot be probed with a
+single index lookup. Claim matching instead narrows candidates by the
+plaintext DOB sum (and last initial) in SQL before comparing hashes; these
+indexes serve those filters.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b3b95017260'
+down_revision = '6c87fff214dc'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ('teacher_blocks', 'ix_teacher_blocks_join_claimed_dob', ['join_code', 'is_claimed', 'dob_sum']),
+    ('students', 'ix_students_last_initial_dob_sum', ['last_initial', 'dob_sum']),
+)
+
+
+def index_exists(table_name, index_name):
+    """Check if an index exists on a table."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = [idx['name'] for idx in inspector.get_indexes(table_name)]
+    return index_name in indexes
+
+
+def upgrade():
+    for table_name, index_name, columns in INDEXES:
+        if not index_exists(table_name, index_name):
+            op.create_index(index_name, table_name, columns)
+            print(f"✅ Added index {index_name}")
+        else:
+            print(f"⚠️  Index '{index_name}' already exists, skipping...")
+
+
+def downgrade():
+    for table_name, index_name, _ in INDEXES:
+        if index_exists(table_name, index_name):
+            op.drop_index(index_name, table_name=table_name)
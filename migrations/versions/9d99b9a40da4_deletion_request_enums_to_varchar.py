@@ -0,0 +1,119 @@
+"""Store deletion request type and status as VARCHAR with CHECK constraints
+
+Revision ID: 9d99b9a40da4
+Revises: e2dc32bb6af2
+Create Date: 2026-01-15 09:00:00.000000
+
+deletion_requests.request_type and status used PostgreSQL ENUM types
+(deletionrequesttype, deletionrequeststatus). Extending those needs
+ALTER TYPE and has required several case-fix migrations. The columns are
+now VARCHAR(16) with CHECK constraints. The model uses a non-native
+SQLAlchemy Enum, so application code still sees enum members.
+
+NOTE: PostgreSQL-specific. Other databases already store these as strings.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d99b9a40da4'
+down_revision = 'e2dc32bb6af2'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = (
+    ('request_type', 'deletionrequesttype', ('period', 'account'), 'ck_deletion_requests_request_type', None),
+    ('status', 'deletionrequeststatus', ('pending', 'approved', 'rejected'), 'ck_deletion_requests_status', 'pending'),
+)
+
+
+def column_udt(conn, column_name):
+    """Return the underlying type name of a deletion_requests column."""
+    return conn.execute(sa.text("""
+        SELECT udt_name FROM information_schema.columns
+        WHERE table_name = 'deletion_requests' AND column_name = :column_name
+    """), {'column_name': column_name}).scalar()
+
+
+def constraint_exists(conn, constraint_name):
+    return conn.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = :name)"
+    ), {'name': constraint_name}).scalar()
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    if conn.dialect.name != 'postgresql':
+        print("⚠️  This migration is PostgreSQL-specific, skipping on non-PostgreSQL database")
+        return
+
+    for column_name, enum_name, values, constraint_name, default in COLUMNS:
+        udt = column_udt(conn, column_name)
+        if udt is None:
+            print(f"ℹ️  deletion_requests.{column_name} does not exist, skipping...")
+            continue
+
+        if udt == enum_name:
+            conn.execute(sa.text(f"ALTER TABLE deletion_requests ALTER COLUMN {column_name} DROP DEFAULT"))
+            conn.execute(sa.text(f"""
+                ALTER TABLE deletion_requests
+                ALTER COLUMN {column_name} TYPE VARCHAR(16)
+                USING {column_name}::text
+            """))
+            if default:
+                conn.execute(sa.text(
+                    f"ALTER TABLE deletion_requests ALTER COLUMN {column_name} SET DEFAULT '{default}'"
+                ))
+            print(f"✅ Converted deletion_requests.{column_name} from {enum_name} to VARCHAR(16)")
+        else:
+            print(f"⚠️  deletion_requests.{column_name} is already {udt}, skipping type change...")
+
+        if not constraint_exists(conn, constraint_name):
+            allowed = ", ".join(f"'{value}'" for value in values)
+            conn.execute(sa.text(f"""
+                ALTER TABLE deletion_requests
+                ADD CONSTRAINT {constraint_name} CHECK ({column_name} IN ({allowed}))
+            """))
+            print(f"✅ Added constraint {constraint_name}")
+        else:
+            print(f"⚠️  Constraint '{constraint_name}' already exists, skipping...")
+
+        conn.execute(sa.text(f"DROP TYPE IF EXISTS {enum_name}"))
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    if conn.dialect.name != 'postgresql':
+        print("⚠️  This migration is PostgreSQL-specific, skipping on non-PostgreSQL database")
+        return
+
+    for column_name, enum_name, values, constraint_name, default in COLUMNS:
+        if column_udt(conn, column_name) is None:
+            continue
+
+        if constraint_exists(conn, constraint_name):
+            conn.execute(sa.text(f"ALTER TABLE deletion_requests DROP CONSTRAINT {constraint_name}"))
+
+        exists = conn.execute(sa.text(
+            "SELECT EXISTS (SELECT 1 FROM pg_type WHERE typname = :name)"
+        ), {'name': enum_name}).scalar()
+        if not exists:
+            allowed = ", ".join(f"'{value}'" for value in values)
+            conn.execute(sa.text(f"CREATE TYPE {enum_name} AS ENUM ({allowed})"))
+
+        if column_udt(conn, column_name) != enum_name:
+            conn.execute(sa.text(f"ALTER TABLE deletion_requests ALTER COLUMN {column_name} DROP DEFAULT"))
+            conn.execute(sa.text(f"""
+                ALTER TABLE deletion_requests
+                ALTER COLUMN {column_name} TYPE {enum_name}
+                USING {column_name}::{enum_name}
+            """))
+            if default:
+                conn.execute(sa.text(
+                    f"ALTER TABLE deletion_requests ALTER COLUMN {column_name} SET DEFAULT '{default}'::{enum_name}"
+                ))
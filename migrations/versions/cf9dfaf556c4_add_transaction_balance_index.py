@@ -0,0 +1,45 @@
+"""Add composite index backing student balance aggregation
+
+Revision ID: cf9dfaf556c4
+Revises: h7i8j9k0l1m2
+Create Date: 2026-01-05 09:00:00.000000
+
+Student balances are now computed with a single SUM() query filtered by
+student, join code, account type and void flag. This index lets the
+database satisfy that filter without scanning the student's full history.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'cf9dfaf556c4'
+down_revision = 'h7i8j9k0l1m2'
+branch_labels = None
+depends_on = None
+
+
+def index_exists(table_name, index_name):
+    """Check if an index exists on a table."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = [idx['name'] for idx in inspector.get_indexes(table_name)]
+    return index_name in indexes
+
+
+def upgrade():
+    if not index_exists('transaction', 'ix_tx_student_join_acct_void'):
+        op.create_index(
+            'ix_tx_student_join_acct_void',
+            'transaction',
+            ['student_id', 'join_code', 'account_type', 'is_void']
+        )
+        print("✅ Added index ix_tx_student_join_acct_void")
+    else:
+        print("⚠️  Index 'ix_tx_student_join_acct_void' already exists, skipping...")
+
+
+def downgrade():
+    if index_exists('transaction', 'ix_tx_student_join_acct_void'):
+        op.drop_index('ix_tx_student_join_acct_void', table_name='transaction')
@@ -0,0 +1,56 @@
+"""Add partial index over live tap events
+
+Revision ID: e2dc32bb6af2
+Revises: 7b4a06bfb5ce
+Create Date: 2026-01-13 09:00:00.000000
+
+Attendance queries almost always filter tap events on is_deleted = false.
+A partial index covers only those rows, so it stays small and mostly
+cached. Live-transaction and open-seat lookups are already served by
+ix_tx_balance_cover and ix_teacher_blocks_join_claimed_dob, so they get no
+partial index of their own. On databases without partial index support the
+WHERE clause is ignored and a regular index is created.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2dc32bb6af2'
+down_revision = '7b4a06bfb5ce'
+branch_labels = None
+depends_on = None
+
+
+PARTIAL_INDEXES = (
+    ('ix_tap_live', 'tap_events', ['student_id', 'period'], 'is_deleted = false'),
+)
+
+
+def index_exists(table_name, index_name):
+    """Check if an index exists on a table."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = [idx['name'] for idx in inspector.get_indexes(table_name)]
+    return index_name in indexes
+
+
+def upgrade():
+    for index_name, table_name, columns, where in PARTIAL_INDEXES:
+        if not index_exists(table_name, index_name):
+            op.create_index(
+                index_name,
+                table_name,
+                columns,
+                postgresql_where=sa.text(where)
+            )
+            print(f"✅ Added partial index {index_name} ({where})")
+        else:
+            print(f"⚠️  Index '{index_name}' already exists, skipping...")
+
+
+def downgrade():
+    for index_name, table_name, _columns, _where in PARTIAL_INDEXES:
+        if index_exists(table_name, index_name):
+            op.drop_index(index_name, table_name=table_name)
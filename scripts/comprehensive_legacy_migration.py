@@ -51,7 +51,7 @@ from app import create_app
 from app.extensions import db
 from app.models import (
     Student, Admin, StudentTeacher, TeacherBlock, StudentBlock,
-    Transaction, TapEvent
+    Transaction, TapEvent, StudentBalance
 )
 from app.utils.join_code import generate_join_code
 from app.routes.admin import MAX_JOIN_CODE_RETRIES
@@ -420,6 +420,9 @@ def backfill_transaction_join_codes(stats, dry_run=False):
     """))
 
     stats.transactions_backfilled = result.rowcount
+
+    # Raw UPDATE bypasses the ORM listeners, so re-derive the balance roll-up
+    StudentBalance.rebuild()
     db.session.flush()
     print(f"✅ Phase 3 complete: {stats.transactions_backfilled} transactions backfilled")
 
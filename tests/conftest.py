@@ -23,6 +23,7 @@ os.environ.setdefault("PEPPER_KEY", "tKiXIAgaPqsOOhR1PqvdEQo4BelrN5SP3cpWxVYrsHk
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import pytest
+from contextlib import contextmanager
 from app import app as flask_app, db, Student
 
 
@@ -50,6 +51,31 @@ def client(app):
     ctx.pop()
 
 
+@pytest.fixture
+def capture_sql():
+    """Return a context manager that records the SQL statements executed inside it.
+
+    Usage: ``with capture_sql() as statements: ...`` -- ``statements`` is the
+    list of SQL strings sent to the database while the block ran.
+    """
+    from sqlalchemy import event
+
+    @contextmanager
+    def capture():
+        statements = []
+
+        def listener(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+
+    return capture
+
+
 # SQLite pragma event listener for foreign key constraints
 # Registered at module level and persists across all tests
 from sqlalchemy import event
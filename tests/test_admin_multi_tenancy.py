@@ -10,7 +10,7 @@ import sqlalchemy as sa
 from app import app as flask_app
 from app.models import Admin, Student, StudentTeacher
 from app.extensions import db
-from app.auth import get_admin_student_query
+from app.auth import get_admin_student_query, get_student_for_admin
 from hash_utils import get_random_salt
 
 
@@ -422,3 +422,37 @@ def test_students_with_mismatched_teacher_id_not_visible(client):
         # This student should NOT be visible to teacher2
         assert "MismatchedStudent" not in student_names, \
             f"Student with teacher_id={teacher1.id} should NOT be visible to teacher2, but was found"
+
+
+def test_get_student_for_admin_matches_scoped_query(client, multi_teacher_data):
+    """Test the single-student lookup applies the same scoping as the roster query."""
+    from datetime import datetime, timedelta, timezone
+    from app.models import DemoStudent
+
+    teacher1, teacher2 = multi_teacher_data
+    own_id, demo_id = [link.student_id for link in StudentTeacher.query.filter_by(admin_id=teacher1.id).limit(2)]
+    own_student = db.session.get(Student, own_id)
+    demo_student = db.session.get(Student, demo_id)
+    other_student = db.session.get(Student, StudentTeacher.query.filter_by(admin_id=teacher2.id).first().student_id)
+    db.session.add(DemoStudent(
+        admin_id=teacher1.id,
+        student_id=demo_student.id,
+        session_id="demo-scope",
+        expires_at=datetime.now(timezone.utc) + timedelta(minutes=10),
+    ))
+    db.session.commit()
+
+    with client.application.test_request_context():
+        from flask import session
+
+        session['is_admin'] = True
+        session['admin_id'] = teacher1.id
+
+        assert get_student_for_admin(own_student.id) is own_student
+        assert get_student_for_admin(other_student.id) is None
+        assert get_student_for_admin(demo_student.id) is None
+        assert get_student_for_admin(None) is None
+
+        session['is_system_admin'] = True
+        assert get_student_for_admin(other_student.id) is other_student
+        assert get_student_for_admin(demo_student.id) is None
@@ -1,5 +1,5 @@
 import pyotp
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from app import db
 from app.models import Admin, Student, StudentTeacher
@@ -90,3 +90,97 @@ def test_shared_student_accessible_to_multiple_teachers(client):
 
     assert detail_response.status_code == 200
     assert "Shared" in list_response.get_data(as_text=True)
+
+
+def test_student_export_streams_only_scoped_students(client, monkeypatch):
+    from app.models import Transaction
+    from app.routes import admin as admin_routes
+
+    # Force several batches so the chunked path is exercised
+    monkeypatch.setattr(admin_routes, "EXPORT_BATCH_SIZE", 2)
+    teacher_a, secret_a = _create_admin("export-a")
+    teacher_b, _ = _create_admin("export-b")
+    names = ["Ava", "Ben", "Cal", "Dee", "Eli"]
+    for name in names:
+        student = _create_student(name, teacher_a)
+        db.session.add(Transaction(student_id=student.id, amount=10.0, account_type="checking", join_code="EXPORT1"))
+    _create_student("Hidden", teacher_b)
+    db.session.commit()
+
+    _login_admin(client, teacher_a, secret_a)
+    response = client.get("/admin/export-students")
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    lines = response.get_data(as_text=True).strip().splitlines()
+    assert lines[0].startswith("First Name,")
+    rows = [line.split(",") for line in lines[1:]]
+    assert sorted(row[0] for row in rows) == names
+    assert all(row[3] == "10.00" for row in rows)
+
+
+def test_run_payroll_scopes_transactions_to_claimed_seats(client, monkeypatch):
+    import os
+    from app.models import TeacherBlock, Transaction
+    import app.routes.admin as admin_routes
+
+    teacher, secret = _create_admin("payroll-teacher")
+    alice = _create_student("Alice", teacher)
+    bob = _create_student("Bob", teacher)
+    for student, join_code in ((alice, "PAYA"), (alice, "PAYB"), (bob, "PAYB")):
+        db.session.add(TeacherBlock(
+            teacher_id=teacher.id,
+            block=join_code[-1],
+            first_name=student.first_name,
+            last_initial="A",
+            last_name_hash_by_part=["hash"],
+            dob_sum=2025,
+            salt=os.urandom(16),
+            first_half_hash="hash",
+            join_code=join_code,
+            student_id=student.id,
+            is_claimed=True,
+        ))
+    db.session.commit()
+    monkeypatch.setattr(
+        admin_routes, "calculate_payroll",
+        lambda students, last_payroll_time, teacher_id=None: {alice.id: 4.0, bob.id: 2.5},
+    )
+
+    _login_admin(client, teacher, secret)
+    response = client.post("/admin/run-payroll", headers={"X-Requested-With": "XMLHttpRequest"})
+
+    assert response.status_code == 200
+    payroll_txs = {tx.student_id: tx for tx in Transaction.query.filter_by(type="payroll")}
+    assert payroll_txs[alice.id].join_code == "PAYA"
+    assert payroll_txs[bob.id].join_code == "PAYB"
+    assert payroll_txs[alice.id].timestamp == payroll_txs[bob.id].timestamp
+
+
+def test_bulk_rent_waiver_requires_access_to_every_student(client):
+    from app.models import RentSettings, RentWaiver
+
+    teacher, secret = _create_admin("waiver-teacher")
+    other_teacher, _ = _create_admin("waiver-other")
+    alice = _create_student("Alice", teacher)
+    bob = _create_student("Bob", teacher)
+    outsider = _create_student("Olive", other_teacher)
+    db.session.add(RentSettings(teacher_id=teacher.id, frequency_type="weekly"))
+    db.session.commit()
+    _login_admin(client, teacher, secret)
+
+    response = client.post("/admin/rent-waiver/add", data={
+        "student_ids": [str(alice.id), str(outsider.id)], "periods_count": "2",
+    })
+    assert response.status_code == 404
+    assert RentWaiver.query.count() == 0
+
+    response = client.post("/admin/rent-waiver/add", data={
+        "student_ids": [str(alice.id), str(bob.id)], "periods_count": "2", "reason": "Field trip",
+    })
+    assert response.status_code == 302
+    waivers = RentWaiver.query.order_by(RentWaiver.student_id).all()
+    assert [w.student_id for w in waivers] == [alice.id, bob.id]
+    assert all(w.periods_count == 2 and w.created_by_admin_id == teacher.id for w in waivers)
+    assert all(w.created_at is not None for w in waivers)
+    assert waivers[0].waiver_end_date - waivers[0].waiver_start_date == timedelta(days=14)
@@ -154,6 +154,28 @@ class TestAnnouncementModel:
         assert inactive.should_display() is False
         assert expired.should_display() is False
 
+    def test_visible_filters_inactive_and_expired_in_sql(self, client, test_teacher, teacher_block):
+        """Test the visible() query applies the should_display rules in SQL."""
+        now = datetime.now(timezone.utc)
+        for title, is_active, expires_at in [
+            ('No expiry', True, None),
+            ('Future expiry', True, now + timedelta(days=1)),
+            ('Inactive', False, None),
+            ('Expired', True, now - timedelta(days=1)),
+        ]:
+            db.session.add(Announcement(
+                teacher_id=test_teacher.id,
+                join_code=teacher_block.join_code,
+                title=title,
+                message='Feed entry',
+                is_active=is_active,
+                expires_at=expires_at,
+            ))
+        db.session.commit()
+
+        titles = sorted(announcement.title for announcement in Announcement.visible(now=now))
+        assert titles == ['Future expiry', 'No expiry']
+
     def test_announcement_priority_classes(self, client, test_teacher, teacher_block):
         """Test priority CSS classes and icons."""
         priorities = ['low', 'normal', 'high', 'urgent']
@@ -266,3 +288,40 @@ class TestAnnouncementMultiTenancy:
         # Verify announcement is deleted
         deleted_announcement = Announcement.query.get(announcement_id)
         assert deleted_announcement is None
+
+
+class TestSystemAdminAnnouncements:
+    """Tests for the system admin announcement list."""
+
+    def test_list_labels_targeted_teacher_without_lazy_loads(self, client, test_teacher):
+        """Targeted teachers are loaded up front; lazy author access is refused."""
+        from app.models import SystemAdmin
+
+        secret = pyotp.random_base32()
+        sys_admin = SystemAdmin(username='announcement-sysadmin', totp_secret=secret)
+        db.session.add(sys_admin)
+        db.session.commit()
+        announcement = Announcement(
+            system_admin_id=sys_admin.id,
+            audience_type='teacher_all_classes',
+            target_teacher_id=test_teacher.id,
+            title='Targeted',
+            message='For one teacher',
+        )
+        db.session.add(announcement)
+        db.session.commit()
+        announcement_id = announcement.id
+        expected_label = f'All classes of {test_teacher.get_display_name()}'
+        db.session.expunge_all()
+
+        with pytest.raises(Exception, match='raise_on_sql'):
+            db.session.get(Announcement, announcement_id).target_teacher
+
+        client.post(
+            '/sysadmin/login',
+            data={'username': 'announcement-sysadmin', 'totp_code': pyotp.TOTP(secret).now()},
+        )
+        response = client.get('/sysadmin/announcements')
+
+        assert response.status_code == 200
+        assert expected_label in response.data.decode()
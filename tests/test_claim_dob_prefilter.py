@@ -0,0 +1,83 @@
+"""
+Tests for the DOB-sum pre-filter in the account claim flow.
+
+Unclaimed seats are narrowed by the plaintext DOB sum in SQL before the salted
+hash comparisons run. The filter must keep the seat that matches and drop the
+rest, including legacy seats stored with a zero DOB sum, exactly as the
+per-seat DOB comparison it replaced did.
+"""
+from app import db
+from app.models import Admin, TeacherBlock
+from app.utils.claim_credentials import compute_primary_claim_hash
+from app.utils.name_utils import hash_last_name_parts
+from hash_utils import get_random_salt
+
+JOIN_CODE = "DOBPF1"
+LAST_NAME = "Hayslett"
+# 2010-03-04 -> 3 + 4 + 2010
+DOB = "2010-03-04"
+DOB_SUM = 2017
+
+
+def _add_seat(dob_sum):
+    teacher = Admin(username=f"dob-prefilter-{dob_sum}", totp_secret="SECRET")
+    db.session.add(teacher)
+    db.session.flush()
+    salt = get_random_salt()
+    seat = TeacherBlock(
+        teacher_id=teacher.id,
+        block="A",
+        first_name="Benjamin",
+        last_initial="H",
+        last_name_hash_by_part=hash_last_name_parts(LAST_NAME, salt),
+        dob_sum=dob_sum,
+        salt=salt,
+        first_half_hash=compute_primary_claim_hash("B", dob_sum, salt),
+        join_code=JOIN_CODE,
+        is_claimed=False,
+    )
+    db.session.add(seat)
+    db.session.commit()
+    return seat
+
+
+def _claim(client, dob):
+    return client.post("/student/claim-account", data={
+        "join_code": JOIN_CODE,
+        "first_initial": "B",
+        "last_name": LAST_NAME,
+        "dob": dob,
+    })
+
+
+def test_claim_matches_seat_with_same_dob_sum(client):
+    seat = _add_seat(DOB_SUM)
+
+    response = _claim(client, DOB)
+
+    assert response.status_code == 302
+    assert "/student/create-username" in response.location
+    assert db.session.get(TeacherBlock, seat.id).is_claimed is True
+
+
+def test_claim_rejects_seat_with_different_dob_sum(client):
+    seat = _add_seat(DOB_SUM)
+
+    # 2010-03-05 sums to 2018
+    response = _claim(client, "2010-03-05")
+
+    assert response.status_code == 302
+    assert response.location.endswith("/student/claim-account")
+    assert db.session.get(TeacherBlock, seat.id).is_claimed is False
+
+
+def test_claim_rejects_legacy_seat_with_zero_dob_sum(client):
+    # A legacy seat whose hash was built from a missing (zero) DOB must not
+    # accept whatever DOB is entered; it stays unclaimed until the teacher fixes it
+    seat = _add_seat(0)
+
+    response = _claim(client, DOB)
+
+    assert response.status_code == 302
+    assert response.location.endswith("/student/claim-account")
+    assert db.session.get(TeacherBlock, seat.id).is_claimed is False
@@ -56,6 +56,8 @@ def test_deletion_request_type_from_string():
     with pytest.raises(ValueError) as exc_info:
         DeletionRequestType.from_string('invalid_value')
     assert "Invalid DeletionRequestType" in str(exc_info.value)
+    with pytest.raises(ValueError):
+        DeletionRequestType.from_string(['period'])
     
     # Should handle enum values passed in
     assert DeletionRequestType.from_string(DeletionRequestType.PERIOD) == DeletionRequestType.PERIOD
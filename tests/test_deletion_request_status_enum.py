@@ -109,3 +109,29 @@ def test_deletion_request_status_enum_comparison():
     assert DeletionRequestStatus.PENDING.value != 'PENDING'
     assert DeletionRequestStatus.APPROVED.value != 'APPROVED'
     assert DeletionRequestStatus.REJECTED.value != 'REJECTED'
+
+
+def test_deletion_request_columns_store_plain_strings():
+    """Type and status are VARCHAR columns guarded by CHECK constraints."""
+    from sqlalchemy.exc import IntegrityError
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+        admin = Admin(username='check_admin', totp_secret=pyotp.random_base32())
+        db.session.add(admin)
+        db.session.commit()
+
+        db.session.add(DeletionRequest(admin_id=admin.id, request_type=DeletionRequestType.PERIOD, period='A'))
+        db.session.commit()
+
+        raw = db.session.execute(db.text("SELECT request_type, status FROM deletion_requests")).one()
+        assert tuple(raw) == ('period', 'pending')
+
+        with pytest.raises(IntegrityError):
+            db.session.execute(db.text(
+                "INSERT INTO deletion_requests (admin_id, request_type, status, requested_at) "
+                "VALUES (:admin_id, 'PERIOD', 'pending', CURRENT_TIMESTAMP)"
+            ), {'admin_id': admin.id})
+        db.session.rollback()
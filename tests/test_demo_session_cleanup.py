@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+
+from app import db
+from app.models import Admin, DemoStudent, Student, StudentBalance, StudentTeacher, Transaction
+from app.scheduled_tasks import cleanup_expired_demo_sessions_job
+from hash_utils import get_random_salt, hash_username
+
+
+def _create_demo_session(admin: Admin, name: str, expires_at: datetime) -> DemoStudent:
+    salt = get_random_salt()
+    student = Student(
+        first_name=name,
+        last_initial="D",
+        block="A",
+        salt=salt,
+        username_hash=hash_username(name.lower(), salt),
+        pin_hash="pin",
+        teacher_id=admin.id,
+    )
+    db.session.add(student)
+    db.session.flush()
+    db.session.add(StudentTeacher(student_id=student.id, admin_id=admin.id))
+    db.session.add(Transaction(student_id=student.id, amount=50.0, account_type='checking', description='Demo'))
+    demo_session = DemoStudent(
+        admin_id=admin.id,
+        student_id=student.id,
+        session_id=f"demo-{name}",
+        expires_at=expires_at,
+    )
+    db.session.add(demo_session)
+    db.session.commit()
+    return demo_session
+
+
+def test_cleanup_job_removes_expired_sessions_in_one_pass(client, capture_sql):
+    admin = Admin(username="demo-teacher", totp_secret="SECRET")
+    db.session.add(admin)
+    db.session.commit()
+    now = datetime.now(timezone.utc)
+    expired = [_create_demo_session(admin, f"Expired{i}", now - timedelta(minutes=1)) for i in range(3)]
+    live = _create_demo_session(admin, "Live", now + timedelta(minutes=5))
+    expired_student_ids = [demo_session.student_id for demo_session in expired]
+    live_student_id = live.student_id
+
+    with capture_sql() as statements:
+        cleanup_expired_demo_sessions_job()
+
+    assert [row.session_id for row in DemoStudent.query.all()] == ["demo-Live"]
+    assert Student.query.filter(Student.id.in_(expired_student_ids)).count() == 0
+    assert Transaction.query.filter(Transaction.student_id.in_(expired_student_ids)).count() == 0
+    assert Transaction.query.filter_by(student_id=live_student_id).count() == 1
+    assert StudentBalance.query.filter(StudentBalance.student_id.in_(expired_student_ids)).count() == 0
+    assert StudentBalance.query.filter_by(student_id=live_student_id).count() == 1
+    # One DELETE per table regardless of how many sessions expired
+    assert sum(1 for sql in statements if sql.startswith('DELETE FROM "transaction"')) == 1
+    # Roll-up rows are deleted explicitly rather than left to the students FK cascade
+    assert sum(1 for sql in statements if sql.startswith('DELETE FROM student_balances')) == 1
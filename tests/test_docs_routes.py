@@ -0,0 +1,161 @@
+import os
+
+import pytest
+
+from app.routes import docs
+
+
+@pytest.fixture
+def docs_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(docs, "DOCS_ROOT", tmp_path)
+    docs.render_doc_file.cache_clear()
+    docs.load_search_entry.cache_clear()
+    yield tmp_path
+    docs.render_doc_file.cache_clear()
+    docs.load_search_entry.cache_clear()
+
+
+def _write_doc(path, title, body):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"---\ntitle: {title}\n---\n{body}\n", encoding="utf-8")
+
+
+def test_view_doc_renders_once_per_file_version(client, docs_root, monkeypatch):
+    doc_file = docs_root / "features" / "store.md"
+    _write_doc(doc_file, "Store Guide", "## Buying\n\nSpend tokens.")
+
+    renders = []
+    original = docs.render_markdown_content
+    monkeypatch.setattr(
+        docs, "render_markdown_content",
+        lambda *args, **kwargs: renders.append(args) or original(*args, **kwargs),
+    )
+
+    first = client.get("/docs/features/store")
+    second = client.get("/docs/features/store")
+
+    assert first.status_code == second.status_code == 200
+    assert b"Spend tokens." in second.data
+    assert len(renders) == 1
+
+    _write_doc(doc_file, "Store Guide", "## Buying\n\nSpend tokens wisely.")
+    stat = doc_file.stat()
+    os.utime(doc_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    third = client.get("/docs/features/store")
+
+    assert b"Spend tokens wisely." in third.data
+    assert len(renders) == 2
+
+
+def test_view_doc_missing_file_returns_404(client, docs_root):
+    assert client.get("/docs/features/missing").status_code == 404
+
+
+def test_search_ranks_results_and_parses_each_file_once(client, docs_root):
+    _write_doc(docs_root / "features" / "rent.md", "Rent", "Pay rent every week.")
+    _write_doc(docs_root / "user-guides" / "store.md", "Store", "You can also pay rent here.")
+    _write_doc(docs_root / "security" / "rent-audit.md", "Rent Audit", "Internal rent notes.")
+    (docs_root / "features" / "hidden.md").write_text(
+        "---\ntitle: Hidden Rent\nsearchable: false\n---\nrent\n", encoding="utf-8"
+    )
+
+    first = client.get("/docs/search?q=rent")
+    misses = docs.load_search_entry.cache_info().misses
+    second = client.get("/docs/search?q=rent")
+
+    html = second.data.decode()
+    assert first.status_code == second.status_code == 200
+    assert html.index("/docs/features/rent") < html.index("/docs/user-guides/store")
+    assert "rent-audit" not in html
+    assert "Hidden Rent" not in html
+    assert misses == 3
+    assert docs.load_search_entry.cache_info().misses == misses
+
+
+def test_render_markdown_content_reuses_converter_without_leaking_state():
+    first_html, first_toc = docs.render_markdown_content("## Setup\n\n<script>x</script>", toc_title="First")
+    second_html, second_toc = docs.render_markdown_content("## Setup\n\nAgain", toc_title="Second")
+
+    assert 'id="setup"' in first_html and 'id="setup"' in second_html
+    assert "<script>" not in first_html
+    assert "First" in first_toc and "First" not in second_toc
+    assert "Second" in second_toc
+
+
+def test_search_context_uses_matching_line_or_first_paragraph(client, docs_root):
+    _write_doc(docs_root / "features" / "banking.md", "Banking", "# Banking\n\nIntro line.\nSavings earn INTEREST monthly.")
+    _write_doc(docs_root / "features" / "interest.md", "Interest", "# Heading\n\nFirst paragraph here.")
+
+    html = client.get("/docs/search?q=interest").data.decode()
+
+    assert "Savings earn INTEREST monthly." in html
+    assert "First paragraph here." in html
+
+
+def test_view_doc_breadcrumbs_use_prettified_segments(client, docs_root):
+    _write_doc(docs_root / "user-guides" / "rent_basics.md", "Rent", "Pay rent.")
+
+    html = client.get("/docs/user-guides/rent_basics").data.decode()
+
+    assert "User Guides" in html
+    assert "Rent Basics" in html
+    assert docs._prettify("user-guides") == "User Guides"
+
+
+def test_iter_md_files_prunes_hidden_and_excluded_directories(tmp_path):
+    for rel in ["guide.md", "features/deep/rent.md", "security/notes.md", "features/.draft.md", ".cache/old.md", "features/readme.txt"]:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("x", encoding="utf-8")
+
+    found = sorted(
+        os.path.relpath(entry.path, tmp_path)
+        for entry in docs._iter_md_files(tmp_path, docs.EXCLUDED_DIRECTORIES)
+    )
+
+    assert found == ["features/deep/rent.md", "guide.md"]
+    assert list(docs._iter_md_files(tmp_path / "missing")) == []
+
+
+def test_related_article_urls_are_memoized_per_script_root(client, docs_root):
+    docs._cached_doc_url.cache_clear()
+    (docs_root / "features").mkdir()
+    (docs_root / "features" / "store.md").write_text(
+        "---\ntitle: Store\nrelated:\n  - /features/rent\n---\nBuy things.\n", encoding="utf-8"
+    )
+
+    client.get("/docs/features/store")
+    misses = docs._cached_doc_url.cache_info().misses
+    html = client.get("/docs/features/store").data.decode()
+
+    assert 'href="/docs/features/rent"' in html
+    assert docs._cached_doc_url.cache_info().misses == misses
+
+    mounted = client.get("/docs/features/store", environ_overrides={"SCRIPT_NAME": "/app"}).data.decode()
+    assert 'href="/app/docs/features/rent"' in mounted
+
+
+def test_view_doc_revalidates_with_etag(client, docs_root):
+    doc_file = docs_root / "features" / "store.md"
+    _write_doc(doc_file, "Store Guide", "Spend tokens.")
+
+    first = client.get("/docs/features/store")
+    etag = first.headers["ETag"]
+    repeat = client.get("/docs/features/store", headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"] == "private, no-cache"
+    assert repeat.status_code == 304
+    assert repeat.data == b""
+
+    _write_doc(doc_file, "Store Guide", "Spend tokens wisely.")
+    stat = doc_file.stat()
+    os.utime(doc_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    changed = client.get("/docs/features/store", headers={"If-None-Match": etag})
+
+    assert changed.status_code == 200
+    assert b"Spend tokens wisely." in changed.data
+
+    with client.session_transaction() as sess:
+        sess["student_id"] = 1
+    assert client.get("/docs/features/store", headers={"If-None-Match": changed.headers["ETag"]}).status_code == 200
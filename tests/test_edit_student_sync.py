@@ -0,0 +1,121 @@
+"""
+Tests for the derived data kept in sync when a teacher edits a student.
+
+The edit form moves transactions and seat details with bulk UPDATEs, which
+skip ORM listeners; the route must refresh what those listeners maintain.
+"""
+import os
+from datetime import datetime, timezone
+
+import pyotp
+
+from app import db
+from app.models import (
+    Admin, Student, StudentBalance, StudentTeacher, TeacherBlock, Transaction, first_name_filter,
+)
+from hash_utils import get_random_salt, hash_first_name_lookup, hash_username
+
+
+def _setup_teacher_and_student(client):
+    teacher = Admin(username="edit-sync-teacher", totp_secret=pyotp.random_base32())
+    db.session.add(teacher)
+    db.session.flush()
+
+    salt = get_random_salt()
+    student = Student(
+        first_name="Alice",
+        last_initial="S",
+        block="A",
+        salt=salt,
+        username_hash=hash_username("alice", salt),
+        pin_hash="pin",
+        teacher_id=teacher.id,
+        dob_sum=2025,
+        last_name_hash_by_part=["hash"],
+        first_half_hash=hash_username("alice-fhash", salt),
+    )
+    db.session.add(student)
+    db.session.flush()
+    db.session.add(StudentTeacher(student_id=student.id, admin_id=teacher.id))
+    db.session.commit()
+
+    with client.session_transaction() as sess:
+        sess["is_admin"] = True
+        sess["admin_id"] = teacher.id
+        sess["is_system_admin"] = False
+        sess["last_activity"] = datetime.now(timezone.utc).isoformat()
+    return teacher, student
+
+
+def _add_seat(teacher, block, join_code, student=None):
+    seat = TeacherBlock(
+        teacher_id=teacher.id,
+        block=block,
+        first_name="Alice",
+        last_initial="S",
+        last_name_hash_by_part=["hash"],
+        dob_sum=2025,
+        salt=os.urandom(16),
+        first_half_hash="hash",
+        join_code=join_code,
+        student_id=student.id if student else None,
+        is_claimed=student is not None,
+    )
+    db.session.add(seat)
+    return seat
+
+
+def test_block_transfer_moves_balance_rollups(client):
+    teacher, student = _setup_teacher_and_student(client)
+    _add_seat(teacher, "A", "OLDA", student)
+    _add_seat(teacher, "B", "NEWB")
+    for amount, account_type in ((40.0, "checking"), (10.0, "savings")):
+        db.session.add(Transaction(
+            student_id=student.id, teacher_id=teacher.id, join_code="OLDA",
+            amount=amount, account_type=account_type, description="Payroll",
+        ))
+    db.session.commit()
+
+    response = client.post("/admin/student/edit", data={
+        "student_id": student.id,
+        "first_name": "Alice",
+        "last_name": "Smith",
+        "blocks": ["B"],
+        "balance_action_B": "transfer",
+    })
+    assert response.status_code == 302
+
+    rollups = {
+        (row.join_code, row.account_type): row.balance
+        for row in StudentBalance.query.filter_by(student_id=student.id)
+        if row.balance
+    }
+    assert rollups == {("NEWB", "checking"): 40.0, ("NEWB", "savings"): 10.0}
+    assert student.get_checking_balance(join_code="NEWB") == 40.0
+    assert student.get_savings_balance(join_code="NEWB") == 10.0
+    assert student.get_checking_balance(join_code="OLDA") == 0.0
+
+
+def test_rename_keeps_seat_claimable_under_new_name(client):
+    teacher, student = _setup_teacher_and_student(client)
+    seat = _add_seat(teacher, "A", "OLDA", student)
+    db.session.commit()
+
+    response = client.post("/admin/student/edit", data={
+        "student_id": student.id,
+        "first_name": "Alicia",
+        "last_name": "Smith",
+        "blocks": ["A"],
+        "reset_login": "on",
+    })
+    assert response.status_code == 302
+
+    db.session.refresh(seat)
+    assert seat.first_name == "Alicia"
+    assert seat.first_name_search_hash == hash_first_name_lookup("Alicia")
+
+    # Same narrowing the add-class claim runs before its per-seat hash checks
+    candidates = TeacherBlock.query.filter_by(
+        join_code="OLDA", is_claimed=False, dob_sum=2025, last_initial="S",
+    ).filter(first_name_filter(TeacherBlock, "Alicia")).all()
+    assert candidates == [seat]
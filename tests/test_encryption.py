@@ -0,0 +1,45 @@
+"""
+Tests for PII encryption helpers.
+"""
+from sqlalchemy.sql.cache_key import NO_CACHE
+
+from app import db
+from app.models import Student, first_name_filter
+from app.utils.encryption import PIIEncryptedType, decrypt_totp, encrypt_totp
+
+
+def test_encrypted_columns_support_statement_caching():
+    # Without cache_ok every query touching an encrypted column is recompiled
+    cache_key = Student.__table__.c.first_name.type._static_cache_key
+    assert cache_key is not NO_CACHE
+
+
+def test_encrypted_types_share_cipher_instance():
+    first = PIIEncryptedType(key_env_var='ENCRYPTION_KEY')
+    second = PIIEncryptedType(key_env_var='ENCRYPTION_KEY')
+    assert first.fernet is second.fernet
+
+    token = first.process_bind_param('Ada', None)
+    assert second.process_result_value(token, None) == 'Ada'
+
+
+def test_encrypted_first_name_round_trips(client, test_student):
+    student = Student.query.filter_by(id=test_student.id).one()
+    assert student.first_name == 'Test'
+    assert decrypt_totp(encrypt_totp('JBSWY3DPEHPK3PXQ')) == 'JBSWY3DPEHPK3PXQ'
+
+
+def test_first_name_search_hash_narrows_lookup(client, test_student):
+    assert test_student.first_name_search_hash is not None
+
+    match = Student.query.filter(first_name_filter(Student, '  test ')).all()
+    assert [s.id for s in match] == [test_student.id]
+    assert Student.query.filter(first_name_filter(Student, 'Other')).all() == []
+
+    test_student.first_name = 'Renamed'
+    db.session.commit()
+    assert Student.query.filter(first_name_filter(Student, 'renamed')).count() == 1
+
+    # Rows written before the hash existed stay candidates for the Python comparison
+    db.session.execute(db.text("UPDATE students SET first_name_search_hash = NULL"))
+    assert Student.query.filter(first_name_filter(Student, 'Other')).count() == 1
@@ -4,6 +4,7 @@ Tests for feature settings and teacher onboarding functionality.
 import os
 import pytest
 import pyotp
+from sqlalchemy import inspect
 from app import app, db
 from app.models import Admin, FeatureSettings, TeacherOnboarding, TeacherBlock
 
@@ -106,6 +107,33 @@ class TestFeatureSettings:
         assert settings_a.payroll_enabled is True
         assert settings_b.payroll_enabled is False
 
+    def test_resolve_cascades_block_global_defaults(self, client, test_admin):
+        """Test that resolve prefers block settings, then global, then defaults."""
+        assert FeatureSettings.resolve(test_admin.id, 'A') == FeatureSettings.get_defaults()
+
+        db.session.add(FeatureSettings(teacher_id=test_admin.id, block=None, store_enabled=False))
+        db.session.add(FeatureSettings(teacher_id=test_admin.id, block='A', rent_enabled=False))
+        db.session.commit()
+
+        assert FeatureSettings.resolve(test_admin.id, 'A')['rent_enabled'] is False
+        assert FeatureSettings.resolve(test_admin.id, 'A')['store_enabled'] is True
+        assert FeatureSettings.resolve(test_admin.id, 'B')['store_enabled'] is False
+        assert FeatureSettings.resolve(test_admin.id)['rent_enabled'] is True
+
+    def test_for_blocks_loads_existing_and_creates_missing(self, client, test_admin):
+        """Test that for_blocks returns existing rows and adds missing ones."""
+        existing = FeatureSettings(teacher_id=test_admin.id, block='A', store_enabled=False)
+        db.session.add(existing)
+        db.session.commit()
+
+        assert FeatureSettings.for_blocks(test_admin.id, ['A', 'B']) == {'A': existing}
+
+        rows = FeatureSettings.for_blocks(test_admin.id, ['A', 'B', 'B'], create=True)
+        db.session.commit()
+
+        assert rows['A'] is existing
+        assert sorted(row.block for row in FeatureSettings.query.filter_by(teacher_id=test_admin.id)) == ['A', 'B']
+
     def test_unique_constraint_teacher_block(self, client, test_admin):
         """Test that duplicate teacher-block combinations are prevented."""
         settings1 = FeatureSettings(teacher_id=test_admin.id, block='A')
@@ -151,6 +179,19 @@ class TestTeacherOnboarding:
         assert onboarding.is_step_completed('features') is True
         assert onboarding.is_step_completed('periods') is False
 
+    def test_mark_steps_completed_batches_and_skips_unchanged(self, client, test_admin):
+        """Test marking several steps at once and re-marking without changes."""
+        onboarding = TeacherOnboarding(teacher_id=test_admin.id)
+        db.session.add(onboarding)
+        db.session.commit()
+
+        onboarding.mark_steps_completed(['welcome', 'roster', 'features'])
+        db.session.commit()
+        assert all(onboarding.is_step_completed(step) for step in ('welcome', 'roster', 'features'))
+
+        onboarding.mark_steps_completed(['welcome', 'roster'])
+        assert not inspect(onboarding).attrs.steps_completed.history.has_changes()
+
     def test_complete_onboarding(self, client, test_admin):
         """Test completing onboarding."""
         onboarding = TeacherOnboarding(teacher_id=test_admin.id)
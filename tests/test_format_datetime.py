@@ -0,0 +1,19 @@
+from datetime import date, datetime, timezone
+
+from flask import session
+
+from app import format_datetime
+
+
+def test_format_datetime_converts_naive_utc_to_session_timezone(app):
+    with app.test_request_context():
+        session['timezone'] = 'America/New_York'
+        assert format_datetime(datetime(2025, 1, 15, 17, 30)) == '2025-01-15 12:30 PM'
+        assert format_datetime(datetime(2025, 7, 15, 17, 30, tzinfo=timezone.utc), '%H:%M') == '13:30'
+
+
+def test_format_datetime_falls_back_to_pacific_for_unknown_timezone(app):
+    with app.test_request_context():
+        session['timezone'] = 'Not/AZone'
+        assert format_datetime(date(2025, 1, 15), '%Y-%m-%d %H:%M') == '2025-01-14 16:00'
+        assert format_datetime(None) == ''
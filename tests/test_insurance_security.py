@@ -134,3 +134,82 @@ def test_voided_transaction_cannot_be_approved(client, test_student, admin_user)
     db.session.refresh(claim)
     assert claim.status == "pending"
     assert b"voided" in response.data
+
+
+def test_bulk_active_insurance_matches_per_student_lookup(client, test_student, admin_user):
+    from app.models import Student
+
+    policy = _create_policy(admin_user.id)
+    other_teacher = Admin(username="teacher-other", totp_secret="totp-secret")
+    db.session.add(other_teacher)
+    db.session.commit()
+    other_policy = InsurancePolicy(
+        policy_code="POLICY-002",
+        teacher_id=other_teacher.id,
+        title="Other Coverage",
+        premium=5.0,
+    )
+    db.session.add(other_policy)
+    db.session.commit()
+
+    enrollment = _enroll_student(test_student.id, policy.id)
+    _enroll_student(test_student.id, other_policy.id)
+
+    active = Student.bulk_active_insurance([test_student.id, 9999], admin_user.id)
+
+    assert active == {test_student.id: enrollment}
+    assert test_student.get_active_insurance(admin_user.id) == enrollment
+    assert 'policy' in active[test_student.id].__dict__  # Loaded with the same query
+    assert Student.bulk_active_insurance([], admin_user.id) == {}
+
+
+def test_set_blocks_writes_only_the_difference(client, admin_user, capture_sql):
+    policy = _create_policy(admin_user.id)
+    policy.set_blocks(['a', 'B'])
+    db.session.commit()
+    assert sorted(policy.blocks_list) == ['A', 'B']
+
+    with capture_sql() as statements:
+        policy.set_blocks(['B', 'c'])
+    db.session.commit()
+
+    assert sorted(policy.blocks_list) == ['B', 'C']
+    writes = [sql for sql in statements if sql.lstrip().upper().startswith(('INSERT', 'DELETE'))]
+    assert len(writes) == 2
+    # Additions tolerate a row a concurrent writer already inserted
+    assert any('ON CONFLICT' in sql.upper() for sql in writes)
+
+
+def test_visible_to_block_matches_blocks_list(client, admin_user):
+    everyone = _create_policy(admin_user.id)
+    limited = InsurancePolicy(
+        policy_code="POLICY-002", teacher_id=admin_user.id, title="Block B only",
+        description="", premium=5.0,
+    )
+    db.session.add(limited)
+    db.session.flush()
+    limited.set_blocks(['B'])
+    db.session.commit()
+
+    def visible(block):
+        return {
+            p.id for p in InsurancePolicy.query.filter(
+                InsurancePolicy.teacher_id == admin_user.id,
+                InsurancePolicy.visible_to_block(block),
+            )
+        }
+
+    assert visible('a') == {everyone.id}
+    assert visible('b') == {everyone.id, limited.id}
+
+
+def test_block_rows_are_normalized_on_assignment(client, admin_user):
+    from app.models import InsurancePolicyBlock
+
+    policy = _create_policy(admin_user.id)
+    policy.visible_blocks.append(InsurancePolicyBlock(block=' b '))
+    policy.visible_blocks.append(InsurancePolicyBlock(block='c '))
+    db.session.commit()
+
+    assert sorted(policy.blocks_list) == ['B', 'C']
+    assert InsurancePolicy.query.filter(InsurancePolicy.visible_to_block(' b')).all() == [policy]
@@ -0,0 +1,83 @@
+from datetime import datetime, timezone
+
+import pyotp
+
+from app import db
+from app.models import (
+    Admin, Issue, IssueCategory, IssueResolutionAction, IssueStatusHistory, StudentTeacher,
+)
+
+
+def _create_issue(student, teacher):
+    category = IssueCategory(name="Missing payroll", category_type="transaction")
+    db.session.add(category)
+    db.session.flush()
+    issue = Issue(
+        student_id=student.id,
+        student_first_name="Test",
+        student_last_initial="S",
+        opaque_student_reference="ref",
+        teacher_id=teacher.id,
+        join_code="ISSUE1",
+        category_id=category.id,
+        issue_type="general",
+        student_explanation="My payroll did not arrive.",
+        status="teacher_review",
+    )
+    db.session.add(issue)
+    db.session.flush()
+    db.session.add_all([
+        IssueStatusHistory(issue_id=issue.id, new_status="submitted", changed_by_type="student"),
+        IssueStatusHistory(issue_id=issue.id, new_status="teacher_review", changed_by_type="teacher"),
+        IssueResolutionAction(
+            issue_id=issue.id, action_type="note_added", performed_by_type="teacher", performed_by_id=teacher.id,
+        ),
+    ])
+    db.session.commit()
+    return issue
+
+
+def test_detail_query_loads_related_rows_up_front(client, test_student, capture_sql):
+    teacher = Admin(username="issue-teacher", totp_secret="SECRET")
+    db.session.add(teacher)
+    db.session.commit()
+    issue_id = _create_issue(test_student, teacher).id
+    db.session.expire_all()
+
+    issue = Issue.detail_query().filter_by(id=issue_id).one()
+
+    with capture_sql() as statements:
+        loaded = (
+            issue.category.name,
+            issue.teacher.username,
+            [entry.new_status for entry in issue.status_history],
+            [action.action_type for action in issue.resolution_actions],
+        )
+
+    assert loaded[:2] == ("Missing payroll", "issue-teacher")
+    assert sorted(loaded[2]) == ["submitted", "teacher_review"]
+    assert loaded[3] == ["note_added"]
+    assert statements == []
+
+
+def test_teacher_issue_detail_page_renders(client, test_student):
+    secret = pyotp.random_base32()
+    teacher = Admin(username="issue-viewer", totp_secret=secret)
+    db.session.add(teacher)
+    db.session.commit()
+    db.session.add(StudentTeacher(student_id=test_student.id, admin_id=teacher.id))
+    issue = _create_issue(test_student, teacher)
+
+    client.post(
+        "/admin/login",
+        data={"username": teacher.username, "totp_code": pyotp.TOTP(secret).now()},
+    )
+    with client.session_transaction() as sess:
+        sess.setdefault("is_admin", True)
+        sess.setdefault("admin_id", teacher.id)
+        sess["last_activity"] = datetime.now(timezone.utc).isoformat()
+
+    response = client.get(f"/admin/issues/{issue.id}")
+
+    assert response.status_code == 200
+    assert b"Missing payroll" in response.data
@@ -11,7 +11,7 @@ import pyotp
 from datetime import datetime, timezone
 
 from app import db
-from app.models import Admin, Student, StudentTeacher, TeacherBlock, Transaction
+from app.models import Admin, Student, StudentBalance, StudentTeacher, TeacherBlock, Transaction
 from hash_utils import get_random_salt, hash_hmac
 
 
@@ -312,6 +312,7 @@ def test_block_deletion_with_improved_transactions(client):
     
     # Verify transactions are deleted
     assert Transaction.query.filter_by(student_id=student1.id).first() is None
+    assert StudentBalance.query.filter_by(student_id=student1.id).first() is None
 
 
 def test_bulk_delete_legacy_unclaimed_no_block_provided(client):
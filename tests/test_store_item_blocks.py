@@ -0,0 +1,57 @@
+"""
+Tests for store item block visibility.
+
+``visible_blocks`` is batch-loaded, so ``set_blocks`` must keep the loaded
+collection in sync.
+"""
+import json
+
+from app import db
+from app.models import Admin, StoreItem, StoreItemBlock
+
+
+def _make_item(teacher, name):
+    item = StoreItem(teacher_id=teacher.id, name=name, price=5.0)
+    db.session.add(item)
+    db.session.flush()
+    return item
+
+
+def test_set_blocks_replaces_loaded_collection(client):
+    teacher = Admin(username='store-teacher', totp_secret='SECRET')
+    db.session.add(teacher)
+    db.session.flush()
+    item = _make_item(teacher, 'Pencil')
+
+    item.set_blocks(['a ', 'B'])
+    db.session.commit()
+    assert sorted(item.blocks_list) == ['A', 'B']
+
+    item.set_blocks(['b', 'C', 'c'])
+    db.session.commit()
+    assert sorted(item.blocks_list) == ['B', 'C']
+    stored = {row.block for row in StoreItemBlock.query.filter_by(store_item_id=item.id)}
+    assert stored == {'B', 'C'}
+
+    item.set_blocks([])
+    db.session.commit()
+    assert item.blocks_list == []
+    assert StoreItemBlock.query.filter_by(store_item_id=item.id).count() == 0
+
+
+def test_blocks_list_is_a_detached_plain_list(client):
+    teacher = Admin(username='store-teacher-list', totp_secret='SECRET')
+    db.session.add(teacher)
+    db.session.flush()
+    item = _make_item(teacher, 'Marker')
+    item.set_blocks(['A'])
+    db.session.commit()
+
+    blocks = item.blocks_list
+    assert type(blocks) is list
+    assert json.dumps(blocks) == '["A"]'
+
+    # Writes go through set_blocks; mutating the returned list changes nothing
+    blocks.append('B')
+    db.session.commit()
+    assert item.blocks_list == ['A']
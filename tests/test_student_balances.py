@@ -0,0 +1,272 @@
+"""
+Tests for Student balance aggregation.
+
+Balances are summed in the database, so these tests cover the scoping rules
+(join_code isolation, legacy NULL join_code rows, voided transactions and
+transfer exclusion) that the SQL filters must preserve.
+"""
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import selectinload
+
+from app import db
+from app.models import Admin, Student, StudentBalance, Transaction
+
+
+def _add_tx(student, amount, **kwargs):
+    tx = Transaction(student_id=student.id, amount=amount, **kwargs)
+    db.session.add(tx)
+    return tx
+
+
+def test_checking_and_savings_balances_exclude_void(client, test_student):
+    _add_tx(test_student, 100.0, account_type='checking', description='Payroll')
+    _add_tx(test_student, -25.5, account_type='checking', description='Store purchase')
+    _add_tx(test_student, 40.0, account_type='checking', description='Voided', is_void=True)
+    _add_tx(test_student, 60.0, account_type='savings', description='Deposit')
+    db.session.commit()
+
+    assert test_student.checking_balance == 74.5
+    assert test_student.savings_balance == 60.0
+    assert test_student.get_checking_balance() == 74.5
+
+
+def test_balances_with_no_transactions_are_zero(client, test_student):
+    assert test_student.checking_balance == 0.0
+    assert test_student.get_savings_balance(join_code='NOPE') == 0.0
+    assert test_student.get_total_earnings(join_code='NOPE') == 0.0
+
+
+def test_scoped_balance_isolated_by_join_code(client, test_student):
+    teacher = Admin(username='balance-teacher', totp_secret='SECRET')
+    db.session.add(teacher)
+    db.session.flush()
+
+    _add_tx(test_student, 10.0, account_type='checking', join_code='CLASSA', teacher_id=teacher.id)
+    _add_tx(test_student, 20.0, account_type='checking', join_code='CLASSB', teacher_id=teacher.id)
+    # Legacy row without a join_code is attributed via teacher_id
+    _add_tx(test_student, 5.0, account_type='checking', join_code=None, teacher_id=teacher.id)
+    db.session.commit()
+
+    assert test_student.get_checking_balance(join_code='CLASSA') == 10.0
+    assert test_student.get_checking_balance(teacher_id=teacher.id, join_code='CLASSA') == 15.0
+    assert test_student.get_checking_balance(teacher_id=teacher.id) == 35.0
+
+
+def test_total_earnings_excludes_transfers_and_debits(client, test_student):
+    _add_tx(test_student, 50.0, account_type='checking', join_code='CLASSA', description='Payroll')
+    _add_tx(test_student, 30.0, account_type='savings', join_code='CLASSA', description='Transfer from checking', is_transfer=True)
+    _add_tx(test_student, -10.0, account_type='checking', join_code='CLASSA', description='Fine')
+    _add_tx(test_student, 7.0, account_type='checking', join_code='CLASSA', description=None)
+    _add_tx(test_student, 99.0, account_type='checking', join_code='CLASSB', description='Bonus')
+    db.session.commit()
+
+    assert test_student.get_total_earnings(join_code='CLASSA') == 57.0
+    assert test_student.total_earnings == 156.0
+
+
+def test_balance_reflects_pending_transactions(client, test_student):
+    _add_tx(test_student, 12.34, account_type='checking', description='Payroll')
+    # Not committed: autoflush must include the pending row in the SUM
+    assert test_student.checking_balance == 12.34
+
+
+def _rollup_rows(student):
+    # Zero rows are harmless and only the rebuild materializes void-only groups
+    return {
+        (row.join_code, row.account_type): (row.balance, row.earnings)
+        for row in StudentBalance.query.filter_by(student_id=student.id)
+        if row.balance or row.earnings
+    }
+
+
+def test_voiding_committed_transaction_updates_rollup(client, test_student):
+    tx = _add_tx(test_student, 80.0, account_type='checking', join_code='CLASSA', description='Payroll')
+    db.session.commit()
+    assert test_student.get_checking_balance(join_code='CLASSA') == 80.0
+
+    # Attributes are expired after commit; the listener must read the stored row
+    tx.is_void = True
+    db.session.commit()
+
+    assert test_student.get_checking_balance(join_code='CLASSA') == 0.0
+    assert test_student.get_total_earnings(join_code='CLASSA') == 0.0
+
+
+def test_moving_and_deleting_transactions_updates_rollup(client, test_student):
+    tx = _add_tx(test_student, 25.0, account_type='checking', join_code='CLASSA', description='Bonus')
+    other = _add_tx(test_student, 5.0, account_type='checking', join_code='CLASSA', description='Bonus')
+    db.session.commit()
+
+    tx.account_type = 'savings'
+    tx.amount = 30.0
+    db.session.commit()
+    assert test_student.get_checking_balance(join_code='CLASSA') == 5.0
+    assert test_student.get_savings_balance(join_code='CLASSA') == 30.0
+
+    db.session.delete(other)
+    db.session.commit()
+    assert test_student.get_checking_balance(join_code='CLASSA') == 0.0
+    assert test_student.get_total_earnings(join_code='CLASSA') == 30.0
+
+
+def test_rebuild_matches_incremental_rollup(client, test_student):
+    _add_tx(test_student, 50.0, account_type='checking', join_code='CLASSA', description='Payroll')
+    _add_tx(test_student, -20.0, account_type='checking', join_code='CLASSA', description='Transfer to savings', is_transfer=True)
+    _add_tx(test_student, 20.0, account_type='savings', join_code='CLASSA', description='Transfer from checking', is_transfer=True)
+    _add_tx(test_student, 9.0, account_type='checking', description='Legacy', is_void=True)
+    db.session.commit()
+    incremental = _rollup_rows(test_student)
+
+    StudentBalance.rebuild(student_ids=[test_student.id])
+    db.session.commit()
+
+    assert _rollup_rows(test_student) == incremental
+    assert incremental[('CLASSA', 'checking')] == (30.0, 50.0)
+    assert incremental[('CLASSA', 'savings')] == (20.0, 0.0)
+
+
+def test_eager_loaded_balances_issue_no_per_student_queries(client, test_student, capture_sql):
+    teacher = Admin(username='eager-teacher', totp_secret='SECRET')
+    db.session.add(teacher)
+    db.session.flush()
+    _add_tx(test_student, 40.0, account_type='checking', join_code='CLASSA', description='Payroll')
+    _add_tx(test_student, 15.0, account_type='savings', join_code='CLASSA', description='Deposit')
+    _add_tx(test_student, 3.0, account_type='checking', teacher_id=teacher.id, description='Legacy')
+    db.session.commit()
+    teacher_id = teacher.id
+    expected = (
+        test_student.checking_balance,
+        test_student.get_checking_balance(teacher_id=teacher_id, join_code='CLASSA'),
+        test_student.get_savings_balance(join_code='CLASSA'),
+        test_student.total_earnings,
+    )
+    db.session.expire_all()
+
+    student = (
+        Student.query.options(selectinload(Student.balances))
+        .filter_by(id=test_student.id)
+        .one()
+    )
+    with capture_sql() as statements:
+        actual = (
+            student.checking_balance,
+            student.get_checking_balance(teacher_id=teacher_id, join_code='CLASSA'),
+            student.get_savings_balance(join_code='CLASSA'),
+            student.total_earnings,
+        )
+
+    assert actual == expected == (43.0, 43.0, 15.0, 58.0)
+    assert statements == []
+
+
+def test_cached_balances_invalidated_by_transaction_writes(client, test_student):
+    tx = _add_tx(test_student, 20.0, account_type='checking', description='Payroll')
+    db.session.commit()
+    assert test_student.checking_balance == 20.0
+    assert 'checking_balance' in test_student.__dict__
+
+    # Adding a transaction drops the cached value so autoflush can include it
+    _add_tx(test_student, 5.0, account_type='checking', description='Bonus')
+    assert test_student.checking_balance == 25.0
+
+    tx.is_void = True
+    db.session.commit()
+    assert test_student.checking_balance == 5.0
+    assert test_student.total_earnings == 5.0
+
+
+def test_voiding_loaded_transaction_clears_cached_balance(client, test_student):
+    tx = _add_tx(test_student, 20.0, account_type='checking', description='Payroll')
+    _add_tx(test_student, 5.0, account_type='checking', description='Bonus')
+    db.session.commit()
+    assert test_student.checking_balance == 25.0
+
+    # No flush or commit in between: the cached value must not hide the void
+    tx.is_void = True
+    assert 'checking_balance' not in test_student.__dict__
+    assert test_student.checking_balance == 5.0
+    assert test_student.total_earnings == 5.0
+
+
+def test_cached_balance_invalidation_is_per_student(client, test_student):
+    other = Student(first_name='Other', last_initial='O', block='A', salt=b'othersalt1234567', pin_hash='pin')
+    db.session.add(other)
+    _add_tx(test_student, 20.0, account_type='checking', description='Payroll')
+    db.session.commit()
+    assert test_student.checking_balance == 20.0
+
+    # A write for another student leaves this student's cached value alone
+    db.session.add(Transaction(student_id=other.id, amount=5.0, account_type='checking', description='Bonus'))
+    db.session.flush()
+    assert 'checking_balance' in test_student.__dict__
+
+    # Raw SQL bypasses the listeners; refreshing the student drops the stale cache
+    db.session.execute(db.text("UPDATE student_balances SET balance_cents = 0 WHERE student_id = :id"), {'id': test_student.id})
+    db.session.refresh(test_student)
+    assert test_student.checking_balance == 0.0
+
+
+def test_recent_deposits_filters_in_sql(client, test_student):
+    now = datetime.now(timezone.utc)
+    older = _add_tx(test_student, 10.0, description='Payroll', timestamp=now - timedelta(hours=3))
+    newest = _add_tx(test_student, 15.0, description='Bonus', timestamp=now - timedelta(hours=1))
+    _add_tx(test_student, 20.0, description='Old payroll', timestamp=now - timedelta(days=3))
+    _add_tx(test_student, 25.0, description='Voided', timestamp=now, is_void=True)
+    _add_tx(test_student, 30.0, description='Transfer from checking', timestamp=now, is_transfer=True)
+    _add_tx(test_student, -5.0, description='Fine', timestamp=now)
+    db.session.commit()
+
+    assert [tx.id for tx in test_student.recent_deposits] == [older.id, newest.id]
+
+
+def test_rollup_accumulates_exact_cents(client, test_student):
+    # 0.1 is not representable in binary; integer cents keep the running total exact
+    txs = [_add_tx(test_student, 0.1, account_type='checking', description='Tip') for _ in range(10)]
+    db.session.commit()
+    txs[0].is_void = True
+    db.session.commit()
+
+    row = StudentBalance.query.filter_by(student_id=test_student.id, account_type='checking').one()
+    assert row.balance_cents == 90
+    assert test_student.checking_balance == 0.9
+    assert test_student.total_earnings == 0.9
+
+
+def test_rebuild_rounds_cents_like_incremental_updates(client, test_student):
+    for amount in (12.345, -0.005, 2.675):
+        _add_tx(test_student, amount, account_type='checking', description='Adjustment')
+    db.session.commit()
+    incremental = StudentBalance.query.filter_by(student_id=test_student.id).one().balance_cents
+
+    StudentBalance.rebuild(student_ids=[test_student.id])
+    db.session.commit()
+
+    assert StudentBalance.query.filter_by(student_id=test_student.id).one().balance_cents == incremental == 1502
+
+
+def test_get_all_balances_matches_individual_getters(client, test_student):
+    teacher = Admin(username='all-balances-teacher', totp_secret='SECRET')
+    db.session.add(teacher)
+    db.session.flush()
+    _add_tx(test_student, 40.0, account_type='checking', join_code='CLASSA', description='Payroll')
+    _add_tx(test_student, 12.5, account_type='savings', join_code='CLASSA', description='Deposit')
+    _add_tx(test_student, 3.0, account_type='checking', teacher_id=teacher.id, description='Legacy')
+    _add_tx(test_student, 99.0, account_type='checking', join_code='CLASSB', description='Bonus')
+    db.session.commit()
+
+    for scope in ({}, {'join_code': 'CLASSA'}, {'teacher_id': teacher.id, 'join_code': 'CLASSA'}):
+        expected = {
+            'checking': test_student.get_checking_balance(**scope),
+            'savings': test_student.get_savings_balance(**scope),
+            'earnings': test_student.get_total_earnings(**scope),
+        }
+        assert test_student.get_all_balances(**scope) == expected
+
+        eager = Student.query.options(selectinload(Student.balances)).filter_by(id=test_student.id).one()
+        assert eager.get_all_balances(**scope) == expected
+        db.session.expire_all()
+
+    assert test_student.get_all_balances(teacher_id=teacher.id, join_code='CLASSA') == {
+        'checking': 43.0, 'savings': 12.5, 'earnings': 55.5,
+    }
@@ -76,3 +76,99 @@ def test_dashboard_handles_rent_with_multi_block_student(client):
     assert response.status_code == 200
     # Block state JSON should include only the current class context (block B) and not error on block A
     assert b'"B"' in response.data
+
+
+def test_unvoided_rent_payments_matches_transactions_in_one_query(client, test_student, capture_sql):
+    """Payments whose rent transaction was voided (or never recorded) are dropped."""
+    from app.models import RentPayment, Transaction
+    from app.routes.student import _unvoided_rent_payments
+
+    paid_at = datetime(2025, 3, 1, 12, 0, 0)
+    kept = RentPayment(student_id=test_student.id, period="A", amount_paid=25.0,
+                       period_month=3, period_year=2025, payment_date=paid_at)
+    voided = RentPayment(student_id=test_student.id, period="A", amount_paid=10.0,
+                         period_month=3, period_year=2025, payment_date=paid_at)
+    orphan = RentPayment(student_id=test_student.id, period="A", amount_paid=5.0,
+                         period_month=3, period_year=2025, payment_date=paid_at)
+    db.session.add_all([
+        kept, voided, orphan,
+        Transaction(student_id=test_student.id, amount=-25.0, type="Rent Payment", timestamp=paid_at),
+        Transaction(student_id=test_student.id, amount=-10.0, type="Rent Payment",
+                    timestamp=paid_at, is_void=True),
+    ])
+    db.session.commit()
+    # Reload expired attributes up front so only the lookup itself is counted
+    student_id = test_student.id
+    payments = [kept, voided, orphan]
+    for payment in payments:
+        db.session.refresh(payment)
+
+    with capture_sql() as statements:
+        result = _unvoided_rent_payments(student_id, payments)
+
+    assert result == [kept]
+    assert len(statements) == 1
+
+
+def test_rent_payment_of_fractional_remainder_is_stored_in_cents(client):
+    """Paying 25.00 - 2.01 must record 22.99, not 22.990000000000002, so the payment matches its transaction."""
+    from app.models import RentPayment, Transaction
+    from app.routes.student import _unvoided_rent_payments
+
+    teacher = Admin(username="rent_cents_teacher", totp_secret="rentsecret")
+    db.session.add(teacher)
+    db.session.commit()
+
+    salt = get_random_salt()
+    student = Student(
+        first_name="Cents",
+        last_initial="C",
+        block="A",
+        salt=salt,
+        username_hash=hash_username("rent_cents_student", salt),
+        pin_hash=generate_password_hash("0000"),
+        teacher_id=teacher.id
+    )
+    db.session.add(student)
+    db.session.commit()
+
+    db.session.add_all([
+        TeacherBlock(
+            teacher_id=teacher.id,
+            block="A",
+            first_name="Cents",
+            last_initial="C",
+            last_name_hash_by_part=["hash_a"],
+            dob_sum=2025,
+            salt=os.urandom(16),
+            first_half_hash="hash_a",
+            join_code="CENTS",
+            student_id=student.id,
+            is_claimed=True,
+        ),
+        RentSettings(
+            teacher_id=teacher.id,
+            is_enabled=True,
+            rent_amount=25.0,
+            late_penalty_amount=0.0,
+            allow_incremental_payment=True,
+        ),
+        Transaction(student_id=student.id, teacher_id=teacher.id, join_code="CENTS",
+                    amount=100.0, account_type="checking", description="Payroll"),
+    ])
+    db.session.commit()
+
+    with client.session_transaction() as sess:
+        sess['student_id'] = student.id
+        sess['login_time'] = datetime.now(timezone.utc).isoformat()
+        sess['current_join_code'] = "CENTS"
+
+    client.post('/student/rent/pay/A', data={'amount': '2.01'})
+    # No amount: pays the remaining 25.00 - 2.01
+    client.post('/student/rent/pay/A')
+
+    payments = RentPayment.query.filter_by(student_id=student.id).order_by(RentPayment.id).all()
+    assert [p.amount_paid for p in payments] == [2.01, 22.99]
+    rent_txs = Transaction.query.filter_by(student_id=student.id, type="Rent Payment").order_by(Transaction.id).all()
+    assert [tx.amount for tx in rent_txs] == [-2.01, -22.99]
+    assert _unvoided_rent_payments(student.id, payments) == payments
@@ -136,6 +136,9 @@ def test_transfer_with_legacy_transactions(client, setup_student_with_legacy_tra
     assert deposit.amount == 75.0
     assert deposit.account_type == 'savings'
 
+    # Both legs are flagged so they are excluded from earnings
+    assert withdrawal.is_transfer and deposit.is_transfer
+
 
 def test_insufficient_funds_with_only_new_transactions(client, setup_student_with_legacy_transactions):
     """Test that insufficient funds check works correctly."""